@@ -0,0 +1,9 @@
+"""Benchmarks for oj.
+
+Run with `make bench`, or `python -m bench` with `src` on the path. Each corpus in
+`bench.corpus` is decoded by every phase in `bench.run` (lexing and parsing timed
+separately, the whole of `oj.loads`, and the stdlib's `json.loads` for comparison), and
+the best time and the peak memory traced by `tracemalloc` for each are written out as
+JSON. Passing the results of an earlier run with `--baseline` reports any phase that's
+got slower by more than `--threshold`, and fails if there are any.
+"""
@@ -0,0 +1,57 @@
+"""Runs the benchmarks and compares their results with a baseline, if given."""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from bench.corpus import CORPORA
+from bench.run import PHASES, find_regressions, run_benchmarks
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    parser.add_argument(
+        "--corpus",
+        action="append",
+        choices=list(CORPORA),
+        help="corpus to run (repeatable; default all)",
+    )
+    parser.add_argument(
+        "--phase",
+        action="append",
+        choices=list(PHASES),
+        help="phase to run (repeatable; default all)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per phase")
+    parser.add_argument("--output", help="file to write the results to, as JSON")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fraction by which a measurement may exceed the baseline (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.corpus, args.phase, args.repeat)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+            output_file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nno regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Generated documents to benchmark decoding on.
+
+Each corpus is generated from a fixed seed, so it's the same on every run and results
+can be compared between commits. The first three imitate the shapes of the documents
+in the usual JSON benchmark suites (twitter.json, canada.json and citm_catalog.json);
+the rest stress one thing each.
+"""
+
+import json
+import random
+import string
+from typing import Callable, Dict, List
+
+SEED = 688
+
+
+def twitter(rng: random.Random) -> str:
+    """Records with many string fields, much of them non-ASCII, and nested users."""
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(500)
+    ]
+    words += ["日本語", "テスト", "café", "naïve", "😀", "🎉", "résumé"]
+
+    def text(length: int) -> str:
+        return " ".join(rng.choices(words, k=length))
+
+    statuses = []
+    for status_id in range(1000):
+        statuses.append(
+            {
+                "id": 500000000000000000 + status_id,
+                "id_str": str(500000000000000000 + status_id),
+                "created_at": "Sun Aug 31 00:29:15 +0000 2014",
+                "text": text(rng.randint(5, 25)),
+                "truncated": False,
+                "entities": {
+                    "hashtags": [{"text": rng.choice(words), "indices": [1, 8]}],
+                    "urls": [],
+                    "user_mentions": [],
+                },
+                "user": {
+                    "id": rng.randint(1, 2 ** 31),
+                    "name": text(2),
+                    "screen_name": rng.choice(words),
+                    "description": text(rng.randint(0, 15)),
+                    "followers_count": rng.randint(0, 100000),
+                    "verified": rng.random() < 0.1,
+                    "profile_image_url": "http://pbs.twimg.com/profile_images/1.png",
+                },
+                "retweet_count": rng.randint(0, 1000),
+                "favorited": False,
+                "lang": rng.choice(["ja", "en", "fr", "es"]),
+                "in_reply_to_status_id": None,
+            }
+        )
+    return json.dumps({"statuses": statuses}, ensure_ascii=False, indent=1)
+
+
+def canada(rng: random.Random) -> str:
+    """A GeoJSON polygon: long lists of pairs of floats."""
+    polygons = [
+        [
+            [rng.uniform(-141, -52), rng.uniform(41, 83)]
+            for _ in range(rng.randint(100, 2000))
+        ]
+        for _ in range(50)
+    ]
+    return json.dumps(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"name": "Canada"},
+                    "geometry": {"type": "Polygon", "coordinates": polygons},
+                }
+            ],
+        }
+    )
+
+
+def citm_catalog(rng: random.Random) -> str:
+    """Objects keyed by numeric ids, with many small integers and repeated keys."""
+    events = {}
+    for event_id in range(138586000, 138586000 + 500):
+        events[str(event_id)] = {
+            "description": None,
+            "id": event_id,
+            "logo": rng.choice([None, f"/images/UE0AAAAACEKo{event_id}QAAAAVDSVRN"]),
+            "name": rng.choice(["Orchestre", "Quatuor", "Récital", "Opéra"]),
+            "subTopicIds": rng.sample(range(337184262, 337184300), 4),
+            "subjectCode": None,
+            "subtitle": None,
+            "topicIds": rng.sample(range(324846098, 324846110), 2),
+        }
+    performances = [
+        {
+            "eventId": rng.choice(list(events)),
+            "id": 339887544 + index,
+            "prices": [
+                {
+                    "amount": rng.randint(10, 200) * 1000,
+                    "audienceSubCategoryId": 337100890,
+                    "seatCategoryId": 338937295,
+                }
+                for _ in range(rng.randint(1, 5))
+            ],
+            "seatCategories": [
+                {
+                    "areas": [
+                        {"areaId": 205705999 + area, "blockIds": []}
+                        for area in range(rng.randint(1, 8))
+                    ],
+                    "seatCategoryId": 338937295,
+                }
+            ],
+            "start": 1372521600000 + index * 86400000,
+            "venueCode": "PLEYEL_PLEYEL",
+        }
+        for index in range(1000)
+    ]
+    return json.dumps({"events": events, "performances": performances}, indent=4)
+
+
+def deep_nesting(rng: random.Random) -> str:
+    """Lists and objects nested a few hundred deep, many times over.
+
+    The depth is kept within what `oj.parse.parse`, which recurses, can handle.
+    """
+    documents = []
+    for _ in range(200):
+        depth = rng.randint(100, 300)
+        document = "[" * depth + "]" * depth
+        if rng.random() < 0.5:
+            document = '{"a": ' * depth + "1" + "}" * depth
+        documents.append(document)
+    return "[" + ", ".join(documents) + "]"
+
+
+def long_strings(rng: random.Random) -> str:
+    """A few very long strings, some with escapes."""
+    strings = []
+    for index in range(20):
+        chunk = "".join(rng.choices(string.printable + "é€😀", k=50000))
+        strings.append(chunk if index % 2 else chunk.replace("\\", "").replace('"', ""))
+    return json.dumps(strings, ensure_ascii=False)
+
+
+def long_numbers(rng: random.Random) -> str:
+    """Numbers with many digits: big integers, and floats with long fractions."""
+    numbers: List[object] = []
+    for _ in range(20000):
+        if rng.random() < 0.5:
+            numbers.append(
+                int("".join(rng.choices(string.digits, k=rng.randint(15, 40))))
+            )
+        else:
+            numbers.append(rng.uniform(-1e300, 1e300))
+    return json.dumps(numbers)
+
+
+def ndjson(rng: random.Random) -> str:
+    """Newline-delimited JSON: one small record per line."""
+    lines = []
+    for record_id in range(20000):
+        record = {
+            "id": record_id,
+            "name": "".join(rng.choices(string.ascii_letters, k=10)),
+            "score": rng.random(),
+            "tags": rng.sample(["a", "b", "c", "d", "e"], 2),
+            "active": rng.random() < 0.5,
+        }
+        lines.append(json.dumps(record))
+    return "\n".join(lines) + "\n"
+
+
+CORPORA: Dict[str, Callable[[random.Random], str]] = {
+    "twitter": twitter,
+    "canada": canada,
+    "citm_catalog": citm_catalog,
+    "deep_nesting": deep_nesting,
+    "long_strings": long_strings,
+    "long_numbers": long_numbers,
+    "ndjson": ndjson,
+}
+
+# Corpora made of one JSON document per line rather than a single document.
+LINE_DELIMITED = {"ndjson"}
+
+
+def generate(name: str) -> List[str]:
+    """Generates the named corpus, as the list of JSON documents in it."""
+    text = CORPORA[name](random.Random(SEED))
+    if name in LINE_DELIMITED:
+        return text.splitlines()
+    return [text]
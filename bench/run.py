@@ -0,0 +1,157 @@
+"""Timing and memory measurement of each decoding phase on each corpus."""
+
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import oj
+from bench.corpus import CORPORA, generate
+from oj.lex import lex
+from oj.parse import parse
+
+# The phases a corpus is decoded by. Each one is set up with the corpus's documents,
+# outside of what's measured, and returns the function to measure. "parse" is given the
+# documents already lexed, so that it's timed on its own.
+PhaseSetup = Callable[[List[str]], Callable[[], None]]
+
+
+def _lex(documents: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for document in documents:
+            lex(document)
+
+    return run
+
+
+def _parse(documents: List[str]) -> Callable[[], None]:
+    token_lists = [lex(document) for document in documents]
+
+    def run() -> None:
+        for tokens in token_lists:
+            parse(tokens)
+
+    return run
+
+
+def _loads(documents: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for document in documents:
+            oj.loads(document)
+
+    return run
+
+
+def _stdlib(documents: List[str]) -> Callable[[], None]:
+    def run() -> None:
+        for document in documents:
+            json.loads(document)
+
+    return run
+
+
+PHASES: Dict[str, PhaseSetup] = {
+    "lex": _lex,
+    "parse": _parse,
+    "loads": _loads,
+    "json": _stdlib,
+}
+
+# The measurements compared against a baseline, and the units they're printed in.
+METRICS = {"seconds": "s", "peak_bytes": "B"}
+
+
+def run_benchmarks(
+    corpora: Optional[Sequence[str]] = None,
+    phases: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Runs the named phases (default all) on the named corpora (default all).
+
+    Each phase is timed `repeat` times, keeping the fastest, and then run once more
+    under tracemalloc to find its peak memory use. Returns the results in the form
+    written out by `python -m bench`.
+    """
+    results: Dict[str, Any] = {}
+    for corpus_name in corpora or CORPORA:
+        documents = generate(corpus_name)
+        size = sum(len(document.encode("utf-8")) for document in documents)
+        log(f"{corpus_name} ({size / 1e6:.2f} MB)")
+        corpus_results: Dict[str, Any] = {}
+        for phase_name in phases or PHASES:
+            run = PHASES[phase_name](documents)
+            seconds = _best_time(run, repeat)
+            peak_bytes = _peak_memory(run)
+            corpus_results[phase_name] = {"seconds": seconds, "peak_bytes": peak_bytes}
+            log(
+                f"  {phase_name:<6} {seconds * 1000:10.2f} ms "
+                f"{size / seconds / 1e6:8.2f} MB/s {peak_bytes / 1e6:10.2f} MB peak"
+            )
+        results[corpus_name] = {"size": size, "phases": corpus_results}
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _best_time(run: Callable[[], None], repeat: int) -> float:
+    times = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            # Collect garbage from the previous run first, but not during this one.
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+            gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return min(times)
+
+
+def _peak_memory(run: Callable[[], None]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def find_regressions(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Describes each measurement in `current` worse than `baseline` by > `threshold`.
+
+    `threshold` is a fraction, e.g. 0.1 for 10%. Corpora and phases that are only in
+    one of the two sets of results are ignored.
+    """
+    regressions = []
+    for corpus_name, corpus_results in current["results"].items():
+        baseline_corpus = baseline["results"].get(corpus_name)
+        if baseline_corpus is None:
+            continue
+        for phase_name, measurements in corpus_results["phases"].items():
+            baseline_measurements = baseline_corpus["phases"].get(phase_name)
+            if baseline_measurements is None:
+                continue
+            for metric, unit in METRICS.items():
+                old, new = baseline_measurements[metric], measurements[metric]
+                if old > 0 and new > old * (1 + threshold):
+                    regressions.append(
+                        f"{corpus_name} {phase_name} {metric}: {old:.6g}{unit} -> "
+                        f"{new:.6g}{unit} (+{(new / old - 1) * 100:.1f}%)"
+                    )
+    return regressions
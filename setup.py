@@ -9,4 +9,5 @@ setup(
     packages=["oj"],
     package_dir={"": "src"},
     python_requires=">=3.7",
+    extras_require={"numpy": ["numpy"]},
 )
@@ -1,14 +1,160 @@
-from typing import IO, Union
+import functools
+import mmap
+import os
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
 
+from oj.aio import iter_async, load_async  # noqa: F401
+from oj.cache import CachedDecoder  # noqa: F401
+from oj.columnar import loads_columnar  # noqa: F401
+from oj.decode import Decoder
+from oj.decode_bytes import decode_bytes, detect_encoding
+from oj.encode import Encoder, dump, dumps, iterencode  # noqa: F401
+from oj.events import iter_items, iterparse  # noqa: F401
 from oj.exceptions import JSONDecodeError  # noqa: F401
-from oj.lex import lex
-from oj.parse import parse
+from oj.extract import extract  # noqa: F401
+from oj.incremental import DEFAULT_READ_SIZE, IncrementalDecoder
+from oj.lazy import loads_lazy  # noqa: F401
+from oj.lex import lex  # noqa: F401
+from oj.parallel import (  # noqa: F401
+    DocumentError,
+    LineError,
+    iter_lines,
+    loads_many,
+    loads_parallel,
+)
+from oj.parse import parse  # noqa: F401
+from oj.stats import DecodeStats
+from oj.typed import TypedDecoder
 
+# `oj.parse(oj.lex(json_string))` is equivalent to `oj.loads(json_string)`, but goes
+# through an intermediate list of tokens, which can be useful for debugging.
 
-def loads(json_string: str) -> Union[None, bool, float, str, list, dict]:
-    tokens = lex(json_string)
-    return parse(tokens)
 
+def loads(
+    json_string: Union[str, bytes, bytearray, memoryview],
+    max_depth: Optional[int] = None,
+    parse_int: Optional[Callable[[str], Any]] = None,
+    parse_float: Optional[Callable[[str], Any]] = None,
+    parse_constant: Optional[Callable[[str], Any]] = None,
+    object_hook: Optional[Callable[[dict], Any]] = None,
+    object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+    numeric_arrays: Optional[str] = None,
+    into: Any = None,
+    stats: Optional[DecodeStats] = None,
+    workers: Optional[int] = None,
+) -> Any:
+    """Decodes the JSON document in `json_string`.
 
-def load(json_file: IO) -> Union[None, bool, float, str, list, dict]:
-    return loads(json_file.read())
+    `json_string` may also be a `bytes`, `bytearray` or `memoryview`, whose encoding
+    (UTF-8, UTF-16 or UTF-32) is detected as by `json.loads`. UTF-8 documents are
+    decoded straight from the bytes, without first decoding them into a `str`.
+
+    If `max_depth` is given, documents with containers nested more deeply than that are
+    rejected with a JSONDecodeError. Otherwise nesting depth is unlimited.
+
+    `parse_int`, `parse_float`, `parse_constant`, `object_hook` and
+    `object_pairs_hook` are as for `json.loads`, e.g. `parse_float=decimal.Decimal`
+    decodes numbers with fractions or exponents exactly.
+
+    If `numeric_arrays` is "array" or "numpy", lists of nothing but numbers are decoded
+    in bulk into `array.array`s or NumPy arrays, as described for `oj.decode.Decoder`.
+
+    If `into` is given, the document is decoded straight into an instance of that type,
+    such as a dataclass, a class with `__slots__`, or `List[MyRecord]`; see
+    `oj.typed` for details. The values of keys that don't name a field are skipped
+    over without being validated, so unlike `json.loads`, this doesn't raise for errors
+    only found in them.
+
+    If `stats` is given, statistics about the document, such as how long it took to
+    decode and how many tokens of each type it's made of, are recorded in it; see
+    `oj.stats` for details.
+
+    If `workers` is greater than 1, a document whose top level is a large list is
+    decoded in that many processes, as by `oj.loads_parallel`.
+    """
+    decoder_options: Dict[str, Any] = dict(
+        max_depth=max_depth,
+        parse_int=parse_int,
+        parse_float=parse_float,
+        parse_constant=parse_constant,
+        object_hook=object_hook,
+        object_pairs_hook=object_pairs_hook,
+        numeric_arrays=numeric_arrays,
+    )
+    if stats is not None:
+        return stats.record(
+            json_string,
+            lambda json_string: _loads(json_string, into, workers, decoder_options),
+        )
+    return _loads(json_string, into, workers, decoder_options)
+
+
+def _loads(
+    json_string: Any,
+    into: Any,
+    workers: Optional[int],
+    decoder_options: Dict[str, Any],
+) -> Any:
+    if workers is not None and workers > 1 and into is None:
+        return loads_parallel(json_string, workers, **decoder_options)
+    if into is not None:
+        if not isinstance(json_string, str):
+            json_string = str(json_string, detect_encoding(json_string))
+        options_key = tuple(decoder_options.items())
+        try:
+            hash(options_key)
+        except TypeError:
+            typed_decoder = TypedDecoder(Decoder(**decoder_options))
+        else:
+            typed_decoder = _typed_decoder(options_key)
+        return typed_decoder.decode(json_string, into)
+    if isinstance(json_string, str):
+        return Decoder(**decoder_options).decode(json_string)
+    return decode_bytes(json_string, **decoder_options)
+
+
+@functools.lru_cache(maxsize=32)
+def _typed_decoder(options_key: Tuple[Tuple[str, Any], ...]) -> TypedDecoder:
+    """Returns the TypedDecoder for `loads(into=...)` with the given decoder options.
+
+    TypedDecoders are kept for reuse, so how to decode each target type is worked out
+    once rather than on every call. Each keeps decode functions for at most
+    `oj.typed.MAX_DECODE_FUNCS` target types.
+    """
+    return TypedDecoder(Decoder(**dict(options_key)))
+
+
+def load(
+    json_file: IO,
+    read_size: int = DEFAULT_READ_SIZE,
+    max_depth: Optional[int] = None,
+) -> Union[None, bool, float, str, list, dict]:
+    """Decodes the JSON document in `json_file`, reading `read_size` chars at a time.
+
+    The file is never read into memory all at once; each chunk is decoded as soon as
+    it's read. `max_depth` is as for `loads()`.
+    """
+    decoder = IncrementalDecoder(max_depth=max_depth)
+    while True:
+        chunk = json_file.read(read_size)
+        if not chunk:
+            break
+        decoder.feed(chunk)
+    return decoder.close()
+
+
+def load_path(
+    path: Union[str, os.PathLike], max_depth: Optional[int] = None
+) -> Union[None, bool, float, str, list, dict]:
+    """Decodes the JSON document in the file at `path`.
+
+    The file is memory-mapped and, if it's UTF-8 encoded, decoded as bytes, so it's
+    never read into memory as a whole, let alone decoded into one large `str`: the OS
+    pages it in as it's decoded. `max_depth` is as for `loads()`.
+    """
+    with open(path, "rb") as json_file:
+        if os.fstat(json_file.fileno()).st_size == 0:
+            # Empty files can't be mapped.
+            return decode_bytes(b"", max_depth=max_depth)
+        with mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ) as json_bytes:
+            return decode_bytes(json_bytes, max_depth=max_depth)
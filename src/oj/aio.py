@@ -0,0 +1,70 @@
+"""Decoding of JSON from asyncio streams, as it arrives.
+
+`load_async` and `iter_async` read from an `asyncio.StreamReader` (or anything else
+with a coroutine `read(n)` method returning bytes) `read_size` bytes at a time, and feed
+each chunk to an `oj.incremental.IncrementalDecoder` as soon as it's read, rather than
+waiting for the whole body. After decoding each chunk they hand control back to the
+event loop, so the time spent decoding without letting other tasks run is bounded by
+`read_size`, however large the document is.
+
+Streams are decoded as UTF-8, with or without a BOM.
+"""
+
+import asyncio
+import codecs
+from typing import Any, AsyncIterator, Optional
+
+from oj.exceptions import JSONDecodeError
+from oj.incremental import DEFAULT_READ_SIZE, IncrementalDecoder
+
+
+async def load_async(
+    reader: Any, read_size: int = DEFAULT_READ_SIZE, max_depth: Optional[int] = None
+) -> Any:
+    """Decodes the JSON document read from `reader` until the end of the stream."""
+    decoder = IncrementalDecoder(max_depth=max_depth)
+    async for text in _read_text(reader, read_size):
+        decoder.feed(text)
+    return decoder.close()
+
+
+async def iter_async(
+    reader: Any, read_size: int = DEFAULT_READ_SIZE, max_depth: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """Decodes each of the JSON values read from `reader`, yielding them in turn.
+
+    The values may be separated by any whitespace, or none where that's unambiguous,
+    so this decodes newline-delimited JSON as well as concatenated JSON values. Each
+    value is yielded as soon as the chunk that completes it has been read.
+    """
+    decoder = IncrementalDecoder(max_depth=max_depth, multiple_values=True)
+    async for text in _read_text(reader, read_size):
+        decoder.feed(text)
+        for value in decoder.pop_values():
+            yield value
+    for value in decoder.close():
+        yield value
+
+
+async def _read_text(reader: Any, read_size: int) -> AsyncIterator[str]:
+    """Reads `reader` to the end, yielding its text a chunk at a time.
+
+    Yields to the event loop before each chunk is read, as reading from a stream that
+    already has data buffered doesn't.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    offset = 0
+    while True:
+        await asyncio.sleep(0)
+        chunk = await reader.read(read_size)
+        try:
+            text = text_decoder.decode(chunk, final=not chunk)
+        except UnicodeDecodeError as exc:
+            raise JSONDecodeError(
+                f"invalid UTF-8 at index {offset + exc.start}"
+            ) from exc
+        if text:
+            yield text
+        if not chunk:
+            return
+        offset += len(chunk)
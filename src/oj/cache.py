@@ -0,0 +1,218 @@
+"""Caching of decoded documents, for inputs that are decoded over and over.
+
+`CachedDecoder` keeps the results of recently decoded documents keyed by a hash of
+their contents, so decoding a document it has seen before costs a hash of the input
+and a lookup rather than a full decode. The least recently used documents are evicted
+when there are more than `maxsize` of them, or when their inputs add up to more than
+`max_bytes`.
+
+Callers mustn't be able to change a cached result for everyone else, so each hit
+returns either a fresh deep copy of the result (the default) or, with `frozen=True`,
+the same immutable version of it every time, in which objects are read-only mappings
+and lists are tuples.
+"""
+
+import copy
+import hashlib
+import marshal
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from oj.decode import Decoder
+from oj.decode_bytes import decode_bytes
+
+# Decoder options that may produce values other than dicts, lists, strs, numbers, bools
+# and None, which can't be assumed to survive a round trip through `marshal`.
+_VALUE_OPTIONS = (
+    "parse_int",
+    "parse_float",
+    "parse_constant",
+    "object_hook",
+    "object_pairs_hook",
+    "numeric_arrays",
+)
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    # The number of documents cached, and the total size of their inputs in bytes.
+    size: int
+    bytes: int
+
+
+class CachedDecoder:
+    """Decodes JSON documents, caching the results by the contents of the input.
+
+    Documents are keyed by a 128-bit BLAKE2 digest of their input (UTF-8 encoded, if
+    it's a `str`), so the inputs themselves aren't kept, and by whether the input is a
+    `str`, as the same document may decode differently from a `str` and from bytes. A
+    document whose input is larger than `max_bytes` by itself is decoded but not
+    cached. Both limits may be None for no limit.
+
+    `decoder_options` are passed on to the `Decoder` (or `BytesDecoder`) used, as for
+    `oj.loads`. Only successful decodes are cached. Results are copied and frozen
+    without recursion, so documents of any depth can be cached, but values of other
+    types than dict and list, such as those returned by hooks, are copied with
+    `copy.deepcopy`. CachedDecoders are safe to share
+    between threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+        frozen: bool = False,
+        **decoder_options: Any,
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.frozen = frozen
+        self.decoder_options = decoder_options
+        self._marshal = not any(decoder_options.get(name) for name in _VALUE_OPTIONS)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        # Cached results keyed by whether the input was a `str` and its digest, least
+        # recently used first, along with the size of each one's input. Unless the
+        # cache is frozen, results are stored as `marshal` data, which is much faster
+        # to load a copy of than to deep copy.
+        self._cache: "OrderedDict[Tuple[bool, bytes], Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, json_string: Any) -> Any:
+        """Decodes the JSON document in a `str`, `bytes`, `bytearray` or `memoryview`."""
+        is_str = isinstance(json_string, str)
+        if is_str:
+            json_bytes = json_string.encode("utf-8", "surrogatepass")
+        else:
+            json_bytes = json_string
+        key = (is_str, hashlib.blake2b(json_bytes, digest_size=16).digest())
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return self._result(entry[0])
+
+        if is_str:
+            value = Decoder(**self.decoder_options).decode(json_string)
+        else:
+            value = decode_bytes(json_string, **self.decoder_options)
+        stored = self._store(value)
+        size = len(json_bytes)
+        if self.max_bytes is None or size <= self.max_bytes:
+            with self._lock:
+                if key not in self._cache:
+                    self._cache[key] = (stored, size)
+                    self.bytes += size
+                    self._evict()
+        return self._result(stored)
+
+    def _store(self, value: Any) -> Any:
+        """Converts a decoded value into the form it's cached in."""
+        if self.frozen:
+            return _rebuild(value, frozen=True)
+        elif self._marshal:
+            try:
+                return _Marshalled(marshal.dumps(value))
+            except ValueError:
+                # Nested too deeply for marshal.
+                pass
+        return _rebuild(value)
+
+    def _result(self, stored: Any) -> Any:
+        """Returns the value to hand back for a cached value."""
+        if self.frozen:
+            return stored
+        elif type(stored) is _Marshalled:
+            return marshal.loads(stored.data)
+        return _rebuild(stored)
+
+    def _evict(self) -> None:
+        """Evicts the least recently used documents until the cache is within limits."""
+        cache = self._cache
+        while cache and (
+            (self.maxsize is not None and len(cache) > self.maxsize)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, size) = cache.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._cache), self.bytes
+            )
+
+    def clear(self) -> None:
+        """Empties the cache and resets its counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = self.evictions = self.bytes = 0
+
+
+class _Marshalled(NamedTuple):
+    data: bytes
+
+
+def _rebuild(value: Any, frozen: bool = False) -> Any:
+    """Returns a deep copy of a decoded value, or with `frozen`, an immutable version.
+
+    Dicts and lists are walked with an explicit stack rather than by recursion, as
+    decoded values may be nested arbitrarily deeply. Frozen dicts become read-only
+    mappings and lists become tuples; any other values are left as they are if frozen,
+    and deep copied if not.
+    """
+    memo: Dict[int, Any] = {}
+
+    def rebuild_leaf(item: Any) -> Any:
+        return item if frozen else copy.deepcopy(item, memo)
+
+    value_type = type(value)
+    if value_type is not dict and value_type is not list:
+        return rebuild_leaf(value)
+    # The containers still being rebuilt, innermost last: an iterator over the items of
+    # each, whether it's a dict, the items rebuilt so far, and the key of the item
+    # being rebuilt, if it's a container in a dict.
+    stack: List[List[Any]] = [_rebuild_frame(value)]
+    while True:
+        frame = stack[-1]
+        iterator, is_dict, items = frame[0], frame[1], frame[2]
+        for item in iterator:
+            key = None
+            if is_dict:
+                key, item = item
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                frame[3] = key
+                stack.append(_rebuild_frame(item))
+                break
+            item = rebuild_leaf(item)
+            items.append((key, item) if is_dict else item)
+        else:
+            stack.pop()
+            if is_dict:
+                rebuilt: Any = dict(items)
+                if frozen:
+                    rebuilt = MappingProxyType(rebuilt)
+            else:
+                rebuilt = tuple(items) if frozen else items
+            if not stack:
+                return rebuilt
+            parent = stack[-1]
+            parent[2].append((parent[3], rebuilt) if parent[1] else rebuilt)
+
+
+def _rebuild_frame(container: Any) -> List[Any]:
+    """Returns the entry on _rebuild()'s stack for a dict or list."""
+    is_dict = type(container) is dict
+    return [iter(container.items() if is_dict else container), is_dict, [], None]
@@ -0,0 +1,211 @@
+"""Columnar decoding of lists of records.
+
+`loads_columnar` decodes a list of flat objects, e.g. `[{"a": 1, "b": "x"}, ...]`, into
+a dict mapping each key to a column of that key's values, one per record. Columns are
+stored compactly according to the values in them:
+
+  - booleans in an `array('b')` of 0s and 1s;
+  - integers in an `array('q')`;
+  - floats, and mixes of integers and floats, in an `array('d')`;
+  - strings in a list of interned strings;
+  - anything else, including nested containers and mixes of the above, in a list.
+
+With `use_numpy=True`, the numeric and boolean columns are returned as NumPy arrays
+instead.
+
+Records that are missing a key, or have it set to null, are given a missing value in
+that key's column: NaN in a float column, and None in a list column. A missing value in
+an integer column turns it into a float column, and one in a boolean column turns it
+into a list column. Likewise, a value that doesn't fit a column's type promotes the
+column to a type that fits it: integers to floats, and anything else to a list (in
+which missing values already stored as NaN stay NaN).
+"""
+
+import math
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Union
+
+from oj.decode import Decoder
+from oj.exceptions import JSONDecodeError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+# The kinds of column, by how their values are stored.
+_EMPTY = 0  # Nothing but missing values so far, which are only counted.
+_BOOL = 1
+_INT = 2
+_FLOAT = 3
+_STR = 4
+_OBJECT = 5
+
+# The NumPy dtypes matching the arrays numeric and boolean columns are stored in.
+_NUMPY_DTYPES = {_BOOL: "int8", _INT: "int64", _FLOAT: "float64"}
+
+
+def loads_columnar(
+    json_string: str, use_numpy: bool = False, decoder: Optional[Decoder] = None
+) -> Dict[str, Any]:
+    """Decodes a JSON list of objects into a dict of columns, one for each key."""
+    if decoder is None:
+        decoder = Decoder()
+    skip_whitespace = decoder._skip_whitespace
+    builder = ColumnBuilder()
+
+    index = skip_whitespace(json_string, 0)
+    if json_string[index : index + 1] != "[":
+        raise JSONDecodeError(f"expected list of objects at index {index}")
+    index = skip_whitespace(json_string, index + 1)
+    if json_string[index : index + 1] == "]":
+        index += 1
+    else:
+        while True:
+            if json_string[index : index + 1] != "{":
+                raise JSONDecodeError(f"expected object at index {index}")
+            record, index = decoder.decode_value(json_string, index)
+            builder.add_row(record)
+            index = skip_whitespace(json_string, index)
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "]":
+                index += 1
+                break
+            else:
+                raise JSONDecodeError(
+                    f"expecting comma or close bracket in list at index {index}"
+                )
+
+    if skip_whitespace(json_string, index) != len(json_string):
+        raise JSONDecodeError("more than one value at top level of json")
+    return builder.columns(use_numpy)
+
+
+class ColumnBuilder:
+    """Collects records, one at a time, into columns."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self._columns: Dict[str, _Column] = {}
+
+    def add_row(self, record: Dict[str, Any]) -> None:
+        columns = self._columns
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = _Column(self.rows)
+            if value is None:
+                column.append_missing()
+            else:
+                column.append(value)
+        self.rows += 1
+        if len(record) < len(columns):
+            for column in columns.values():
+                if column.length < self.rows:
+                    column.append_missing()
+
+    def columns(self, use_numpy: bool = False) -> Dict[str, Any]:
+        """Returns the columns collected so far."""
+        if use_numpy and np is None:
+            raise ImportError("use_numpy requires NumPy to be installed")
+        return {key: column.finish(use_numpy) for key, column in self._columns.items()}
+
+
+class _Column:
+    __slots__ = ("kind", "values", "length")
+
+    def __init__(self, missing: int):
+        self.kind = _EMPTY
+        self.values: Union[array, List[Any]] = []
+        # The number of values in the column, including missing ones.
+        self.length = missing
+
+    def append(self, value: Any) -> None:
+        kind = self.kind
+        value_type = type(value)
+        if kind == _EMPTY:
+            self._start(value_type)
+            kind = self.kind
+        self.length += 1
+        if kind == _STR and value_type is str:
+            self.values.append(sys.intern(value))
+            return
+        elif kind == _FLOAT and (value_type is float or value_type is int):
+            try:
+                self.values.append(value)
+                return
+            except OverflowError:
+                # An integer too big for a float.
+                pass
+        elif kind == _INT and value_type is int:
+            try:
+                self.values.append(value)
+                return
+            except OverflowError:
+                # An integer too big for 64 bits.
+                pass
+        elif kind == _INT and value_type is float:
+            self._promote(_FLOAT)
+            self.values.append(value)
+            return
+        elif kind == _BOOL and value_type is bool:
+            self.values.append(value)
+            return
+        elif kind == _OBJECT:
+            self.values.append(value)
+            return
+        self._promote(_OBJECT)
+        self.values.append(value)
+
+    def append_missing(self) -> None:
+        kind = self.kind
+        self.length += 1
+        if kind == _EMPTY:
+            return
+        elif kind == _INT:
+            self._promote(_FLOAT)
+        elif kind == _BOOL:
+            self._promote(_OBJECT)
+        self.values.append(math.nan if self.kind == _FLOAT else None)
+
+    def _start(self, value_type: type) -> None:
+        """Picks the column's kind from its first value, after `length` missing ones."""
+        missing = self.length
+        if value_type is bool:
+            self.kind, self.values = _BOOL, array("b")
+        elif value_type is int:
+            self.kind, self.values = _INT, array("q")
+        elif value_type is float:
+            self.kind, self.values = _FLOAT, array("d")
+        elif value_type is str:
+            self.kind, self.values = _STR, []
+        else:
+            self.kind, self.values = _OBJECT, []
+        if missing:
+            if self.kind == _INT:
+                self.kind, self.values = _FLOAT, array("d")
+            elif self.kind == _BOOL:
+                self.kind, self.values = _OBJECT, []
+            self.values.extend(
+                [math.nan if self.kind == _FLOAT else None] * missing  # type: ignore
+            )
+
+    def _promote(self, kind: int) -> None:
+        if kind == _FLOAT:
+            self.values = array("d", self.values)
+        elif self.kind == _BOOL:
+            self.values = [bool(value) for value in self.values]
+        else:
+            self.values = list(self.values)
+        self.kind = kind
+
+    def finish(self, use_numpy: bool) -> Any:
+        if self.kind == _EMPTY:
+            return [None] * self.length
+        elif use_numpy and self.kind in _NUMPY_DTYPES:
+            column = np.frombuffer(self.values, dtype=_NUMPY_DTYPES[self.kind])  # type: ignore
+            return column.astype(bool) if self.kind == _BOOL else column
+        return self.values
@@ -0,0 +1,406 @@
+"""Single-pass JSON decoding straight from the input string.
+
+Unlike `oj.parse.parse`, which works on the list of tokens produced by `oj.lex.lex`,
+the decoder here walks the input string by index and builds values as it goes, so no
+intermediate tokens are ever allocated. It accepts exactly the same inputs as the
+lex/parse pipeline, which remains available for debugging.
+"""
+
+import math
+import re
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+from oj.exceptions import JSONDecodeError
+from oj.lex import STRING_BODY_RE, WHITESPACE_RE
+from oj.parse import NUMBER_RE, parse_string_literal, scan_string
+from oj.structural import StructuralIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+# Used when skipping values: everything up to the next bracket outside of a string, and
+# the run of characters making up a scalar other than a string.
+_SKIP_CONTENT_RE = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+_SKIP_SCALAR_RE = re.compile(r'[^\s,:\[\]{}"]+')
+
+# How many distinct strings a Decoder's memo holds before evicting the oldest.
+DEFAULT_MEMO_SIZE = 4096
+# The longest string values (in characters, including quotes) that are memoized when a
+# Decoder is asked to memoize values as well as keys.
+MEMO_VALUE_MAX_LENGTH = 32
+
+# A list of nothing but numbers, which Decoder can decode in one go into an array. The
+# numbers in it are made of these characters, and are floats iff they contain one of
+# the markers.
+NUMBER_LIST_RE = re.compile(
+    r"\[[ \t\r\n]*{number}(?:[ \t\r\n]*,[ \t\r\n]*{number})*[ \t\r\n]*\]".format(
+        number=r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?"
+    )
+)
+_FLOAT_MARKERS = (".", "e", "E")
+NUMERIC_ARRAY_TYPES = ("array", "numpy")
+
+# The values of the non-standard constants, by default.
+CONSTANTS = {"NaN": math.nan, "Infinity": math.inf, "-Infinity": -math.inf}
+
+
+class Decoder:
+    """Decodes JSON strings without building a token list.
+
+    Nested containers are tracked on an explicit stack rather than by recursion, so
+    the depth of nesting is only limited by `max_depth` (if given), past which a
+    JSONDecodeError is raised.
+
+    Object keys are memoized, as by the stdlib's scanner: each distinct key is decoded
+    once and the same `str` is returned for every repeat of it, which saves time and
+    memory on documents made of many records with the same keys. The memo holds up to
+    `memo_size` strings (0 disables it), evicting the oldest when it's full, and is
+    kept across calls to `decode()`. If `memoize_values` is true, short string values
+    are memoized too.
+
+    `parse_int`, `parse_float` and `parse_constant` are as for `json.loads`: if given,
+    they're called with the lexeme of every integer, of every other number (e.g. to
+    decode them as `decimal.Decimal`s), and of NaN, Infinity and -Infinity. So are
+    `object_hook`, called with each decoded object's dict, and `object_pairs_hook`,
+    called instead with a list of each object's key/value pairs; either one's return
+    value takes the place of the object.
+
+    If `numeric_arrays` is "array", lists of nothing but numbers are decoded in one go
+    into an `array('q')` if they're all integers, and otherwise into an `array('d')`,
+    rather than into lists of boxed numbers. If it's "numpy", they're decoded into
+    NumPy arrays. Lists of integers too big for 64 bits are decoded as lists.
+    """
+
+    # The delimiters and patterns decode_value() and decode_key() look for, and how
+    # they skip whitespace, which BytesDecoder overrides to run the same logic over
+    # bytes.
+    _delimiters: Tuple[Any, ...] = ("[", "]", "{", "}", ",")
+    # The quote that starts an object key, and the colon after it.
+    _key_delimiters: Tuple[Any, ...] = ('"', ":")
+    _number_list_re: Pattern = NUMBER_LIST_RE
+    _float_markers: Tuple[Any, ...] = _FLOAT_MARKERS
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        memoize_values: bool = False,
+        parse_int: Optional[Callable[[str], Any]] = None,
+        parse_float: Optional[Callable[[str], Any]] = None,
+        parse_constant: Optional[Callable[[str], Any]] = None,
+        object_hook: Optional[Callable[[dict], Any]] = None,
+        object_pairs_hook: Optional[Callable[[List[Tuple[str, Any]]], Any]] = None,
+        numeric_arrays: Optional[str] = None,
+    ):
+        if numeric_arrays is not None:
+            if numeric_arrays not in NUMERIC_ARRAY_TYPES:
+                raise ValueError(
+                    f"numeric_arrays must be one of {NUMERIC_ARRAY_TYPES}, "
+                    f"not {numeric_arrays!r}"
+                )
+            if numeric_arrays == "numpy" and np is None:
+                raise ImportError('numeric_arrays="numpy" requires NumPy')
+            if parse_int or parse_float:
+                raise ValueError(
+                    "numeric_arrays can't be used with parse_int or parse_float"
+                )
+        self.max_depth = max_depth
+        self.numeric_arrays = numeric_arrays
+        self.object_hook = object_hook
+        self.object_pairs_hook = object_pairs_hook
+        self.parse_int = parse_int or int
+        self.parse_float = parse_float or float
+        self.parse_constant = parse_constant or CONSTANTS.__getitem__
+        self.memo_size = memo_size
+        self.memoize_values = memoize_values
+        # Decoded strings keyed by their lexemes, oldest first.
+        self._memo: Dict[Any, str] = {}
+
+    @staticmethod
+    def _skip_whitespace(json_string: Any, index: int) -> int:
+        return WHITESPACE_RE.match(json_string, index).end()  # type: ignore
+
+    def decode(self, json_string: str) -> Union[None, bool, float, str, list, dict]:
+        index = self._skip_whitespace(json_string, 0)
+        value, index = self.decode_value(json_string, index)
+        index = self._skip_whitespace(json_string, index)
+        if index != len(json_string):
+            raise JSONDecodeError("more than one value at top level of json")
+        return value
+
+    def decode_value(self, json_string: str, index: int) -> Tuple[Any, int]:
+        """Decodes the value starting at `index`, which must not be whitespace.
+
+        Returns the value and the index just past its end.
+        """
+        max_depth = self.max_depth
+        skip_whitespace = self._skip_whitespace
+        open_bracket, close_bracket, open_brace, close_brace, comma = self._delimiters
+        decode_numeric_array = (
+            self._decode_numeric_array if self.numeric_arrays else None
+        )
+        # Objects are collected as pairs if they're for the pairs hook, and each one is
+        # passed to the hook (if any) once it's complete.
+        new_object: Callable[[], Any] = dict
+        object_hook = self.object_pairs_hook or self.object_hook
+        if self.object_pairs_hook:
+            new_object = _Pairs
+        # Containers that are still open, innermost last, along with the key each
+        # object is waiting for a value for (None for lists).
+        stack: List[Union[list, dict]] = []
+        keys: List[Optional[str]] = []
+        while True:
+            char = json_string[index : index + 1]
+            value: Any
+            if char == open_bracket:
+                if max_depth is not None and len(stack) >= max_depth:
+                    raise _too_deep(max_depth, index)
+                numeric_array = (
+                    decode_numeric_array(json_string, index)
+                    if decode_numeric_array
+                    else None
+                )
+                if numeric_array is not None:
+                    value, index = numeric_array
+                else:
+                    index = skip_whitespace(json_string, index + 1)
+                    if json_string[index : index + 1] == close_bracket:
+                        value, index = [], index + 1
+                    else:
+                        stack.append([])
+                        keys.append(None)
+                        # Decode the first element.
+                        continue
+            elif char == open_brace:
+                if max_depth is not None and len(stack) >= max_depth:
+                    raise _too_deep(max_depth, index)
+                index = skip_whitespace(json_string, index + 1)
+                if json_string[index : index + 1] == close_brace:
+                    value, index = new_object(), index + 1
+                    if object_hook is not None:
+                        value = object_hook(value)
+                else:
+                    key, index = self.decode_key(json_string, index)
+                    stack.append(new_object())
+                    keys.append(key)
+                    # Decode the first value.
+                    continue
+            else:
+                value, index = self.decode_scalar(json_string, index)
+
+            # Add the value to its container, then close any containers it completes,
+            # adding each of those to its own container in turn.
+            while stack:
+                container = stack[-1]
+                current_key = keys[-1]
+                index = skip_whitespace(json_string, index)
+                char = json_string[index : index + 1]
+                if current_key is None:
+                    container.append(value)  # type: ignore
+                    if char == comma:
+                        # Another value *must* come next.
+                        index = skip_whitespace(json_string, index + 1)
+                        break
+                    elif char != close_bracket:
+                        raise JSONDecodeError(
+                            f"expecting comma or close bracket in list at index {index}"
+                        )
+                else:
+                    container[current_key] = value  # type: ignore
+                    if char == comma:
+                        index = skip_whitespace(json_string, index + 1)
+                        keys[-1], index = self.decode_key(json_string, index)
+                        break
+                    elif char != close_brace:
+                        raise JSONDecodeError(
+                            f"expected comma or close brace at index {index}"
+                        )
+                value = stack.pop()
+                keys.pop()
+                index += 1
+                if current_key is not None and object_hook is not None:
+                    value = object_hook(value)
+            else:
+                return value, index
+
+    def _decode_numeric_array(
+        self, json_string: str, index: int
+    ) -> Optional[Tuple[Any, int]]:
+        """Decodes the list at `index` into an array, if it's a list of numbers."""
+        list_match = self._number_list_re.match(json_string, index)
+        if list_match is None:
+            return None
+        body = list_match.group()[1:-1]
+        is_float = any(marker in body for marker in self._float_markers)
+        items = body.split(self._delimiters[4])
+        numbers: array
+        try:
+            if is_float:
+                numbers = array("d", map(float, items))
+            else:
+                numbers = array("q", map(int, items))
+        except OverflowError:
+            return None
+        if self.numeric_arrays == "numpy":
+            return np.frombuffer(numbers, dtype=numbers.typecode), list_match.end()
+        return numbers, list_match.end()
+
+    def decode_scalar(self, json_string: str, index: int) -> Tuple[Any, int]:
+        """Decodes the non-container value starting at `index`."""
+        char = json_string[index : index + 1]
+        if char == '"':
+            if self.memoize_values:
+                return self.decode_memoized_string(
+                    json_string, index, MEMO_VALUE_MAX_LENGTH
+                )
+            return self.decode_string(json_string, index)
+        elif char == "n" and json_string.startswith("null", index):
+            return None, index + 4
+        elif char == "t" and json_string.startswith("true", index):
+            return True, index + 4
+        elif char == "f" and json_string.startswith("false", index):
+            return False, index + 5
+        elif char == "N" and json_string.startswith("NaN", index):
+            return self.parse_constant("NaN"), index + 3
+        elif char == "I" and json_string.startswith("Infinity", index):
+            return self.parse_constant("Infinity"), index + 8
+        elif char == "-" and json_string.startswith("-Infinity", index):
+            return self.parse_constant("-Infinity"), index + 9
+
+        number_match = NUMBER_RE.match(json_string, index)
+        if number_match:
+            integer, fraction, exponent = number_match.groups()
+            if fraction is None and exponent is None:
+                return self.parse_int(integer), number_match.end()
+            return self.parse_float(number_match.group()), number_match.end()
+        raise JSONDecodeError(f"expecting value at index {index}")
+
+    def decode_string(self, json_string: str, index: int) -> Tuple[str, int]:
+        """Decodes the string whose open quote is at `index`."""
+        return scan_string(json_string, index)
+
+    def decode_memoized_string(
+        self, json_string: str, index: int, max_length: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Decodes the string at `index` through the memo.
+
+        Strings are looked up by their lexeme, so a string that's already in the memo
+        isn't decoded again. Lexemes longer than `max_length` bypass the memo.
+        """
+        end_index = self._find_string_end(json_string, index)
+        lexeme = self._lexeme(json_string, index, end_index)
+        memo = self._memo
+        string = memo.get(lexeme)
+        if string is None:
+            string = self._decode_lexeme(lexeme, index)
+            if self.memo_size and (max_length is None or len(lexeme) <= max_length):
+                if len(memo) >= self.memo_size:
+                    # The memo may be shared between threads (as the default decoder's
+                    # is), so the oldest string may already have been evicted.
+                    try:
+                        memo.pop(next(iter(memo), None), None)
+                    except RuntimeError:
+                        # The memo changed size while its first key was being found.
+                        pass
+                memo[lexeme] = string
+        return string, end_index
+
+    def _find_string_end(self, json_string: str, index: int) -> int:
+        body_match = STRING_BODY_RE.match(json_string, index + 1)
+        if not body_match:
+            raise JSONDecodeError(f"unterminated string starting at index {index}")
+        return body_match.end()
+
+    def _lexeme(self, json_string: str, start_index: int, end_index: int) -> Any:
+        return json_string[start_index:end_index]
+
+    def _decode_lexeme(self, lexeme: Any, index: int) -> str:
+        return parse_string_literal(lexeme)
+
+    def decode_key(self, json_string: str, index: int) -> Tuple[str, int]:
+        """Decodes an object key and the colon after it.
+
+        Returns the key and the index of the start of the value that follows.
+        """
+        quote, colon = self._key_delimiters
+        if json_string[index : index + 1] != quote:
+            raise JSONDecodeError(f"object keys must be strings at index {index}")
+        key, index = self.decode_memoized_string(json_string, index)
+        index = self._skip_whitespace(json_string, index)
+        if json_string[index : index + 1] != colon:
+            raise JSONDecodeError(f"expected colon at index {index}")
+        return key, self._skip_whitespace(json_string, index + 1)
+
+
+class _Pairs(list):
+    """A list of key/value pairs that's added to like a dict, for object_pairs_hook."""
+
+    def __setitem__(self, key: Any, value: Any) -> None:  # type: ignore
+        self.append((key, value))
+
+
+def _too_deep(max_depth: int, index: int) -> JSONDecodeError:
+    return JSONDecodeError(
+        f"exceeded maximum nesting depth of {max_depth} at index {index}"
+    )
+
+
+def skip_value(
+    json_string: str,
+    index: int,
+    structural_index: Optional[StructuralIndex] = None,
+) -> int:
+    """Finds the end of the value starting at `index` without decoding it.
+
+    Only quotes and brackets are matched up, so the value isn't fully validated; that's
+    left until (and unless) it's decoded. If `structural_index` (the index of
+    `json_string`) is given, the end of a container is looked up in it rather than
+    found by scanning the container.
+    """
+    char = json_string[index : index + 1]
+    if char == '"':
+        return _skip_string(json_string, index)
+    elif structural_index is not None and (char == "[" or char == "{"):
+        return structural_index.close_of(index) + 1
+    elif char == "[" or char == "{":
+        depth = 0
+        while True:
+            char = json_string[index : index + 1]
+            if char == "[" or char == "{":
+                depth += 1
+            elif char == "]" or char == "}":
+                depth -= 1
+                if depth == 0:
+                    return index + 1
+            elif char == '"':
+                raise JSONDecodeError(f"unterminated string starting at index {index}")
+            else:
+                raise JSONDecodeError(f"unterminated container at index {index}")
+            index = _SKIP_CONTENT_RE.match(json_string, index + 1).end()  # type: ignore
+
+    scalar_match = _SKIP_SCALAR_RE.match(json_string, index)
+    if not scalar_match:
+        raise JSONDecodeError(f"expecting value at index {index}")
+    return scalar_match.end()
+
+
+def _skip_string(json_string: str, index: int) -> int:
+    body_match = STRING_BODY_RE.match(json_string, index + 1)
+    if not body_match:
+        raise JSONDecodeError(f"unterminated string starting at index {index}")
+    return body_match.end()
+
+
+def skip_whitespace(json_string: str, index: int) -> int:
+    """Returns the index of the first non-whitespace character from `index` on."""
+    return WHITESPACE_RE.match(json_string, index).end()  # type: ignore
+
+
+_default_decoder = Decoder()
+
+
+def decode(json_string: str) -> Union[None, bool, float, str, list, dict]:
+    return _default_decoder.decode(json_string)
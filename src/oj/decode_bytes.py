@@ -0,0 +1,150 @@
+"""Decoding of JSON straight from a byte buffer.
+
+`BytesDecoder` runs the same single pass as `oj.decode.Decoder`, but over `bytes`,
+`bytearray` or `mmap` buffers, so a document never has to be decoded into one large
+`str` first. Whitespace, delimiters, literals and numbers are all ASCII and are matched
+as bytes; only the contents of strings are decoded, each one straight from a
+`memoryview` slice of the buffer.
+
+Indices in error messages are byte offsets into the buffer.
+
+`decode_bytes` detects the encoding of a document the way `json.loads` does, and decodes
+UTF-16 and UTF-32 documents (which are rare in practice) to a `str` up front.
+"""
+
+import codecs
+import re
+from typing import Any, Dict, Tuple, Union
+
+from oj.decode import MEMO_VALUE_MAX_LENGTH, NUMBER_LIST_RE, Decoder
+from oj.exceptions import JSONDecodeError
+from oj.parse import parse_string_literal
+
+_WHITESPACE_RE = re.compile(rb"[ \t\r\n]*")
+_NUMBER_RE = re.compile(rb"(-?(?:0|[1-9][0-9]*))(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_STRING_BODY_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+# The literals other than numbers, keyed by their first byte, and whether each one is
+# one of the constants passed to `parse_constant`.
+_LITERALS: Dict[int, Tuple[bytes, Any, bool]] = {
+    ord("n"): (b"null", None, False),
+    ord("t"): (b"true", True, False),
+    ord("f"): (b"false", False, False),
+    ord("N"): (b"NaN", "NaN", True),
+    ord("I"): (b"Infinity", "Infinity", True),
+    ord("-"): (b"-Infinity", "-Infinity", True),
+}
+
+
+class BytesDecoder(Decoder):
+    """Decodes UTF-8 encoded JSON from a `bytes`, `bytearray` or `mmap` buffer."""
+
+    _delimiters = (b"[", b"]", b"{", b"}", b",")
+    _key_delimiters = (b'"', b":")
+    _number_list_re = re.compile(NUMBER_LIST_RE.pattern.encode("ascii"))
+    _float_markers = (b".", b"e", b"E")
+
+    def decode(self, json_bytes: Any) -> Union[None, bool, float, str, list, dict]:
+        return super().decode(json_bytes)
+
+    @staticmethod
+    def _skip_whitespace(json_bytes: Any, index: int) -> int:
+        return _WHITESPACE_RE.match(json_bytes, index).end()  # type: ignore
+
+    def decode_scalar(self, json_bytes: Any, index: int) -> Tuple[Any, int]:
+        char = json_bytes[index : index + 1]
+        if char == b'"':
+            if self.memoize_values:
+                return self.decode_memoized_string(
+                    json_bytes, index, MEMO_VALUE_MAX_LENGTH
+                )
+            return self.decode_string(json_bytes, index)
+        if char and char[0] in _LITERALS:
+            literal, value, is_constant = _LITERALS[char[0]]
+            end_index = index + len(literal)
+            if json_bytes[index:end_index] == literal:
+                if is_constant:
+                    return self.parse_constant(value), end_index
+                return value, end_index
+
+        number_match = _NUMBER_RE.match(json_bytes, index)
+        if number_match:
+            _, fraction, exponent = number_match.groups()
+            number_literal = number_match.group().decode("ascii")
+            if fraction is None and exponent is None:
+                return self.parse_int(number_literal), number_match.end()
+            return self.parse_float(number_literal), number_match.end()
+        raise JSONDecodeError(f"expecting value at index {index}")
+
+    def decode_string(self, json_bytes: Any, index: int) -> Tuple[str, int]:
+        end_index = self._find_string_end(json_bytes, index)
+        with memoryview(json_bytes) as view, view[index:end_index] as lexeme:
+            return self._decode_lexeme(lexeme, index), end_index
+
+    def _find_string_end(self, json_bytes: Any, index: int) -> int:
+        body_match = _STRING_BODY_RE.match(json_bytes, index + 1)
+        if not body_match:
+            raise JSONDecodeError(f"unterminated string starting at index {index}")
+        return body_match.end()
+
+    def _lexeme(self, json_bytes: Any, start_index: int, end_index: int) -> bytes:
+        # Memo keys must be hashable, which slices of a bytearray aren't.
+        return bytes(json_bytes[start_index:end_index])
+
+    def _decode_lexeme(self, lexeme: Any, index: int) -> str:
+        try:
+            string = str(lexeme, "utf-8")
+        except UnicodeDecodeError as exc:
+            raise JSONDecodeError(
+                f"invalid UTF-8 in string at index {index + exc.start}"
+            ) from exc
+        if "\\" not in string:
+            return string[1:-1]
+        return parse_string_literal(string)
+
+
+def decode_bytes(
+    json_bytes: Any, **decoder_options: Any
+) -> Union[None, bool, float, str, list, dict]:
+    """Decodes the JSON document in a `bytes`, `bytearray`, `memoryview` or `mmap`.
+
+    `decoder_options` are passed on to the `Decoder` (or `BytesDecoder`) used.
+    """
+    encoding = detect_encoding(json_bytes)
+    if encoding == "utf-8":
+        return BytesDecoder(**decoder_options).decode(json_bytes)
+    elif encoding == "utf-8-sig":
+        with memoryview(json_bytes)[len(codecs.BOM_UTF8) :] as view:
+            return BytesDecoder(**decoder_options).decode(view)
+    try:
+        json_string = str(json_bytes, encoding)
+    except UnicodeDecodeError as exc:
+        raise JSONDecodeError(f"invalid {encoding} at index {exc.start}") from exc
+    return Decoder(**decoder_options).decode(json_string)
+
+
+def detect_encoding(json_bytes: Any) -> str:
+    """Detects the encoding of a JSON document from its first four bytes.
+
+    Follows `json.detect_encoding`: a BOM determines the encoding, and otherwise the
+    pattern of zero bytes does, as the first two characters of a JSON document are
+    always ASCII.
+    """
+    head = bytes(json_bytes[:4])
+    if head.startswith((codecs.BOM_UTF32_BE, codecs.BOM_UTF32_LE)):
+        return "utf-32"
+    elif head.startswith((codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE)):
+        return "utf-16"
+    elif head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    elif len(head) == 4:
+        if not head[0]:
+            return "utf-16-be" if head[1] else "utf-32-be"
+        elif not head[1]:
+            return "utf-16-le" if head[2] or head[3] else "utf-32-le"
+    elif len(head) == 2:
+        if not head[0]:
+            return "utf-16-be"
+        elif not head[1]:
+            return "utf-16-le"
+    return "utf-8"
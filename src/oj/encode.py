@@ -0,0 +1,302 @@
+"""Encoding of Python values as JSON, in bounded-size chunks.
+
+`Encoder.iterencode` walks the value with an explicit stack rather than by recursion,
+and collects the pieces of output into chunks of about `chunk_size` characters, so a
+huge value can be written out to a file or socket as it's encoded without the whole
+document ever being held in memory. `dumps` joins the chunks into one string; `dump`
+writes them to a file as they're produced.
+
+Output matches `json.dumps` given the same options. NaN, Infinity and -Infinity are
+encoded as the literals `oj.lex` accepts, unless `allow_nan` is false.
+"""
+
+import math
+import re
+from typing import IO, Any, Callable, Iterator, List, Optional, Set, Tuple, Union
+
+# How many characters of output Encoder.iterencode() collects before yielding them.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# The characters that must be escaped in a string, and those that are escaped when only
+# printable ASCII is to be output, as by json.dumps.
+_ESCAPE_RE = re.compile(r'[\x00-\x1f"\\]')
+_ESCAPE_ASCII_RE = re.compile(r'["\\]|[^\x20-\x7e]')
+_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "\b": "\\b",
+    "\f": "\\f",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+}
+for _code in range(0x20):
+    _ESCAPES.setdefault(chr(_code), f"\\u{_code:04x}")
+
+
+def dumps(value: Any, **encoder_options: Any) -> str:
+    """Encodes `value` as a JSON string.
+
+    `encoder_options` are passed on to `Encoder`.
+    """
+    return Encoder(**encoder_options).encode(value)
+
+
+def dump(value: Any, json_file: IO, **encoder_options: Any) -> None:
+    """Encodes `value` as JSON, writing it to `json_file` a chunk at a time."""
+    write = json_file.write
+    for chunk in Encoder(**encoder_options).iterencode(value):
+        write(chunk)
+
+
+def iterencode(value: Any, **encoder_options: Any) -> Iterator[str]:
+    """Encodes `value` as JSON, yielding the output in chunks."""
+    return Encoder(**encoder_options).iterencode(value)
+
+
+class Encoder:
+    """Encodes Python values as JSON.
+
+    `sort_keys`, `indent`, `ensure_ascii`, `allow_nan` and `default` are as for
+    `json.dumps`. The output of `iterencode()` comes in chunks of at least
+    `chunk_size` characters (except for the last), each made of whole pieces of output
+    such as strings and numbers, so a chunk is only much longer than `chunk_size` if it
+    ends with a very long string.
+
+    Nesting depth is unlimited, and containers that contain themselves are rejected
+    with a ValueError.
+    """
+
+    def __init__(
+        self,
+        sort_keys: bool = False,
+        indent: Union[None, int, str] = None,
+        ensure_ascii: bool = True,
+        allow_nan: bool = True,
+        default: Optional[Callable[[Any], Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if isinstance(indent, int):
+            indent = " " * indent
+        self.sort_keys = sort_keys
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.allow_nan = allow_nan
+        self.default = default
+        self.chunk_size = chunk_size
+        self._escape_re = _ESCAPE_ASCII_RE if ensure_ascii else _ESCAPE_RE
+
+    def encode(self, value: Any) -> str:
+        return "".join(self.iterencode(value))
+
+    def iterencode(self, value: Any) -> Iterator[str]:
+        """Encodes `value`, yielding the output in chunks of about `chunk_size`."""
+        chunk_size = self.chunk_size
+        indent = self.indent
+        item_separator = "," if indent is not None else ", "
+        encode_string = self.encode_string
+        encode_scalar = self.encode_scalar
+        sort_keys = self.sort_keys
+
+        pieces: List[str] = []
+        append = pieces.append
+        size = 0
+        # The containers that are still open, innermost last: an iterator over the
+        # items of each, whether it's an object, and its id, to check for cycles.
+        iterators: List[Iterator[Any]] = []
+        is_objects: List[bool] = []
+        open_ids: List[int] = []
+        open_id_set: Set[int] = set()
+        # The id of the value that `value` was converted from by _convert(), if it was,
+        # which is what's checked for cycles, as the conversion may be a new copy.
+        converted_id: Optional[int] = None
+        while True:
+            # Encode the value, opening it if it's a non-empty container.
+            value_type = type(value)
+            if value_type is str:
+                piece = encode_string(value)
+            elif value_type is dict or value_type is list or value_type is tuple:
+                if not value:
+                    piece = "{}" if value_type is dict else "[]"
+                else:
+                    value_id = id(value) if converted_id is None else converted_id
+                    converted_id = None
+                    if value_id in open_id_set:
+                        raise ValueError("Circular reference detected")
+                    open_ids.append(value_id)
+                    open_id_set.add(value_id)
+                    if value_type is dict:
+                        items = value.items()
+                        iterators.append(iter(sorted(items) if sort_keys else items))
+                        is_objects.append(True)
+                        piece = "{"
+                    else:
+                        iterators.append(iter(value))
+                        is_objects.append(False)
+                        piece = "["
+                    if indent is not None:
+                        piece += "\n" + indent * len(iterators)
+                    # The first item follows without a separator.
+                    append(piece)
+                    size += len(piece)
+                    value, item_size = self._next_item(
+                        iterators[-1], is_objects[-1], pieces
+                    )
+                    size += item_size
+                    continue
+            else:
+                scalar = encode_scalar(value)
+                if scalar is None:
+                    # Something encode_scalar() doesn't handle, such as a subclass of
+                    # list or dict, or an object for `default` to convert.
+                    if converted_id is None:
+                        converted_id = id(value)
+                    value = self._convert(value)
+                    continue
+                piece = scalar
+            append(piece)
+            size += len(piece)
+            converted_id = None
+
+            # Move on to the next item, closing any containers that have run out.
+            while iterators:
+                if size >= chunk_size:
+                    yield "".join(pieces)
+                    pieces.clear()
+                    size = 0
+                separator = item_separator
+                if indent is not None:
+                    separator += "\n" + indent * len(iterators)
+                value, item_size = self._next_item(
+                    iterators[-1], is_objects[-1], pieces, separator
+                )
+                if value is not _END:
+                    size += item_size
+                    break
+                iterators.pop()
+                is_object = is_objects.pop()
+                open_id_set.remove(open_ids.pop())
+                piece = "}" if is_object else "]"
+                if indent is not None:
+                    piece = "\n" + indent * len(iterators) + piece
+                append(piece)
+                size += len(piece)
+            else:
+                if pieces:
+                    yield "".join(pieces)
+                return
+
+    def _next_item(
+        self,
+        iterator: Iterator[Any],
+        is_object: bool,
+        pieces: List[str],
+        separator: Optional[str] = None,
+    ) -> Tuple[Any, int]:
+        """Returns the next item from `iterator`, or _END if there are none left.
+
+        The separator before the item (if given), and the key of an object member, are
+        added to `pieces`, and their total length is returned along with the item.
+        """
+        item: Any = next(iterator, _END)
+        if item is _END:
+            return _END, 0
+        size = 0
+        if separator is not None:
+            pieces.append(separator)
+            size += len(separator)
+        if not is_object:
+            return item, size
+        key, value = item
+        key = self.encode_key(key)
+        pieces.append(key)
+        pieces.append(": ")
+        return value, size + len(key) + 2
+
+    def encode_scalar(self, value: Any) -> Optional[str]:
+        """Encodes a value other than a container, or returns None if it can't."""
+        if value is None:
+            return "null"
+        elif value is True:
+            return "true"
+        elif value is False:
+            return "false"
+        value_type = type(value)
+        if value_type is int:
+            return int.__repr__(value)
+        elif value_type is float:
+            return self.encode_float(value)
+        elif value_type is str:
+            return self.encode_string(value)
+        return None
+
+    def encode_float(self, value: float) -> str:
+        if math.isfinite(value):
+            return float.__repr__(value)
+        elif not self.allow_nan:
+            raise ValueError(
+                f"Out of range float values are not JSON compliant: {value!r}"
+            )
+        elif value != value:
+            return "NaN"
+        return "Infinity" if value > 0 else "-Infinity"
+
+    def encode_string(self, value: str) -> str:
+        if self._escape_re.search(value) is None:
+            return '"' + value + '"'
+        return '"' + self._escape_re.sub(_escape, value) + '"'
+
+    def encode_key(self, key: Any) -> str:
+        if isinstance(key, str):
+            return self.encode_string(key)
+        elif isinstance(key, (int, float)) or key is None:
+            # Converted to strings, as by json.dumps.
+            if isinstance(key, float):
+                encoded = self.encode_float(key)
+            elif isinstance(key, bool) or key is None:
+                encoded = self.encode_scalar(key)  # type: ignore
+            else:
+                encoded = int.__repr__(key)
+            return '"' + encoded + '"'
+        raise TypeError(
+            f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+        )
+
+    def _convert(self, value: Any) -> Any:
+        """Converts a value encode_scalar() can't handle into one that's encodable."""
+        if isinstance(value, str):
+            return str.__str__(value)
+        elif isinstance(value, bool):
+            return bool(value)
+        elif isinstance(value, int):
+            return int(value)
+        elif isinstance(value, float):
+            return float(value)
+        elif isinstance(value, dict):
+            return dict(value)
+        elif isinstance(value, (list, tuple)):
+            return list(value)
+        elif self.default is not None:
+            converted = self.default(value)
+            if converted is not value:
+                return converted
+        raise TypeError(
+            f"Object of type {type(value).__name__} is not JSON serializable"
+        )
+
+
+# Returned by Encoder._next_item() when a container has no items left.
+_END = object()
+
+
+def _escape(match: "re.Match") -> str:
+    char = match.group()
+    escaped = _ESCAPES.get(char)
+    if escaped is not None:
+        return escaped
+    code = ord(char)
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    # Characters outside of the BMP are escaped as a UTF-16 surrogate pair.
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
@@ -0,0 +1,236 @@
+"""Streaming parse events for JSON documents too large to decode all at once.
+
+`iterparse` reports a document as a flat sequence of `(prefix, event, value)` tuples,
+in the style of ijson. The prefix is the path to the value the event belongs to: keys
+of enclosing objects, and "item" for the elements of enclosing lists, joined by dots.
+For example, `{"a": [1, {"b": null}]}` produces:
+
+    ("", "start_map", None)
+    ("", "map_key", "a")
+    ("a", "start_array", None)
+    ("a.item", "number", 1)
+    ("a.item", "start_map", None)
+    ("a.item", "map_key", "b")
+    ("a.item.b", "null", None)
+    ("a.item", "end_map", None)
+    ("a", "end_array", None)
+    ("", "end_map", None)
+
+Only the open containers' prefixes are held in memory, along with the chunk of the
+file being parsed, so memory use is bounded by nesting depth rather than by document
+size. `iter_items` builds whole values from the events at a given prefix, e.g. the
+elements of a huge top-level list with the prefix "item", yielding each one as soon as
+it has been parsed.
+"""
+
+from typing import IO, Any, Iterator, List, Optional, Tuple, Union
+
+from oj.exceptions import JSONDecodeError
+from oj.incremental import (
+    ARRAY_FIRST,
+    ARRAY_NEXT,
+    DEFAULT_READ_SIZE,
+    DONE,
+    OBJECT_COLON,
+    OBJECT_FIRST,
+    OBJECT_KEY,
+    OBJECT_NEXT,
+    VALUE,
+    IncrementalLexer,
+)
+from oj.parse import parse_scalar, parse_string
+from oj.tokens import Token, TokenType
+
+Event = Tuple[str, str, Any]
+
+_SCALAR_EVENTS = {
+    TokenType.STRING: "string",
+    TokenType.NUMBER: "number",
+    TokenType.NAN: "number",
+    TokenType.INFINITY: "number",
+    TokenType.BOOLEAN: "boolean",
+    TokenType.NULL: "null",
+}
+
+
+def iterparse(json_file: IO, read_size: int = DEFAULT_READ_SIZE) -> Iterator[Event]:
+    """Yields the parse events of the JSON document in `json_file`.
+
+    The file is read `read_size` chars at a time. A JSONDecodeError is raised as soon
+    as the document is found to be invalid, after the events preceding the error have
+    been yielded.
+    """
+    parser = EventParser()
+    while True:
+        chunk = json_file.read(read_size)
+        if not chunk:
+            break
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iter_items(
+    json_file: IO, prefix: str, read_size: int = DEFAULT_READ_SIZE
+) -> Iterator[Any]:
+    """Yields each value in `json_file` at `prefix`, decoded in full.
+
+    With the prefix "item", for example, yields the elements of a top-level list one by
+    one, without ever holding the whole list in memory.
+    """
+    builder: Optional[_ValueBuilder] = None
+    for event_prefix, event, value in iterparse(json_file, read_size):
+        if builder is not None:
+            builder.event(event, value)
+            if builder.done:
+                yield builder.value
+                builder = None
+        elif event_prefix == prefix:
+            if event == "start_map" or event == "start_array":
+                builder = _ValueBuilder()
+                builder.event(event, value)
+            elif event in _SCALAR_EVENTS.values():
+                yield value
+
+
+class EventParser:
+    """Parses a JSON document fed to it in chunks into parse events.
+
+    Call `feed()` with each chunk of text in turn, then `close()` once there's no more
+    input; each returns the events completed by the text so far.
+    """
+
+    def __init__(self) -> None:
+        self._lexer = IncrementalLexer()
+        self._state = VALUE
+        # Prefixes of the containers that are still open, innermost last, and the key
+        # each object is waiting for a value for (None for lists).
+        self._prefixes: List[str] = []
+        self._keys: List[Optional[str]] = []
+
+    def feed(self, chunk: str) -> List[Event]:
+        events: List[Event] = []
+        for token in self._lexer.feed(chunk):
+            self._push_token(token, events)
+        return events
+
+    def close(self) -> List[Event]:
+        events: List[Event] = []
+        for token in self._lexer.close():
+            self._push_token(token, events)
+        if self._state != DONE:
+            raise JSONDecodeError("unexpected end of json")
+        return events
+
+    def _push_token(self, token: Token, events: List[Event]) -> None:
+        token_type = token.token_type
+        state = self._state
+        if state == VALUE or (
+            state == ARRAY_FIRST and token_type != TokenType.CLOSE_BRACKET
+        ):
+            prefix = self._value_prefix()
+            if token_type == TokenType.OPEN_BRACKET:
+                events.append((prefix, "start_array", None))
+                self._prefixes.append(prefix)
+                self._keys.append(None)
+                self._state = ARRAY_FIRST
+            elif token_type == TokenType.OPEN_BRACE:
+                events.append((prefix, "start_map", None))
+                self._prefixes.append(prefix)
+                self._keys.append(None)
+                self._state = OBJECT_FIRST
+            else:
+                value = parse_scalar(token)
+                events.append((prefix, _SCALAR_EVENTS[token_type], value))
+                self._end_value()
+        elif state == ARRAY_FIRST or state == ARRAY_NEXT:
+            if token_type == TokenType.CLOSE_BRACKET:
+                self._close_container("end_array", events)
+            elif token_type == TokenType.COMMA and state == ARRAY_NEXT:
+                self._state = VALUE
+            else:
+                raise JSONDecodeError(
+                    f"expecting comma or close bracket in list at index {token.index}"
+                )
+        elif state == OBJECT_FIRST or state == OBJECT_KEY:
+            if token_type == TokenType.STRING:
+                key = parse_string(token)
+                events.append((self._prefixes[-1], "map_key", key))
+                self._keys[-1] = key
+                self._state = OBJECT_COLON
+            elif token_type == TokenType.CLOSE_BRACE and state == OBJECT_FIRST:
+                self._close_container("end_map", events)
+            else:
+                raise JSONDecodeError(
+                    f"object keys must be strings at index {token.index}"
+                )
+        elif state == OBJECT_COLON:
+            if token_type != TokenType.COLON:
+                raise JSONDecodeError(f"expected colon at index {token.index}")
+            self._state = VALUE
+        elif state == OBJECT_NEXT:
+            if token_type == TokenType.COMMA:
+                self._state = OBJECT_KEY
+            elif token_type == TokenType.CLOSE_BRACE:
+                self._close_container("end_map", events)
+            else:
+                raise JSONDecodeError(
+                    f"expected comma or close brace at index {token.index}"
+                )
+        else:
+            raise JSONDecodeError(
+                f"more than one value at top level of json at index {token.index}"
+            )
+
+    def _value_prefix(self) -> str:
+        if not self._prefixes:
+            return ""
+        parent = self._prefixes[-1]
+        key = self._keys[-1]
+        name = "item" if key is None else key
+        return f"{parent}.{name}" if parent else name
+
+    def _close_container(self, event: str, events: List[Event]) -> None:
+        events.append((self._prefixes.pop(), event, None))
+        self._keys.pop()
+        self._end_value()
+
+    def _end_value(self) -> None:
+        if not self._keys:
+            self._state = DONE
+        elif self._keys[-1] is None:
+            self._state = ARRAY_NEXT
+        else:
+            self._state = OBJECT_NEXT
+
+
+class _ValueBuilder:
+    """Builds a value back up from the parse events of a container."""
+
+    def __init__(self) -> None:
+        self._stack: List[Union[list, dict]] = []
+        self._keys: List[Optional[str]] = []
+        self.value: Any = None
+        self.done = False
+
+    def event(self, event: str, value: Any) -> None:
+        if event == "map_key":
+            self._keys[-1] = value
+        elif event == "start_map" or event == "start_array":
+            self._stack.append({} if event == "start_map" else [])
+            self._keys.append(None)
+        elif event == "end_map" or event == "end_array":
+            self._keys.pop()
+            self._add_value(self._stack.pop())
+        else:
+            self._add_value(value)
+
+    def _add_value(self, value: Any) -> None:
+        if not self._stack:
+            self.value = value
+            self.done = True
+            return
+        container = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[self._keys[-1]] = value
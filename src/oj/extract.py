@@ -0,0 +1,202 @@
+"""Extraction of selected values from a JSON document.
+
+Values are selected with JSON Pointer paths (RFC 6901), extended so that a `*` segment
+matches every key of an object or every element of an array. Only the values at the
+ends of the paths are decoded. Everything else is skipped over by matching up quotes
+and brackets, without building any strings, numbers or containers, and without being
+fully validated.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from oj.decode import Decoder, skip_value, skip_whitespace
+from oj.exceptions import JSONDecodeError
+
+WILDCARD = "*"
+
+
+def extract(
+    json_string: str, paths: Iterable[str], decoder: Optional[Decoder] = None
+) -> Dict[str, Any]:
+    """Decodes the values at `paths` in `json_string`.
+
+    Returns a dict from each path to the value found at it. Paths containing a
+    wildcard map to a list of every value they match, in document order. Paths without
+    a wildcard that match nothing are left out of the result.
+
+    To extract the same paths from many documents, create an `Extractor` once and
+    reuse it.
+    """
+    return Extractor(paths, decoder).extract(json_string)
+
+
+class _PathNode:
+    """A node in the trie of requested paths."""
+
+    __slots__ = ("children", "paths")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _PathNode] = {}
+        # The requested paths that end at this node.
+        self.paths: List[str] = []
+
+
+class Extractor:
+    """Extracts the values at a fixed set of paths from JSON documents."""
+
+    def __init__(self, paths: Iterable[str], decoder: Optional[Decoder] = None):
+        self._decoder = decoder if decoder is not None else Decoder()
+        self._root = _PathNode()
+        self._wildcard_paths: Set[str] = set()
+        for path in paths:
+            segments = parse_pointer(path)
+            node = self._root
+            for segment in segments:
+                node = node.children.setdefault(segment, _PathNode())
+            if path not in node.paths:
+                node.paths.append(path)
+            if WILDCARD in segments:
+                self._wildcard_paths.add(path)
+
+    def extract(self, json_string: str) -> Dict[str, Any]:
+        results: Dict[str, Any] = {path: [] for path in self._wildcard_paths}
+        index = skip_whitespace(json_string, 0)
+        index = self._walk(json_string, index, [self._root], results)
+        if skip_whitespace(json_string, index) != len(json_string):
+            raise JSONDecodeError("more than one value at top level of json")
+        return results
+
+    def _walk(
+        self,
+        json_string: str,
+        index: int,
+        nodes: List[_PathNode],
+        results: Dict[str, Any],
+    ) -> int:
+        """Extracts values from the value at `index` for the paths below `nodes`.
+
+        Returns the index just past the end of the value.
+        """
+        if any(node.paths for node in nodes):
+            # At least one path ends here, so the whole value is needed anyway. Any
+            # longer paths are looked up in the decoded value.
+            value, index = self._decoder.decode_value(json_string, index)
+            self._collect(value, nodes, results)
+            return index
+
+        char = json_string[index : index + 1]
+        if char == "{":
+            return self._walk_object(json_string, index, nodes, results)
+        elif char == "[":
+            return self._walk_array(json_string, index, nodes, results)
+        # The paths continue past a scalar, so they can't match anything.
+        return skip_value(json_string, index)
+
+    def _walk_object(
+        self,
+        json_string: str,
+        index: int,
+        nodes: List[_PathNode],
+        results: Dict[str, Any],
+    ) -> int:
+        index = skip_whitespace(json_string, index + 1)
+        if json_string[index : index + 1] == "}":
+            return index + 1
+
+        while True:
+            key, index = self._decoder.decode_key(json_string, index)
+            children = _match(nodes, key)
+            if children:
+                index = self._walk(json_string, index, children, results)
+            else:
+                index = skip_value(json_string, index)
+            index = skip_whitespace(json_string, index)
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "}":
+                return index + 1
+            else:
+                raise JSONDecodeError(f"expected comma or close brace at index {index}")
+
+    def _walk_array(
+        self,
+        json_string: str,
+        index: int,
+        nodes: List[_PathNode],
+        results: Dict[str, Any],
+    ) -> int:
+        index = skip_whitespace(json_string, index + 1)
+        if json_string[index : index + 1] == "]":
+            return index + 1
+
+        element_index = 0
+        while True:
+            children = _match(nodes, str(element_index))
+            if children:
+                index = self._walk(json_string, index, children, results)
+            else:
+                index = skip_value(json_string, index)
+            element_index += 1
+            index = skip_whitespace(json_string, index)
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "]":
+                return index + 1
+            else:
+                raise JSONDecodeError(
+                    f"expecting comma or close bracket in list at index {index}"
+                )
+
+    def _collect(
+        self, value: Any, nodes: List[_PathNode], results: Dict[str, Any]
+    ) -> None:
+        """Records `value` for the paths ending at `nodes`.
+
+        Paths that continue below `nodes` are looked up within `value`.
+        """
+        for node in nodes:
+            for path in node.paths:
+                if path in self._wildcard_paths:
+                    results[path].append(value)
+                else:
+                    results[path] = value
+
+        children: List[_PathNode]
+        if isinstance(value, dict):
+            for key, child_value in value.items():
+                children = _match(nodes, key)
+                if children:
+                    self._collect(child_value, children, results)
+        elif isinstance(value, list):
+            for element_index, child_value in enumerate(value):
+                children = _match(nodes, str(element_index))
+                if children:
+                    self._collect(child_value, children, results)
+
+
+def _match(nodes: List[_PathNode], segment: str) -> List[_PathNode]:
+    """Returns the children of `nodes` that `segment` leads to."""
+    children = []
+    for node in nodes:
+        if not node.children:
+            continue
+        child = node.children.get(segment)
+        if child is not None:
+            children.append(child)
+        wildcard_child = node.children.get(WILDCARD)
+        if wildcard_child is not None:
+            children.append(wildcard_child)
+    return children
+
+
+def parse_pointer(path: str) -> List[str]:
+    """Splits a JSON Pointer into its (unescaped) reference tokens."""
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"JSON pointer must start with '/': {path!r}")
+    return [
+        segment.replace("~1", "/").replace("~0", "~") for segment in path[1:].split("/")
+    ]
@@ -0,0 +1,281 @@
+"""Decoding of JSON text that arrives in chunks.
+
+`IncrementalLexer` produces the same tokens as `oj.lex.lex`, but holds back any token
+that might continue into the next chunk (a string without its closing quote, a number
+or literal at the very end of the text seen so far) until more text arrives or the
+input is closed. Only that unfinished tail is buffered; everything before it is
+discarded as soon as it has been lexed.
+
+`IncrementalDecoder` builds values from those tokens as they're produced, keeping the
+containers that are still open on an explicit stack.
+"""
+
+from typing import Any, List, Optional, Tuple, Union
+
+from oj.exceptions import JSONDecodeError
+from oj.lex import DELIMITER_TYPES, SCAN_DISPATCH, WHITESPACE_RE
+from oj.parse import parse_scalar, parse_string
+from oj.tokens import Token, TokenType
+
+# How many characters oj.load() reads from a file at a time.
+DEFAULT_READ_SIZE = 64 * 1024
+
+# Literals that may be cut off at the end of a chunk. Numbers are handled separately.
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_MAX_LITERAL_LENGTH = max(len(literal) for literal in _LITERALS)
+
+# What IncrementalDecoder expects the next token to be.
+VALUE = 0
+ARRAY_FIRST = 1  # Value or close bracket.
+ARRAY_NEXT = 2  # Comma or close bracket.
+OBJECT_FIRST = 3  # Key or close brace.
+OBJECT_KEY = 4
+OBJECT_COLON = 5
+OBJECT_NEXT = 6  # Comma or close brace.
+DONE = 7
+
+_OPEN_TYPES = (TokenType.OPEN_BRACKET, TokenType.OPEN_BRACE)
+
+
+class IncrementalLexer:
+    """Lexes JSON text fed to it in chunks."""
+
+    def __init__(self) -> None:
+        # Text that has been fed in but not yet lexed.
+        self._buffer = ""
+        # Index in the overall input of the start of `_buffer`.
+        self._offset = 0
+        # If `_buffer` starts with an unterminated string, how far into `_buffer` we've
+        # already searched for the closing quote.
+        self._string_search_offset = 0
+
+    def feed(self, chunk: str) -> List[Token]:
+        """Returns the tokens completed by `chunk`."""
+        # Take the only reference to the buffer so that the concatenation below can
+        # extend it in place rather than copying it.
+        buffer = self._buffer
+        self._buffer = ""
+        buffer += chunk
+        return self._lex(buffer, final=False)
+
+    def close(self) -> List[Token]:
+        """Returns the remaining tokens once there's no more input."""
+        buffer = self._buffer
+        self._buffer = ""
+        return self._lex(buffer, final=True)
+
+    def _lex(self, buffer: str, final: bool) -> List[Token]:
+        tokens: List[Token] = []
+        index = 0
+        length = len(buffer)
+        while True:
+            index = WHITESPACE_RE.match(buffer, index).end()  # type: ignore
+            if index == length:
+                break
+            char = buffer[index]
+            if char == '"':
+                end_index = self._find_string_end(buffer, index)
+                if end_index is None:
+                    if final:
+                        raise JSONDecodeError(
+                            "unterminated string starting at index "
+                            f"{self._offset + index}"
+                        )
+                    break
+                token_type = TokenType.STRING
+            elif char in DELIMITER_TYPES:
+                token_type = DELIMITER_TYPES[char]
+                end_index = index + 1
+            else:
+                scanned = None
+                for scan_func in SCAN_DISPATCH.get(char, ()):
+                    scanned = scan_func(buffer, index)
+                    if scanned:
+                        break
+                if not final and _may_continue(buffer, index, scanned):
+                    break
+                if not scanned:
+                    raise JSONDecodeError(
+                        f"invalid character at index {self._offset + index}"
+                    )
+                token_type, end_index = scanned
+            tokens.append(
+                Token(token_type, buffer[index:end_index], self._offset + index)
+            )
+            index = end_index
+
+        self._buffer = buffer[index:]
+        self._offset += index
+        return tokens
+
+    def _find_string_end(self, buffer: str, start_index: int) -> Optional[int]:
+        """Finds the end of the string whose open quote is at `start_index`.
+
+        Returns None if the string isn't terminated within `buffer`.
+        """
+        search_index = max(start_index + 1, start_index + self._string_search_offset)
+        while True:
+            quote_index = buffer.find('"', search_index)
+            if quote_index == -1:
+                # Don't search this part of the string again when more text arrives.
+                self._string_search_offset = len(buffer) - start_index
+                return None
+            # The quote closes the string unless it's escaped by an odd number of
+            # backslashes.
+            backslash_index = quote_index - 1
+            while backslash_index > start_index and buffer[backslash_index] == "\\":
+                backslash_index -= 1
+            if (quote_index - 1 - backslash_index) % 2 == 0:
+                self._string_search_offset = 0
+                return quote_index + 1
+            search_index = quote_index + 1
+
+
+def _may_continue(
+    buffer: str, index: int, scanned: Optional[Tuple[TokenType, int]]
+) -> bool:
+    """Whether the token starting at `index` might continue past the end of `buffer`."""
+    if scanned and scanned[0] == TokenType.NUMBER and scanned[1] == len(buffer):
+        return True
+    if scanned and scanned[0] != TokenType.NUMBER:
+        return False
+    # The start of a literal, e.g. "nu", or a negative sign that might be the start of
+    # "-Infinity".
+    remainder = buffer[index : index + _MAX_LITERAL_LENGTH]
+    return any(
+        len(remainder) < len(literal) and literal.startswith(remainder)
+        for literal in _LITERALS
+    )
+
+
+class IncrementalDecoder:
+    """Decodes a JSON document fed to it in chunks.
+
+    Call `feed()` with each chunk of text in turn, then `close()` to get the decoded
+    value. Accepts exactly the same documents as `oj.loads`, however they're chunked.
+
+    If `max_depth` is given, documents nested more deeply than that are rejected.
+
+    If `multiple_values` is true, the text may hold any number of JSON values one after
+    another, e.g. newline-delimited JSON. Each value is available from `pop_values()`
+    as soon as it's complete, and `close()` returns a list of those not yet popped.
+    """
+
+    def __init__(
+        self, max_depth: Optional[int] = None, multiple_values: bool = False
+    ) -> None:
+        self.max_depth = max_depth
+        self.multiple_values = multiple_values
+        self._lexer = IncrementalLexer()
+        self._state = VALUE
+        # Containers that are still open, innermost last, and the key each object is
+        # waiting for a value for (None for lists).
+        self._stack: List[Union[list, dict]] = []
+        self._keys: List[Optional[str]] = []
+        self._result: Any = None
+        # Completed values not yet popped, if there may be more than one.
+        self._values: List[Any] = []
+
+    def feed(self, chunk: str) -> None:
+        for token in self._lexer.feed(chunk):
+            self._push_token(token)
+
+    def pop_values(self) -> List[Any]:
+        """Returns the values completed so far and not yet popped, in multi-value mode."""
+        values = self._values
+        self._values = []
+        return values
+
+    def close(self) -> Any:
+        for token in self._lexer.close():
+            self._push_token(token)
+        if self.multiple_values:
+            if self._stack:
+                raise JSONDecodeError("unexpected end of json")
+            return self.pop_values()
+        if self._state != DONE:
+            raise JSONDecodeError("unexpected end of json")
+        return self._result
+
+    def _push_token(self, token: Token) -> None:
+        token_type = token.token_type
+        state = self._state
+        if state == VALUE or (
+            state == ARRAY_FIRST and token_type != TokenType.CLOSE_BRACKET
+        ):
+            if token_type in _OPEN_TYPES:
+                self._check_depth(token)
+            if token_type == TokenType.OPEN_BRACKET:
+                self._stack.append([])
+                self._keys.append(None)
+                self._state = ARRAY_FIRST
+            elif token_type == TokenType.OPEN_BRACE:
+                self._stack.append({})
+                self._keys.append(None)
+                self._state = OBJECT_FIRST
+            else:
+                self._add_value(parse_scalar(token))
+        elif state == ARRAY_FIRST or state == ARRAY_NEXT:
+            if token_type == TokenType.CLOSE_BRACKET:
+                self._close_container()
+            elif token_type == TokenType.COMMA and state == ARRAY_NEXT:
+                self._state = VALUE
+            else:
+                raise JSONDecodeError(
+                    f"expecting comma or close bracket in list at index {token.index}"
+                )
+        elif state == OBJECT_FIRST or state == OBJECT_KEY:
+            if token_type == TokenType.STRING:
+                self._keys[-1] = parse_string(token)
+                self._state = OBJECT_COLON
+            elif token_type == TokenType.CLOSE_BRACE and state == OBJECT_FIRST:
+                self._close_container()
+            else:
+                raise JSONDecodeError(
+                    f"object keys must be strings at index {token.index}"
+                )
+        elif state == OBJECT_COLON:
+            if token_type != TokenType.COLON:
+                raise JSONDecodeError(f"expected colon at index {token.index}")
+            self._state = VALUE
+        elif state == OBJECT_NEXT:
+            if token_type == TokenType.COMMA:
+                self._state = OBJECT_KEY
+            elif token_type == TokenType.CLOSE_BRACE:
+                self._close_container()
+            else:
+                raise JSONDecodeError(
+                    f"expected comma or close brace at index {token.index}"
+                )
+        else:
+            raise JSONDecodeError(
+                f"more than one value at top level of json at index {token.index}"
+            )
+
+    def _check_depth(self, token: Token) -> None:
+        if self.max_depth is not None and len(self._stack) >= self.max_depth:
+            raise JSONDecodeError(
+                f"exceeded maximum nesting depth of {self.max_depth} at index "
+                f"{token.index}"
+            )
+
+    def _close_container(self) -> None:
+        self._keys.pop()
+        self._add_value(self._stack.pop())
+
+    def _add_value(self, value: Any) -> None:
+        if not self._stack:
+            if self.multiple_values:
+                self._values.append(value)
+                self._state = VALUE
+            else:
+                self._result = value
+                self._state = DONE
+            return
+        container = self._stack[-1]
+        if isinstance(container, list):
+            container.append(value)
+            self._state = ARRAY_NEXT
+        else:
+            container[self._keys[-1]] = value
+            self._state = OBJECT_NEXT
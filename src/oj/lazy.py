@@ -0,0 +1,342 @@
+"""Lazily decoded JSON documents.
+
+`loads_lazy` returns proxies for the objects and arrays in a document that only record
+where each of their children starts and ends in the source text. A child is decoded
+the first time it's accessed (child objects and arrays becoming proxies themselves),
+and the result is cached. Children that are never accessed are only skipped over, by
+matching up quotes and brackets, so they're never fully validated: a document with an
+error in a part that isn't read decodes without complaint.
+
+When NumPy is available, large documents are first run through
+`oj.structural.build_index`, and the children of each container are then found from
+the commas and colons directly inside it, without looking at the characters in between.
+"""
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from oj.decode import Decoder, skip_value, skip_whitespace
+from oj.exceptions import JSONDecodeError
+from oj.structural import StructuralIndex, build_index, numpy_available
+
+# Documents shorter than this aren't worth building a structural index for.
+STRUCTURAL_INDEX_THRESHOLD = 64 * 1024
+
+_COMMA = ord(",")
+_COLON = ord(":")
+
+# Sentinel for children that haven't been decoded yet.
+_NOT_DECODED = object()
+
+
+def loads_lazy(
+    json_string: str,
+    decoder: Optional[Decoder] = None,
+    use_structural_index: Optional[bool] = None,
+) -> Any:
+    """Lazily decodes `json_string`.
+
+    Objects and arrays are returned as `LazyObject` and `LazyArray` proxies; scalars
+    are decoded straight away. `decoder` is used to decode scalars, and defaults to a
+    plain `Decoder`.
+
+    `use_structural_index` controls whether a structural index of the document is
+    built up front. By default, one is built for large documents if NumPy is
+    available.
+    """
+    if decoder is None:
+        decoder = Decoder()
+    if use_structural_index is None:
+        use_structural_index = (
+            numpy_available() and len(json_string) >= STRUCTURAL_INDEX_THRESHOLD
+        )
+    structural_index = build_index(json_string) if use_structural_index else None
+
+    start_index = skip_whitespace(json_string, 0)
+    char = json_string[start_index : start_index + 1]
+    value: Union[LazyArray, LazyObject]
+    if char == "{":
+        value = LazyObject(json_string, start_index, decoder, structural_index)
+    elif char == "[":
+        value = LazyArray(json_string, start_index, decoder, structural_index)
+    else:
+        # A scalar, so there's nothing to defer.
+        return decoder.decode(json_string)
+    # Finding where the top-level container ends means finding the spans of its
+    # children anyway, so do it once up front, along with checking nothing follows it.
+    if skip_whitespace(json_string, value.end_index) != len(json_string):
+        raise JSONDecodeError("more than one value at top level of json")
+    return value
+
+
+def _decode_lazily(
+    json_string: str,
+    start_index: int,
+    end_index: int,
+    decoder: Decoder,
+    structural_index: Optional[StructuralIndex],
+) -> Any:
+    """Decodes the value in the given span, which may have whitespace either side."""
+    start_index = skip_whitespace(json_string, start_index)
+    char = json_string[start_index : start_index + 1]
+    if char == "{" or char == "[":
+        if structural_index is not None:
+            # Spans found from the structural index run from one separator to the next,
+            # so make sure the container is the only thing in it.
+            index = skip_value(json_string, start_index, structural_index)
+            if not _only_whitespace_between(json_string, index, end_index):
+                raise JSONDecodeError(
+                    f"unexpected characters after value at index {index}"
+                )
+        if char == "{":
+            return LazyObject(json_string, start_index, decoder, structural_index)
+        return LazyArray(json_string, start_index, decoder, structural_index)
+    if start_index >= end_index:
+        raise JSONDecodeError(f"expecting value at index {start_index}")
+    value, index = decoder.decode_scalar(json_string, start_index)
+    if not _only_whitespace_between(json_string, index, end_index):
+        raise JSONDecodeError(f"unexpected characters after value at index {index}")
+    return value
+
+
+def _only_whitespace_between(json_string: str, index: int, end_index: int) -> bool:
+    return index == end_index or skip_whitespace(json_string, index) == end_index
+
+
+class LazyObject(Mapping[str, Any]):
+    """A read-only mapping that decodes the JSON object at `start_index` on demand."""
+
+    def __init__(
+        self,
+        json_string: str,
+        start_index: int,
+        decoder: Decoder,
+        structural_index: Optional[StructuralIndex] = None,
+    ):
+        self._json_string = json_string
+        self._start_index = start_index
+        self._decoder = decoder
+        self._structural_index = structural_index
+        # Each key's value span, found the first time the object is accessed.
+        self._spans: Optional[Dict[str, Tuple[int, int]]] = None
+        self._end_index = -1
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values.get(key, _NOT_DECODED)
+        if value is _NOT_DECODED:
+            start_index, end_index = self._get_spans()[key]
+            value = _decode_lazily(
+                self._json_string,
+                start_index,
+                end_index,
+                self._decoder,
+                self._structural_index,
+            )
+            self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_spans())
+
+    def __len__(self) -> int:
+        return len(self._get_spans())
+
+    def __repr__(self) -> str:
+        return f"<LazyObject with {len(self)} keys at index {self._start_index}>"
+
+    @property
+    def end_index(self) -> int:
+        """The index just past the object's close brace."""
+        self._get_spans()
+        return self._end_index
+
+    def _get_spans(self) -> Dict[str, Tuple[int, int]]:
+        if self._spans is None:
+            if self._structural_index is None:
+                self._spans = self._find_spans()
+            else:
+                self._spans = self._find_spans_from_index(self._structural_index)
+        return self._spans
+
+    def _find_spans(self) -> Dict[str, Tuple[int, int]]:
+        json_string = self._json_string
+        spans: Dict[str, Tuple[int, int]] = {}
+        index = skip_whitespace(json_string, self._start_index + 1)
+        if json_string[index : index + 1] == "}":
+            # Empty dict.
+            self._end_index = index + 1
+            return spans
+
+        while True:
+            key, index = self._decode_key(index)
+            start_index = skip_whitespace(json_string, index + 1)
+            index = skip_value(json_string, start_index)
+            spans[key] = (start_index, index)
+            index = skip_whitespace(json_string, index)
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "}":
+                self._end_index = index + 1
+                return spans
+            else:
+                raise JSONDecodeError(f"expected comma or close brace at index {index}")
+
+    def _find_spans_from_index(
+        self, structural_index: StructuralIndex
+    ) -> Dict[str, Tuple[int, int]]:
+        json_string = self._json_string
+        separators, chars, close_index = structural_index.separators_of(
+            self._start_index
+        )
+        self._end_index = close_index + 1
+        spans: Dict[str, Tuple[int, int]] = {}
+        if not len(separators):
+            index = skip_whitespace(json_string, self._start_index + 1)
+            if index != close_index:
+                raise JSONDecodeError(f"expected colon at index {index}")
+            # Empty dict.
+            return spans
+
+        # Separators must alternate colon, comma, colon, ..., colon.
+        if (
+            len(separators) % 2 == 0
+            or (chars[0::2] != _COLON).any()
+            or (chars[1::2] != _COMMA).any()
+        ):
+            raise JSONDecodeError(f"malformed object at index {self._start_index}")
+        colons = separators[0::2].tolist()
+        commas = separators[1::2].tolist()
+        key_starts = [self._start_index] + commas
+        value_ends = commas + [close_index]
+        for key_start, colon_index, value_end in zip(key_starts, colons, value_ends):
+            index = skip_whitespace(json_string, key_start + 1)
+            key, index = self._decode_key(index)
+            if index != colon_index:
+                raise JSONDecodeError(f"expected colon at index {index}")
+            spans[key] = (colon_index + 1, value_end)
+        return spans
+
+    def _decode_key(self, index: int) -> Tuple[str, int]:
+        """Decodes the key at `index`, returning it and the index of its colon."""
+        json_string = self._json_string
+        if json_string[index : index + 1] != '"':
+            raise JSONDecodeError(f"object keys must be strings at index {index}")
+        key, index = self._decoder.decode_memoized_string(json_string, index)
+        index = skip_whitespace(json_string, index)
+        if json_string[index : index + 1] != ":":
+            raise JSONDecodeError(f"expected colon at index {index}")
+        return key, index
+
+
+class LazyArray(Sequence[Any]):
+    """A read-only sequence that decodes the JSON list at `start_index` on demand."""
+
+    def __init__(
+        self,
+        json_string: str,
+        start_index: int,
+        decoder: Decoder,
+        structural_index: Optional[StructuralIndex] = None,
+    ):
+        self._json_string = json_string
+        self._start_index = start_index
+        self._decoder = decoder
+        self._structural_index = structural_index
+        # Where each element starts and ends, found the first time the list is
+        # accessed.
+        self._starts: Optional[Sequence[int]] = None
+        self._ends: Sequence[int] = []
+        self._end_index = -1
+        self._values: List[Any] = []
+
+    def __getitem__(self, index):  # type: ignore
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        starts = self._get_starts()
+        value = self._values[index]
+        if value is _NOT_DECODED:
+            value = _decode_lazily(
+                self._json_string,
+                starts[index],
+                self._ends[index],
+                self._decoder,
+                self._structural_index,
+            )
+            self._values[index] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._get_starts())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<LazyArray of length {len(self)} at index {self._start_index}>"
+
+    @property
+    def end_index(self) -> int:
+        """The index just past the list's close bracket."""
+        self._get_starts()
+        return self._end_index
+
+    def _get_starts(self) -> Sequence[int]:
+        if self._starts is None:
+            if self._structural_index is None:
+                self._starts, self._ends = self._find_spans()
+            else:
+                self._starts, self._ends = self._find_spans_from_index(
+                    self._structural_index
+                )
+            self._values = [_NOT_DECODED] * len(self._starts)
+        return self._starts
+
+    def _find_spans(self) -> Tuple[List[int], List[int]]:
+        json_string = self._json_string
+        starts: List[int] = []
+        ends: List[int] = []
+        index = skip_whitespace(json_string, self._start_index + 1)
+        if json_string[index : index + 1] == "]":
+            # Empty list.
+            self._end_index = index + 1
+            return starts, ends
+
+        while True:
+            end_index = skip_value(json_string, index)
+            starts.append(index)
+            ends.append(end_index)
+            index = skip_whitespace(json_string, end_index)
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "]":
+                self._end_index = index + 1
+                return starts, ends
+            else:
+                raise JSONDecodeError(
+                    f"expecting comma or close bracket in list at index {index}"
+                )
+
+    def _find_spans_from_index(
+        self, structural_index: StructuralIndex
+    ) -> Tuple[List[int], List[int]]:
+        separators, chars, close_index = structural_index.separators_of(
+            self._start_index
+        )
+        self._end_index = close_index + 1
+        if not len(separators):
+            index = skip_whitespace(self._json_string, self._start_index + 1)
+            if index == close_index:
+                # Empty list.
+                return [], []
+        elif (chars != _COMMA).any():
+            raise JSONDecodeError(
+                f"expecting comma or close bracket in list at index {self._start_index}"
+            )
+        # Each element runs from just after one separator (or the open bracket) up to
+        # the next separator (or the close bracket).
+        bounds = [self._start_index] + separators.tolist() + [close_index]
+        return [bound + 1 for bound in bounds[:-1]], bounds[1:]
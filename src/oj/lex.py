@@ -1,11 +1,30 @@
+import re
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from oj.exceptions import JSONDecodeError
-from oj.tokens import Token, TokenType
+from oj.tokens import Token, TokenStream, TokenType
 
 JSON_WHITESPACE = " \t\r\n"
 
+# The patterns and tables below are shared with the decoders and the incremental lexer.
+WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+# Numbers are lexed permissively as any run of characters that may appear in a number;
+# whether the run is a well-formed number is checked by the parser.
+_NUMBER_RE = re.compile(r"[-+.eE0-9]+")
+# The body of a string, up to and including the closing quote. A backslash escapes
+# whichever character follows it, so an escaped quote doesn't close the string.
+STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+DELIMITER_TYPES = {
+    "{": TokenType.OPEN_BRACE,
+    "}": TokenType.CLOSE_BRACE,
+    "[": TokenType.OPEN_BRACKET,
+    "]": TokenType.CLOSE_BRACKET,
+    ",": TokenType.COMMA,
+    ":": TokenType.COLON,
+}
+
 
 @dataclass
 class TokenMatch:
@@ -15,118 +34,171 @@ class TokenMatch:
 
 LexFunc = Callable[[str, int], Optional[TokenMatch]]
 
+# Scan functions do the work behind the lex functions, but report a token as its type
+# and end index rather than allocating a Token, so that lex_stream() never has to
+# copy a lexeme out of the input string.
+ScanFunc = Callable[[str, int], Optional[Tuple[TokenType, int]]]
+
 
 def lex(json_string: str) -> List[Token]:
-    # Ordering of lex functions is based roughly on efficiency of the function
-    # (faster functions first) and how common the corresponding token type is
-    # expected to be (more common first) to avoid expensive negative checks.
-    lex_funcs: List[LexFunc] = [
-        lex_delimiter,
-        lex_null,
-        lex_bool,
-        lex_nan,
-        lex_infinity,  # Must come before lex_number, as both check for negative sign.
-        lex_number,
-        lex_string,
+    return [
+        Token(token_type, json_string[start_index:end_index], start_index)
+        for token_type, start_index, end_index in _scan_tokens(json_string)
     ]
 
-    tokens: List[Token] = []
+
+def lex_stream(json_string: str) -> TokenStream:
+    """Lexes `json_string` into a compact stream of token offsets.
+
+    Equivalent to `lex()`, but lexemes are only copied out of `json_string` when the
+    stream is indexed, so the tokens of a large input take a few bytes each.
+    """
+    stream = TokenStream(json_string)
+    append = stream.append
+    for token_type, start_index, end_index in _scan_tokens(json_string):
+        append(token_type, start_index, end_index)
+    return stream
+
+
+def _scan_tokens(json_string: str) -> Iterator[Tuple[TokenType, int, int]]:
     index = 0
-    while index < len(json_string):
-        if json_string[index] in JSON_WHITESPACE:
-            index += 1
-            continue
-        match: Optional[TokenMatch]
-        for lex_func in lex_funcs:
-            match = lex_func(json_string, index)
-            if match:
-                tokens.append(match.token)
-                index = match.next_index
+    length = len(json_string)
+    while index < length:
+        # Skip a whole run of whitespace at once rather than a character at a time.
+        index = WHITESPACE_RE.match(json_string, index).end()  # type: ignore
+        if index == length:
+            break
+        # Pick the scan functions that could possibly match based on the first
+        # character of the token, rather than trying every scan function in turn.
+        scanned: Optional[Tuple[TokenType, int]] = None
+        for scan_func in SCAN_DISPATCH.get(json_string[index], ()):
+            scanned = scan_func(json_string, index)
+            if scanned:
                 break
-        if not match:
+        if not scanned:
             raise JSONDecodeError(f"invalid character at index {index}")
-    return tokens
+        token_type, end_index = scanned
+        yield token_type, index, end_index
+        index = end_index
 
 
 def lex_bool(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    return _token_match(json_string, start_index, _scan_bool(json_string, start_index))
+
+
+def lex_delimiter(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    scanned = _scan_delimiter(json_string, start_index)
+    return _token_match(json_string, start_index, scanned)
+
+
+def lex_null(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    return _token_match(json_string, start_index, _scan_null(json_string, start_index))
+
+
+def lex_nan(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    return _token_match(json_string, start_index, _scan_nan(json_string, start_index))
+
+
+def lex_infinity(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    scanned = _scan_infinity(json_string, start_index)
+    return _token_match(json_string, start_index, scanned)
+
+
+def lex_number(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    scanned = _scan_number(json_string, start_index)
+    return _token_match(json_string, start_index, scanned)
+
+
+def lex_string(json_string: str, start_index: int) -> Optional[TokenMatch]:
+    scanned = _scan_string(json_string, start_index)
+    return _token_match(json_string, start_index, scanned)
+
+
+def _token_match(
+    json_string: str, start_index: int, scanned: Optional[Tuple[TokenType, int]]
+) -> Optional[TokenMatch]:
+    if scanned is None:
+        return None
+    token_type, end_index = scanned
+    token = Token(token_type, json_string[start_index:end_index], start_index)
+    return TokenMatch(token=token, next_index=end_index)
+
+
+def _scan_bool(json_string: str, start_index: int) -> Optional[Tuple[TokenType, int]]:
     for lexeme in "true", "false":
         if json_string.startswith(lexeme, start_index):
-            token = Token(TokenType.BOOLEAN, lexeme, start_index)
-            return TokenMatch(token=token, next_index=start_index + len(lexeme))
+            return TokenType.BOOLEAN, start_index + len(lexeme)
     return None
 
 
-def lex_delimiter(json_string: str, start_index: int) -> Optional[TokenMatch]:
-    delimiter_types = {
-        "{": TokenType.OPEN_BRACE,
-        "}": TokenType.CLOSE_BRACE,
-        "[": TokenType.OPEN_BRACKET,
-        "]": TokenType.CLOSE_BRACKET,
-        ",": TokenType.COMMA,
-        ":": TokenType.COLON,
-    }
+def _scan_delimiter(
+    json_string: str, start_index: int
+) -> Optional[Tuple[TokenType, int]]:
     lexeme = json_string[start_index]
-    if lexeme not in delimiter_types:
+    if lexeme not in DELIMITER_TYPES:
         return None
-    token = Token(delimiter_types[lexeme], lexeme, start_index)
-    return TokenMatch(token=token, next_index=start_index + 1)
+    return DELIMITER_TYPES[lexeme], start_index + 1
 
 
-def lex_null(json_string: str, start_index: int) -> Optional[TokenMatch]:
-    null_literal = "null"
-    if json_string.startswith(null_literal, start_index):
-        token = Token(TokenType.NULL, null_literal, start_index)
-        return TokenMatch(token=token, next_index=start_index + len(null_literal))
+def _scan_null(json_string: str, start_index: int) -> Optional[Tuple[TokenType, int]]:
+    if json_string.startswith("null", start_index):
+        return TokenType.NULL, start_index + 4
     return None
 
 
-def lex_nan(json_string: str, start_index: int) -> Optional[TokenMatch]:
-    nan_literal = "NaN"
-    if json_string.startswith(nan_literal, start_index):
-        token = Token(TokenType.NAN, nan_literal, start_index)
-        return TokenMatch(token=token, next_index=start_index + len(nan_literal))
+def _scan_nan(json_string: str, start_index: int) -> Optional[Tuple[TokenType, int]]:
+    if json_string.startswith("NaN", start_index):
+        return TokenType.NAN, start_index + 3
     return None
 
 
-def lex_infinity(json_string: str, start_index: int) -> Optional[TokenMatch]:
-    inf_literal = "Infinity"
-    negative_inf_literal = "-" + inf_literal
-    for literal in (inf_literal, negative_inf_literal):
+def _scan_infinity(
+    json_string: str, start_index: int
+) -> Optional[Tuple[TokenType, int]]:
+    for literal in ("Infinity", "-Infinity"):
         if json_string.startswith(literal, start_index):
-            token = Token(TokenType.INFINITY, literal, start_index)
-            return TokenMatch(token=token, next_index=start_index + len(literal))
+            return TokenType.INFINITY, start_index + len(literal)
     return None
 
 
-def lex_number(json_string: str, start_index: int) -> Optional[TokenMatch]:
-    number_chars = {"-", "+", ".", "e", "E"} | set(map(str, range(10)))
-    end_index = start_index
-    while end_index < len(json_string) and json_string[end_index] in number_chars:
-        end_index += 1
-    if end_index == start_index:
+def _scan_number(json_string: str, start_index: int) -> Optional[Tuple[TokenType, int]]:
+    number_match = _NUMBER_RE.match(json_string, start_index)
+    if not number_match:
         return None
-    token = Token(TokenType.NUMBER, json_string[start_index:end_index], start_index)
-    return TokenMatch(token=token, next_index=end_index)
+    return TokenType.NUMBER, number_match.end()
 
 
-def lex_string(json_string: str, start_index: int) -> Optional[TokenMatch]:
+def _scan_string(json_string: str, start_index: int) -> Optional[Tuple[TokenType, int]]:
     if json_string[start_index] != '"':
         return None
 
-    close_index = start_index + 1
-    # Whether the previous character was a backslash preceded by an even number of
-    # backslashes.
-    escaped = False
-    for close_index in range(start_index + 1, len(json_string)):
-        char = json_string[close_index]
-        if not escaped and char == "\\":
-            escaped = True
-        elif escaped:
-            escaped = False
-        elif char == '"':
-            string = json_string[start_index : close_index + 1]
-            token = Token(TokenType.STRING, string, start_index)
-            return TokenMatch(token=token, next_index=close_index + 1)
-
-    # Got to the end of the input string without finding a closing quote.
-    raise JSONDecodeError(f"unterminated string starting at index {start_index}")
+    body_match = STRING_BODY_RE.match(json_string, start_index + 1)
+    if not body_match:
+        # Got to the end of the input string without finding a closing quote.
+        raise JSONDecodeError(f"unterminated string starting at index {start_index}")
+    return TokenType.STRING, body_match.end()
+
+
+def _build_dispatch_table() -> Dict[str, Tuple[ScanFunc, ...]]:
+    """Maps each character that can start a token to the scan functions to try.
+
+    Where more than one scan function applies to a character, they're listed in the
+    order they must be tried in.
+    """
+    table: Dict[str, Tuple[ScanFunc, ...]] = {
+        delimiter: (_scan_delimiter,) for delimiter in DELIMITER_TYPES
+    }
+    for char in "+.eE0123456789":
+        table[char] = (_scan_number,)
+    # _scan_infinity must come before _scan_number, as both accept a negative sign.
+    table["-"] = (_scan_infinity, _scan_number)
+    table["t"] = table["f"] = (_scan_bool,)
+    table["n"] = (_scan_null,)
+    table["N"] = (_scan_nan,)
+    table["I"] = (_scan_infinity,)
+    table['"'] = (_scan_string,)
+    return table
+
+
+# The scan functions to try for each character that can start a token.
+SCAN_DISPATCH = _build_dispatch_table()
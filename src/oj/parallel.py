@@ -0,0 +1,432 @@
+"""Decoding many JSON documents across processes."""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from oj.decode import Decoder, decode, skip_value
+from oj.decode_bytes import decode_bytes, detect_encoding
+from oj.exceptions import JSONDecodeError
+from oj.structural import build_index
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    # Python < 3.8, where large documents are pickled like any other.
+    shared_memory = None  # type: ignore
+
+ERROR_POLICIES = ("raise", "skip", "collect")
+
+# Documents at least this large (in characters or bytes) are passed to worker processes
+# through shared memory rather than by pickling them.
+SHARED_MEMORY_THRESHOLD = 1024 * 1024
+# Without a chunksize, loads_many() batches documents into chunks of about this many
+# characters or bytes, or smaller ones if that's what it takes to give each worker a
+# few chunks.
+_TARGET_CHUNK_SIZE = 256 * 1024
+_CHUNKS_PER_WORKER = 4
+# Documents shorter than this are decoded in-process by loads_parallel(), and batches
+# shorter than this in total by loads_many(), as sending them to other processes
+# wouldn't pay for itself.
+PARALLEL_THRESHOLD = 1024 * 1024
+
+
+class LineError(NamedTuple):
+    """A line that failed to decode, yielded by `iter_lines` with errors="collect"."""
+
+    line_number: int
+    # As read from the file, so `bytes` if the file was opened in binary mode.
+    line: Union[str, bytes]
+    error: JSONDecodeError
+
+
+class DocumentError(NamedTuple):
+    """A document that failed to decode, returned by `loads_many` with errors="collect"."""
+
+    document_index: int
+    error: JSONDecodeError
+
+
+class _SharedDocument(NamedTuple):
+    """A UTF-8 encoded document in the named block of shared memory."""
+
+    name: str
+    size: int
+    # Whether the document was a `str`, to be decoded as one.
+    is_str: bool
+
+
+def iter_lines(
+    json_file: IO,
+    workers: int = 1,
+    batch_size: int = 1000,
+    errors: str = "raise",
+    max_pending: Optional[int] = None,
+) -> Iterator[Any]:
+    """Decodes each line of a newline-delimited JSON (JSON Lines) file.
+
+    `json_file` may be open in text or binary mode; the lines of a binary file are
+    decoded from bytes, as by `oj.loads`. Yields the decoded lines in file order,
+    skipping blank lines. With `workers`
+    greater than 1, lines are decoded in a pool of that many processes, `batch_size`
+    lines at a time, with at most `max_pending` batches (by default, twice the number
+    of workers) read ahead of the one being yielded from.
+
+    `errors` determines what happens to lines that aren't valid JSON: "raise" raises a
+    JSONDecodeError naming the line number, "skip" drops the line, and "collect" yields
+    a `LineError` in its place.
+    """
+    if errors not in ERROR_POLICIES:
+        raise ValueError(f"errors must be one of {ERROR_POLICIES}, not {errors!r}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    batches = _batch_lines(json_file, batch_size)
+    if workers <= 1:
+        for first_line_number, lines in batches:
+            yield from _handle_errors(_decode_lines(first_line_number, lines), errors)
+        return
+
+    if max_pending is None:
+        max_pending = 2 * workers
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future] = deque()
+    try:
+        for batch in islice(batches, max_pending):
+            pending.append(executor.submit(_decode_lines, *batch))
+        while pending:
+            results = pending.popleft().result()
+            # Keep the pool busy while the results are consumed.
+            for batch in islice(batches, 1):
+                pending.append(executor.submit(_decode_lines, *batch))
+            yield from _handle_errors(results, errors)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+
+def loads_many(
+    texts: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    errors: str = "raise",
+    executor: Optional[Executor] = None,
+) -> List[Any]:
+    """Decodes each of a batch of independent JSON documents, across processes.
+
+    `texts` may contain `str`s and `bytes`. Returns the decoded documents in the same
+    order, each as `oj.loads` would decode it. With `workers` greater than 1 (by
+    default, the number of CPUs), documents are decoded in a pool of that many
+    processes, `chunksize` documents at a time. If `chunksize` isn't given, documents
+    are batched by size instead, so that many small documents share the cost of a
+    round trip to a worker. Documents of at least `SHARED_MEMORY_THRESHOLD` are passed
+    to workers through shared memory rather than being pickled. A batch shorter than
+    `PARALLEL_THRESHOLD` in total is decoded in-process.
+
+    `executor` may be a `ProcessPoolExecutor` to use instead of starting a new pool
+    for each batch; it's left running. Documents are then batched for `workers`
+    workers, if given.
+
+    `errors` is as for `iter_lines`, except that errors name the index of the document
+    in `texts`, and "collect" returns a `DocumentError` in its place.
+    """
+    if errors not in ERROR_POLICIES:
+        raise ValueError(f"errors must be one of {ERROR_POLICIES}, not {errors!r}")
+    if chunksize is not None and chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    documents = list(texts)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if (
+        (workers <= 1 and executor is None)
+        or len(documents) <= 1
+        or sum(len(document) for document in documents) < PARALLEL_THRESHOLD
+    ):
+        return list(_handle_errors(_decode_documents(0, documents), errors))
+
+    own_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    shared_blocks: List[Any] = []
+    futures: List[Future] = []
+    try:
+        for first_index, chunk in _chunk_documents(documents, workers, chunksize):
+            futures.append(
+                executor.submit(
+                    _decode_documents, first_index, _share(chunk, shared_blocks)
+                )
+            )
+        results = [result for future in futures for result in future.result()]
+    finally:
+        # Shared memory can't be freed while a worker may still be reading it.
+        for future in futures:
+            future.cancel()
+        wait(futures)
+        if own_executor:
+            executor.shutdown()
+        for block in shared_blocks:
+            block.close()
+            block.unlink()
+    return list(_handle_errors(results, errors))
+
+
+def loads_parallel(
+    json_string: Any, workers: Optional[int] = None, **decoder_options: Any
+) -> Any:
+    """Decodes a JSON document whose top level is a large list, across processes.
+
+    The list is split at top-level commas into a few segments per worker (by default,
+    one worker per CPU), which are decoded in a pool of processes and joined back
+    together in order. Commas in strings and nested containers are told apart using
+    the structural index of `oj.structural` if NumPy is available, and otherwise by
+    skipping over each element.
+
+    Any other document, and any shorter than `PARALLEL_THRESHOLD`, is decoded
+    in-process, and so is a document with an error anywhere in it, so errors are
+    raised exactly as `oj.loads` would raise them. `decoder_options` are as for
+    `oj.loads`; any hooks among them must be picklable.
+    """
+    if not isinstance(json_string, str):
+        json_string = str(json_string, detect_encoding(json_string))
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    segments = None
+    if (
+        workers > 1
+        and len(json_string) >= PARALLEL_THRESHOLD
+        # A list of nothing but numbers is decoded into a single array.
+        and not decoder_options.get("numeric_arrays")
+    ):
+        segments = _split_list(json_string, workers * _CHUNKS_PER_WORKER)
+    if segments is None:
+        return Decoder(**decoder_options).decode(json_string)
+
+    values: List[Any] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_decode_segment, json_string[start:end], decoder_options)
+            for start, end in segments
+        ]
+        try:
+            for future in futures:
+                values.extend(future.result())
+        except JSONDecodeError:
+            for future in futures:
+                future.cancel()
+            # Decode the whole document to raise the error with its index in it.
+            return Decoder(**decoder_options).decode(json_string)
+    return values
+
+
+def _split_list(json_string: str, count: int) -> Optional[List[Tuple[int, int]]]:
+    """Splits the top-level list in `json_string` into up to `count` segments.
+
+    Returns the start and end index of each segment, i.e. of the text between the
+    list's brackets and the commas chosen to split it at, or None if the document
+    isn't a single list with at least one comma to split it at.
+    """
+    skip_whitespace = Decoder._skip_whitespace
+    open_index = skip_whitespace(json_string, 0)
+    if json_string[open_index : open_index + 1] != "[":
+        return None
+    targets = [len(json_string) * i // count for i in range(1, count)]
+    try:
+        structural_index = build_index(json_string)
+        if structural_index is not None:
+            close_index = structural_index.close_of(open_index)
+            top_level = (structural_index.depths == 1) & (
+                structural_index.chars == ord(",")
+            )
+            commas = structural_index.positions[top_level]
+            # The first comma after each target, if any.
+            chosen = commas.searchsorted(targets)
+            chosen = chosen[chosen < len(commas)]
+            split_indices = sorted({int(index) for index in commas[chosen]})
+        else:
+            split_indices, close_index = _find_split_commas(
+                json_string, open_index, targets
+            )
+    except (JSONDecodeError, ValueError):
+        return None
+    if skip_whitespace(json_string, close_index + 1) != len(json_string):
+        return None
+    if not split_indices:
+        return None
+    starts = [open_index + 1] + [index + 1 for index in split_indices]
+    ends = split_indices + [close_index]
+    return list(zip(starts, ends))
+
+
+def _find_split_commas(
+    json_string: str, open_index: int, targets: List[int]
+) -> Tuple[List[int], int]:
+    """Finds the first top-level comma after each target index, by skipping elements.
+
+    Returns the commas found and the index of the list's close bracket.
+    """
+    skip_whitespace = Decoder._skip_whitespace
+    commas: List[int] = []
+    targets = targets[::-1]
+    index = skip_whitespace(json_string, open_index + 1)
+    while True:
+        index = skip_whitespace(json_string, skip_value(json_string, index))
+        char = json_string[index : index + 1]
+        if char == ",":
+            if targets and index >= targets[-1]:
+                commas.append(index)
+                while targets and index >= targets[-1]:
+                    targets.pop()
+            index = skip_whitespace(json_string, index + 1)
+        elif char == "]":
+            return commas, index
+        else:
+            raise JSONDecodeError(
+                f"expecting comma or close bracket in list at index {index}"
+            )
+
+
+def _decode_segment(segment: str, decoder_options: Dict[str, Any]) -> List[Any]:
+    """Decodes the elements in a segment of a list."""
+    values: Any = Decoder(**decoder_options).decode("[" + segment + "]")
+    if not values:
+        # A comma with nothing before it; the index of the error is found by decoding
+        # the whole document.
+        raise JSONDecodeError("expecting value")
+    return values
+
+
+def _batch_lines(json_file: IO, batch_size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Splits the lines of `json_file` into batches, each with its first line number."""
+    line_number = 1
+    while True:
+        lines = list(islice(json_file, batch_size))
+        if not lines:
+            return
+        yield line_number, lines
+        line_number += len(lines)
+
+
+def _decode_lines(first_line_number: int, lines: List[Any]) -> List[Any]:
+    """Decodes a batch of lines, returning a LineError for each one that's invalid.
+
+    The lines may be `str`s or, if they were read from a binary file, `bytes`.
+    """
+    results: List[Any] = []
+    for line_number, line in enumerate(lines, first_line_number):
+        if not line or line.isspace():
+            continue
+        try:
+            if isinstance(line, str):
+                results.append(decode(line))
+            else:
+                results.append(decode_bytes(line))
+        except JSONDecodeError as exc:
+            results.append(LineError(line_number, line, exc))
+    return results
+
+
+def _chunk_documents(
+    documents: List[Any], workers: int, chunksize: Optional[int]
+) -> Iterator[Tuple[int, List[Any]]]:
+    """Splits documents into chunks, each with the index of its first document."""
+    if chunksize is not None:
+        for first_index in range(0, len(documents), chunksize):
+            yield first_index, documents[first_index : first_index + chunksize]
+        return
+
+    total_size = sum(len(document) for document in documents)
+    target_size = min(_TARGET_CHUNK_SIZE, total_size // (workers * _CHUNKS_PER_WORKER))
+    first_index = 0
+    chunk_size = 0
+    for index, document in enumerate(documents):
+        chunk_size += len(document)
+        if chunk_size >= target_size:
+            yield first_index, documents[first_index : index + 1]
+            first_index = index + 1
+            chunk_size = 0
+    if first_index < len(documents):
+        yield first_index, documents[first_index:]
+
+
+def _share(documents: List[Any], shared_blocks: List[Any]) -> List[Any]:
+    """Moves the large documents in a chunk into shared memory.
+
+    Returns the chunk with each of them replaced by a `_SharedDocument`, and adds the
+    blocks of shared memory to `shared_blocks`, for the caller to free.
+    """
+    if shared_memory is None:
+        return documents
+    shared_documents = []
+    for document in documents:
+        if len(document) >= SHARED_MEMORY_THRESHOLD:
+            is_str = isinstance(document, str)
+            if is_str:
+                document = document.encode("utf-8", "surrogatepass")
+            size = len(document)
+            block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            shared_blocks.append(block)
+            block.buf[:size] = document  # type: ignore
+            document = _SharedDocument(block.name, size, is_str)
+        shared_documents.append(document)
+    return shared_documents
+
+
+def _decode_documents(first_index: int, documents: Sequence[Any]) -> List[Any]:
+    """Decodes a chunk of documents, returning a DocumentError for each invalid one."""
+    results: List[Any] = []
+    for index, document in enumerate(documents, first_index):
+        try:
+            if isinstance(document, str):
+                results.append(decode(document))
+            elif isinstance(document, _SharedDocument):
+                results.append(_decode_shared(document))
+            else:
+                results.append(decode_bytes(document))
+        except JSONDecodeError as exc:
+            results.append(DocumentError(index, exc))
+    return results
+
+
+def _decode_shared(document: _SharedDocument) -> Any:
+    block = shared_memory.SharedMemory(name=document.name)
+    try:
+        with block.buf[: document.size] as json_bytes:  # type: ignore
+            if document.is_str:
+                # Decoded as the `str` it was, as a `str` mustn't start with a BOM.
+                return decode(str(json_bytes, "utf-8", "surrogatepass"))
+            return decode_bytes(json_bytes)
+    finally:
+        block.close()
+
+
+def _handle_errors(results: List[Any], errors: str) -> Iterator[Any]:
+    for result in results:
+        if isinstance(result, (LineError, DocumentError)):
+            if errors == "raise":
+                if isinstance(result, LineError):
+                    location = f"on line {result.line_number}"
+                else:
+                    location = f"in document {result.document_index}"
+                raise JSONDecodeError(
+                    f"invalid JSON {location}: {result.error}"
+                ) from result.error
+            elif errors == "skip":
+                continue
+        yield result
@@ -1,45 +1,71 @@
 import math
-from typing import Any, Dict, List, Optional, Tuple, Union
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from oj.exceptions import JSONDecodeError
 from oj.tokens import Token, TokenType
 
-
-def parse(tokens: List[Token]) -> Union[None, bool, float, str, list, dict]:
+# A JSON number, split into its integer part, fraction and exponent. The lexer accepts
+# any run of characters that may appear in a number, so lexemes are checked against
+# this before they're converted.
+NUMBER_RE = re.compile(r"(-?(?:0|[1-9][0-9]*))(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+# A run of characters in a string up to the next backslash or quote, and which of the
+# two it is.
+_STRING_CHUNK_RE = re.compile(r'([^"\\]*)(["\\])', re.DOTALL)
+_HEX_RE = re.compile(r"[0-9a-fA-F]{4}")
+_ESCAPE_CHARS = {
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    '"': '"',
+    "/": "/",
+    "\\": "\\",
+}
+
+
+def parse(tokens: Sequence[Token]) -> Union[None, bool, float, str, list, dict]:
     value, next_index = parse_value(tokens, 0)
     if next_index != len(tokens):
         raise JSONDecodeError("more than one value at top level of json")
     return value
 
 
-def parse_value(tokens: List[Token], index: int) -> Tuple[Any, int]:
+def parse_value(tokens: Sequence[Token], index: int) -> Tuple[Any, int]:
     if index >= len(tokens):
         raise JSONDecodeError(f"expecting value at index {index}")
     token = tokens[index]
+    if token.token_type == TokenType.OPEN_BRACKET:
+        return parse_array(tokens, index)
+    elif token.token_type == TokenType.OPEN_BRACE:
+        return parse_object(tokens, index)
+    else:
+        return parse_scalar(token), index + 1
+
+
+def parse_scalar(token: Token) -> Any:
+    """Parses a value that consists of a single token, i.e. anything but a container."""
     if token.token_type == TokenType.NULL:
         assert token.lexeme == "null", "null token lexeme must be 'null'"
-        return None, index + 1
+        return None
     elif token.token_type == TokenType.BOOLEAN:
-        return parse_boolean(token), index + 1
+        return parse_boolean(token)
     elif token.token_type == TokenType.NUMBER:
-        return parse_number(token), index + 1
+        return parse_number(token)
     elif token.token_type == TokenType.INFINITY:
         if token.lexeme == "Infinity":
-            return math.inf, index + 1
+            return math.inf
         elif token.lexeme == "-Infinity":
-            return -math.inf, index + 1
+            return -math.inf
         assert False, "invalid infinity lexeme"
     elif token.token_type == TokenType.NAN:
         assert token.lexeme == "NaN", "NaN token lexeme must be 'NaN'"
-        return math.nan, index + 1
+        return math.nan
     elif token.token_type == TokenType.STRING:
-        return parse_string(token), index + 1
-    elif token.token_type == TokenType.OPEN_BRACKET:
-        return parse_array(tokens, index)
-    elif token.token_type == TokenType.OPEN_BRACE:
-        return parse_object(tokens, index)
+        return parse_string(token)
     else:
-        raise JSONDecodeError(f"expecting value at index {index}")
+        raise JSONDecodeError(f"expecting value at index {token.index}")
 
 
 def parse_boolean(token: Token) -> bool:
@@ -52,128 +78,115 @@ def parse_boolean(token: Token) -> bool:
 
 
 def parse_number(token: Token) -> Union[int, float]:
-    number: Union[int, float]
-    literal = token.lexeme
-    number, index = _parse_integer(literal)
-
-    if index < len(literal) and literal[index] == ".":
-        number = float(number)
-        index += 1
-        decimal_places = 0
-        while index < len(literal) and literal[index].isdigit():
-            decimal_places += 1
-            number += _parse_digit(literal[index]) / (10 ** decimal_places)
-            index += 1
-        if decimal_places == 0:
-            raise JSONDecodeError("no decimal places after period")
-
-    if index < len(literal) and literal[index].lower() == "e":
-        exponent, index = _parse_integer(
-            literal, index + 1, allow_plus=True, allow_leading_zeros=True
-        )
-        number = float(number) * (10 ** exponent)
-
-    if index < len(literal):
-        raise JSONDecodeError("unexpected characters after number")
+    return parse_number_literal(token.lexeme)
 
-    return number
 
+def parse_number_literal(literal: str) -> Union[int, float]:
+    """Converts a number lexeme exactly as `json.loads` does.
 
-def _parse_integer(
-    literal: str,
-    start_index: int = 0,
-    allow_plus: bool = False,
-    allow_leading_zeros: bool = False,
-) -> Tuple[int, int]:
-    if start_index >= len(literal):
-        raise JSONDecodeError("expected number")
+    Returns an int, or a float if the number has a fraction or an exponent.
+    """
+    number_match = NUMBER_RE.fullmatch(literal)
+    if not number_match:
+        raise JSONDecodeError(f"invalid number {literal!r}")
+    _, fraction, exponent = number_match.groups()
+    if fraction is None and exponent is None:
+        return int(literal)
+    return float(literal)
 
-    is_negative = literal[start_index] == "-"
-    if literal[start_index] == "-" or (allow_plus and literal[start_index] == "+"):
-        start_index += 1
 
-    index = start_index
-    integer = 0
-    # We could just use the int(str) function, but that would be cheating.
-    while index < len(literal) and literal[index].isdigit():
-        integer *= 10
-        integer += _parse_digit(literal[index])
-        index += 1
-
-    if index == start_index:
-        raise JSONDecodeError("expected number")
-
-    if (
-        not allow_leading_zeros
-        and literal[start_index] == "0"
-        and index - start_index > 1
-    ):
-        raise JSONDecodeError("leading zeros in number")
-
-    if is_negative:
-        integer *= -1
-    return integer, index
-
-
-def _parse_digit(digit: str) -> int:
-    # Again, int() is easy but cheating.
-    return ord(digit) - ord("0")
+def parse_string(token: Token) -> str:
+    return parse_string_literal(token.lexeme)
 
 
-def parse_string(token: Token) -> str:
-    has_quotes = token.lexeme.startswith('"') and token.lexeme.endswith('"')
+def parse_string_literal(lexeme: str) -> str:
+    has_quotes = lexeme.startswith('"') and lexeme.endswith('"')
     assert has_quotes, "string lexeme not quoted"
-
-    chars: List[str] = []
-    escaped = False
-    current_unicode_literal: Optional[List[str]] = None
-    for i in range(1, len(token.lexeme) - 1):
-        char = token.lexeme[i]
-        if current_unicode_literal is not None:
-            current_unicode_literal.append(char)
-            if len(current_unicode_literal) == 4:
-                try:
-                    char_point = int("".join(current_unicode_literal), base=16)
-                except ValueError:
-                    raise JSONDecodeError("invalid hex in unicode literal")
-                chars.append(chr(char_point))
-                current_unicode_literal = None
-        elif not escaped and char == "\\":
-            # Backlash; escape the next character.
-            escaped = True
-        elif escaped:
-            # The previous character was a backslash.
-            escaped = False
-            if char == "u":
-                current_unicode_literal = []
-            else:
-                try:
-                    escape_char = {
-                        "b": "\b",
-                        "f": "\f",
-                        "n": "\n",
-                        "r": "\r",
-                        "t": "\t",
-                        '"': '"',
-                        "/": "/",
-                        "\\": "\\",
-                    }[char]
-                except KeyError:
-                    raise JSONDecodeError("invalid \\escape")
-                chars.append(escape_char)
+    if "\\" not in lexeme:
+        # Nothing to decode.
+        return lexeme[1:-1]
+
+    string, end_index = scan_string(lexeme, 0)
+    if end_index != len(lexeme):
+        raise JSONDecodeError(
+            f"unexpected characters after string at index {end_index}"
+        )
+    return string
+
+
+def scan_string(json_string: str, start_index: int) -> Tuple[str, int]:
+    """Decodes the string whose open quote is at `start_index` in `json_string`.
+
+    Finds the closing quote and decodes escapes in the same pass, copying each run of
+    characters between escapes in one slice. Returns the string and the index just
+    past the closing quote.
+    """
+    chunk_match = _STRING_CHUNK_RE.match(json_string, start_index + 1)
+    if chunk_match is None:
+        raise JSONDecodeError(f"unterminated string starting at index {start_index}")
+    content, terminator = chunk_match.groups()
+    if terminator == '"':
+        # No escapes, which is the common case.
+        return content, chunk_match.end()
+
+    chunks = [content]
+    append = chunks.append
+    match_chunk = _STRING_CHUNK_RE.match
+    while True:
+        index = chunk_match.end()
+        escape_char = json_string[index : index + 1]
+        if escape_char in _ESCAPE_CHARS:
+            append(_ESCAPE_CHARS[escape_char])
+            index += 1
         else:
-            # Regular old character.
-            chars.append(char)
-
-    if current_unicode_literal is not None:
-        raise JSONDecodeError("unterminated unicode literal")
-    if escaped:
-        raise JSONDecodeError("unterminated escape sequence")
-
-    return "".join(chars)
-
-
-def parse_array(tokens: List[Token], index: int) -> Tuple[List[Any], int]:
+            char, index = _decode_escape(json_string, index)
+            append(char)
+        chunk_match = match_chunk(json_string, index)
+        if chunk_match is None:
+            raise JSONDecodeError(
+                f"unterminated string starting at index {start_index}"
+            )
+        content, terminator = chunk_match.groups()
+        append(content)
+        if terminator == '"':
+            return "".join(chunks), chunk_match.end()
+
+
+def _decode_escape(json_string: str, index: int) -> Tuple[str, int]:
+    """Decodes the escape sequence following the backslash just before `index`.
+
+    Returns the escaped character and the index just past the escape sequence.
+    """
+    escape_char = json_string[index : index + 1]
+    if escape_char != "u":
+        try:
+            return _ESCAPE_CHARS[escape_char], index + 1
+        except KeyError:
+            raise JSONDecodeError(f"invalid \\escape at index {index - 1}")
+
+    code_point = _decode_hex(json_string, index + 1)
+    index += 5
+    if 0xD800 <= code_point <= 0xDBFF and json_string.startswith("\\u", index):
+        # A UTF-16 surrogate pair encodes a single character outside of the BMP.
+        low_surrogate = _decode_hex(json_string, index + 2)
+        if 0xDC00 <= low_surrogate <= 0xDFFF:
+            code_point = 0x10000 + (
+                (code_point - 0xD800) << 10 | low_surrogate - 0xDC00
+            )
+            index += 6
+    return chr(code_point), index
+
+
+def _decode_hex(json_string: str, index: int) -> int:
+    hex_digits = json_string[index : index + 4]
+    if len(hex_digits) < 4:
+        raise JSONDecodeError(f"unterminated unicode literal at index {index}")
+    if not _HEX_RE.fullmatch(hex_digits):
+        raise JSONDecodeError(f"invalid hex in unicode literal at index {index}")
+    return int(hex_digits, base=16)
+
+
+def parse_array(tokens: Sequence[Token], index: int) -> Tuple[List[Any], int]:
     """Parses a JSON list whose open bracket is at `index` in `tokens`."""
     assert tokens[index].token_type == TokenType.OPEN_BRACKET
     index += 1
@@ -208,7 +221,7 @@ def parse_array(tokens: List[Token], index: int) -> Tuple[List[Any], int]:
     return result_list, index + 1
 
 
-def parse_object(tokens: List[Token], index: int) -> Tuple[Dict[str, Any], int]:
+def parse_object(tokens: Sequence[Token], index: int) -> Tuple[Dict[str, Any], int]:
     assert tokens[index].token_type == TokenType.OPEN_BRACE
     index += 1
     if index >= len(tokens):
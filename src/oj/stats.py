@@ -0,0 +1,146 @@
+"""Statistics about decoded documents, for finding out why a payload was slow.
+
+Pass a `DecodeStats` to `oj.loads` as `stats` to have it record how long the document
+took to decode and what it was made of:
+
+    stats = oj.DecodeStats()
+    value = oj.loads(payload, stats=stats)
+    print(stats.as_dict())
+
+Statistics accumulate over every document decoded with the same `DecodeStats`. An
+`exporter`, if given, is called with the `DecodeStats` by `export()`, and so when it's
+used as a context manager and the `with` block exits, e.g. to send the statistics on to
+a metrics system.
+
+The decoder works in a single pass, without a separate lexing phase, so lexing is
+measured by tokenizing the document again after it's decoded, with `oj.lex.lex_stream`,
+and the token statistics are gathered from the resulting tokens. That makes decoding
+with statistics a few times slower than without; decoding without them costs nothing
+extra.
+"""
+
+import re
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from oj.decode_bytes import detect_encoding
+from oj.lex import lex_stream
+from oj.tokens import TokenStream, TokenType
+
+_OPENERS = (TokenType.OPEN_BRACE.value, TokenType.OPEN_BRACKET.value)
+_CLOSERS = (TokenType.CLOSE_BRACE.value, TokenType.CLOSE_BRACKET.value)
+_COMMA = TokenType.COMMA.value
+_STRING = TokenType.STRING.value
+_NUMBER = TokenType.NUMBER.value
+_ESCAPE_RE = re.compile(r"\\.", re.DOTALL)
+
+
+class DecodeStats:
+    """Statistics about the documents decoded with it.
+
+    Times are in seconds. String and number sizes are in characters of the source
+    (bytes, for ASCII), including the quotes around strings. A container's size is its
+    number of elements or members.
+    """
+
+    def __init__(self, exporter: Optional[Callable[["DecodeStats"], None]] = None):
+        self.exporter = exporter
+        self.reset()
+
+    def reset(self) -> None:
+        self.documents = 0
+        self.input_size = 0
+        self.decode_seconds = 0.0
+        self.lex_seconds = 0.0
+        self.token_counts: Counter = Counter()
+        self.max_depth = 0
+        self.strings = 0
+        self.string_size = 0
+        self.escapes = 0
+        self.numbers = 0
+        self.number_size = 0
+        self.objects = 0
+        self.arrays = 0
+        self.max_container_size = 0
+        self.total_container_size = 0
+
+    def record(self, json_string: Any, decode: Callable[[Any], Any]) -> Any:
+        """Decodes `json_string` with `decode`, recording statistics about it."""
+        start = time.perf_counter()
+        value = decode(json_string)
+        self.decode_seconds += time.perf_counter() - start
+
+        if not isinstance(json_string, str):
+            json_string = str(json_string, detect_encoding(json_string))
+        start = time.perf_counter()
+        stream = lex_stream(json_string)
+        self.lex_seconds += time.perf_counter() - start
+
+        self.documents += 1
+        self.input_size += len(json_string)
+        self._record_tokens(stream)
+        return value
+
+    def _record_tokens(self, stream: TokenStream) -> None:
+        types, starts, ends = stream.types, stream.starts, stream.ends
+        find_escapes = _ESCAPE_RE.findall
+        source = stream.source
+        type_counts = Counter(types)
+        for type_value, count in type_counts.items():
+            self.token_counts[TokenType(type_value)] += count
+        self.strings += type_counts[_STRING]
+        self.numbers += type_counts[_NUMBER]
+        self.objects += type_counts[TokenType.OPEN_BRACE.value]
+        self.arrays += type_counts[TokenType.OPEN_BRACKET.value]
+
+        # The sizes of the containers that are still open, innermost last, counted as
+        # the commas in them plus one, unless they're empty.
+        sizes: List[int] = []
+        max_depth = self.max_depth
+        max_container_size = self.max_container_size
+        previous_type = None
+        for index, type_value in enumerate(types):
+            if type_value in _OPENERS:
+                sizes.append(0)
+                if len(sizes) > max_depth:
+                    max_depth = len(sizes)
+            elif type_value in _CLOSERS:
+                size = sizes.pop()
+                if previous_type not in _OPENERS:
+                    size += 1
+                self.total_container_size += size
+                if size > max_container_size:
+                    max_container_size = size
+            elif type_value == _COMMA:
+                sizes[-1] += 1
+            elif type_value == _STRING:
+                self.string_size += ends[index] - starts[index]
+                self.escapes += len(find_escapes(source, starts[index], ends[index]))
+            elif type_value == _NUMBER:
+                self.number_size += ends[index] - starts[index]
+            previous_type = type_value
+        self.max_depth = max_depth
+        self.max_container_size = max_container_size
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the statistics as a flat dict, with token counts by type name."""
+        stats = {
+            name: value
+            for name, value in vars(self).items()
+            if name not in ("exporter", "token_counts")
+        }
+        for token_type in TokenType:
+            stats[f"tokens_{token_type.name.lower()}"] = self.token_counts[token_type]
+        return stats
+
+    def export(self) -> None:
+        """Passes the statistics to the exporter, if there is one."""
+        if self.exporter is not None:
+            self.exporter(self)
+
+    def __enter__(self) -> "DecodeStats":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.export()
@@ -0,0 +1,174 @@
+"""A vectorized index of the structure of a JSON document.
+
+`build_index` finds every bracket, brace, comma and colon outside of a string in one
+pass of NumPy array operations, in the style of simdjson's first stage: quotes are
+located in bulk, quotes escaped by an odd run of backslashes are discarded, and a
+structural character is inside a string exactly when an odd number of the remaining
+quotes come before it. Nesting depths and matching pairs of brackets are then computed
+from those positions, again without a per-character Python loop.
+
+With the index, the span of any container, and the commas and colons directly inside
+it, can be found without looking at the characters in between. That's what
+`oj.decode.skip_value` and the proxies of `oj.lazy` use it for.
+
+NumPy is optional: without it `build_index` returns None, and callers fall back to
+scanning the characters themselves.
+"""
+
+from typing import Any, Optional, Tuple
+
+from oj.exceptions import JSONDecodeError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+_OPEN_BRACKET = ord("[")
+_CLOSE_BRACKET = ord("]")
+_OPEN_BRACE = ord("{")
+_CLOSE_BRACE = ord("}")
+_COMMA = ord(",")
+_COLON = ord(":")
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+_STRUCTURAL_CHARS = [
+    _OPEN_BRACKET,
+    _CLOSE_BRACKET,
+    _OPEN_BRACE,
+    _CLOSE_BRACE,
+    _COMMA,
+    _COLON,
+]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class StructuralIndex:
+    """The offsets of the structural characters in a document, with their nesting.
+
+    `positions` holds the (sorted) offset of each structural character outside of a
+    string, and `chars`, `depths` and `matches` hold, for the character at the same
+    position in `positions`: the character's code point; how many containers enclose
+    it (not counting a bracket's own container); and for brackets, the position in
+    `positions` of the matching bracket (-1 for commas and colons).
+    """
+
+    def __init__(self, positions: Any, chars: Any, depths: Any, matches: Any):
+        self.positions = positions
+        self.chars = chars
+        self.depths = depths
+        self.matches = matches
+
+    def close_of(self, open_index: int) -> int:
+        """Returns the offset of the bracket matching the one at `open_index`."""
+        position = self._position_of(open_index)
+        return int(self.positions[self.matches[position]])
+
+    def separators_of(self, open_index: int) -> Tuple[Any, Any, int]:
+        """Finds the commas and colons directly inside the container at `open_index`.
+
+        Returns their offsets, their code points, and the offset of the container's
+        close bracket.
+        """
+        position = self._position_of(open_index)
+        close_position = int(self.matches[position])
+        inner = slice(position + 1, close_position)
+        chars = self.chars[inner]
+        is_separator = (self.depths[inner] == self.depths[position] + 1) & (
+            (chars == _COMMA) | (chars == _COLON)
+        )
+        return (
+            self.positions[inner][is_separator],
+            chars[is_separator],
+            int(self.positions[close_position]),
+        )
+
+    def _position_of(self, open_index: int) -> int:
+        position = int(np.searchsorted(self.positions, open_index))
+        if (
+            position == len(self.positions)
+            or self.positions[position] != open_index
+            or self.matches[position] < 0
+        ):
+            raise ValueError(f"no bracket at index {open_index} in structural index")
+        return position
+
+
+def build_index(json_string: str) -> Optional[StructuralIndex]:
+    """Builds the structural index of `json_string`, or None if NumPy is unavailable.
+
+    Raises JSONDecodeError if the brackets in the document don't match up.
+    """
+    if np is None:
+        return None
+
+    if json_string.isascii():
+        codes = np.frombuffer(json_string.encode("ascii"), dtype=np.uint8)
+    else:
+        # UTF-32 keeps one array element per character, so offsets into the array are
+        # offsets into the string. Lone surrogates, which JSON strings may contain,
+        # are passed through as the code points they are.
+        utf32 = json_string.encode("utf-32-le", "surrogatepass")
+        codes = np.frombuffer(utf32, dtype=np.uint32)
+
+    quotes = _unescaped_quotes(codes)
+    candidates = np.flatnonzero(np.isin(codes, _STRUCTURAL_CHARS))
+    # A character is inside a string iff an odd number of quotes come before it.
+    outside_strings = np.searchsorted(quotes, candidates) % 2 == 0
+    positions = candidates[outside_strings]
+    chars = codes[positions].astype(np.uint32)
+
+    is_open = (chars == _OPEN_BRACKET) | (chars == _OPEN_BRACE)
+    is_close = (chars == _CLOSE_BRACKET) | (chars == _CLOSE_BRACE)
+    change = is_open.astype(np.int64) - is_close.astype(np.int64)
+    depth_after = np.cumsum(change)
+    # Every structural character's depth is the number of containers enclosing it,
+    # which for a bracket is the depth outside of its own container.
+    depths = np.where(is_close, depth_after, depth_after - change)
+    if len(positions) and (depth_after[-1] != 0 or depth_after.min() < 0):
+        raise JSONDecodeError("unbalanced brackets")
+
+    # At each depth, brackets alternate open, close, open, close..., so sorting the
+    # brackets by depth (keeping them in document order within a depth) puts each
+    # open bracket immediately before its match.
+    brackets = np.flatnonzero(is_open | is_close)
+    brackets = brackets[np.argsort(depths[brackets], kind="stable")]
+    opens = brackets[0::2]
+    closes = brackets[1::2]
+    if not (is_open[opens].all() and is_close[closes].all()):
+        raise JSONDecodeError("unbalanced brackets")
+    # Open and close differ by 2 for both [] and {}.
+    if (chars[closes] - chars[opens] != 2).any():
+        raise JSONDecodeError("mismatched brackets")
+    matches = np.full(len(positions), -1, dtype=np.int64)
+    matches[opens] = closes
+    matches[closes] = opens
+    return StructuralIndex(positions, chars, depths, matches)
+
+
+def _unescaped_quotes(codes: Any) -> Any:
+    """Returns the offsets of the quotes that aren't escaped by a backslash."""
+    quotes = np.flatnonzero(codes == _QUOTE)
+    backslashes = np.flatnonzero(codes == _BACKSLASH)
+    if not len(backslashes) or not len(quotes):
+        return quotes
+
+    # For each backslash, the offset of the first backslash in its run of consecutive
+    # backslashes.
+    starts_run = np.empty(len(backslashes), dtype=bool)
+    starts_run[0] = True
+    starts_run[1:] = backslashes[1:] != backslashes[:-1] + 1
+    run_starts = backslashes[
+        np.maximum.accumulate(np.where(starts_run, np.arange(len(backslashes)), 0))
+    ]
+
+    # A quote is escaped if it directly follows an odd-length run of backslashes.
+    preceding = np.minimum(
+        np.searchsorted(backslashes, quotes - 1), len(backslashes) - 1
+    )
+    follows_backslash = backslashes[preceding] == quotes - 1
+    run_lengths = np.where(follows_backslash, quotes - run_starts[preceding], 0)
+    return quotes[run_lengths % 2 == 0]
@@ -1,5 +1,7 @@
+from array import array
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Sequence, Union, overload
 
 
 class TokenType(Enum):
@@ -22,3 +24,55 @@ class Token:
     token_type: TokenType
     lexeme: str
     index: int
+
+
+# Token types indexed by their enum value, for converting back from the compact
+# representation stored in a TokenStream.
+_TOKEN_TYPES_BY_VALUE = {token_type.value: token_type for token_type in TokenType}
+
+
+class TokenStream(Sequence[Token]):
+    """A compact sequence of the tokens lexed from `source`.
+
+    Rather than a Token object per token, the stream stores each token's type, start
+    offset and end offset in typed arrays. Tokens (and their lexemes) are only
+    materialized from `source` when the stream is indexed, so the stream can be passed
+    anywhere a list of tokens is expected, e.g. to `oj.parse.parse`.
+    """
+
+    __slots__ = ("source", "types", "starts", "ends")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array("B")
+        # 4-byte offsets cover any source shorter than 4 GiB.
+        offset_typecode = "I" if len(source) < 2 ** 32 else "q"
+        self.starts = array(offset_typecode)
+        self.ends = array(offset_typecode)
+
+    def append(self, token_type: TokenType, start_index: int, end_index: int) -> None:
+        self.types.append(token_type.value)
+        self.starts.append(start_index)
+        self.ends.append(end_index)
+
+    def token_type(self, index: int) -> TokenType:
+        return _TOKEN_TYPES_BY_VALUE[self.types[index]]
+
+    def lexeme(self, index: int) -> str:
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @overload
+    def __getitem__(self, index: int) -> Token:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Token]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Token, Sequence[Token]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Token(self.token_type(index), self.lexeme(index), self.starts[index])
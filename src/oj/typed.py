@@ -0,0 +1,243 @@
+"""Decoding straight into typed objects.
+
+`decode_into` decodes a document according to a target type, e.g. a dataclass or
+`List[MyRecord]`, building each object from the key/value pairs as they're decoded
+rather than by converting a dict afterwards. Keys that don't name a field of the class
+being built are skipped over without being decoded, matching up only quotes and
+brackets, so their values aren't fully validated: as with `oj.loads_lazy`, a document
+with an error only in the value of an unknown key decodes without complaint.
+
+Supported targets are:
+  - dataclasses, built by calling the class with the fields found as keyword arguments,
+    so defaults and `__post_init__` apply as usual;
+  - other classes with `__slots__`, built without calling `__init__` by setting each
+    slot that has a key in the object (slots without one are left unset);
+  - `List[T]` and `Dict[str, T]` of supported targets, and `Optional[T]`.
+
+Anything else, including the field types of classes without annotations, is decoded
+as by `oj.loads`, without checking it against the annotation.
+"""
+
+import dataclasses
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
+
+from oj.decode import Decoder, skip_value
+from oj.exceptions import JSONDecodeError
+
+# How many target types a TypedDecoder keeps decode functions for before discarding
+# the least recently built, so that decoding into classes created on the fly doesn't
+# hold on to every one of them.
+MAX_DECODE_FUNCS = 256
+
+# Decodes the value starting at the given index, returning it and the index just past
+# its end.
+DecodeFunc = Callable[[str, int], Tuple[Any, int]]
+
+
+def decode_into(
+    json_string: str, target: Any, decoder: Optional[Decoder] = None
+) -> Any:
+    """Decodes `json_string` into an instance of `target`."""
+    return TypedDecoder(decoder).decode(json_string, target)
+
+
+class TypedDecoder:
+    """Decodes JSON strings into instances of target types.
+
+    How to decode each target type is worked out once per TypedDecoder, the first time
+    it's needed, and kept for up to `MAX_DECODE_FUNCS` target types. Scalars, and values without a supported target type, are decoded by
+    `decoder`, which defaults to a plain `Decoder`.
+    """
+
+    def __init__(self, decoder: Optional[Decoder] = None):
+        self.decoder = Decoder() if decoder is None else decoder
+        self._decode_funcs: Dict[Any, DecodeFunc] = {}
+
+    def decode(self, json_string: str, target: Any) -> Any:
+        skip_whitespace = self.decoder._skip_whitespace
+        index = skip_whitespace(json_string, 0)
+        value, index = self.decode_func(target)(json_string, index)
+        index = skip_whitespace(json_string, index)
+        if index != len(json_string):
+            raise JSONDecodeError("more than one value at top level of json")
+        return value
+
+    def decode_func(self, target: Any) -> DecodeFunc:
+        """Returns the function that decodes values into `target`."""
+        decode_funcs = self._decode_funcs
+        decode_func = decode_funcs.get(target)
+        if decode_func is None:
+            decode_func = self._build_decode_func(target)
+            if len(decode_funcs) >= MAX_DECODE_FUNCS:
+                # Decode functions look up those of their parts' types each time
+                # they're called, so any of them can be discarded and built again.
+                try:
+                    decode_funcs.pop(next(iter(decode_funcs), None), None)
+                except RuntimeError:
+                    # Changed size in another thread while the oldest was found.
+                    pass
+            decode_funcs[target] = decode_func
+        return decode_func
+
+    def _build_decode_func(self, target: Any) -> DecodeFunc:
+        origin = getattr(target, "__origin__", None)
+        args = getattr(target, "__args__", ())
+        if origin is list and args:
+            return self._list_decode_func(target, args[0])
+        elif origin is dict and args:
+            return self._dict_decode_func(target, args[1])
+        elif origin is not None and type(None) in args and len(args) == 2:
+            (value_type,) = [arg for arg in args if arg is not type(None)]
+            return self._optional_decode_func(value_type)
+        elif isinstance(target, type) and (
+            dataclasses.is_dataclass(target) or _slots_of(target)
+        ):
+            return self._object_decode_func(target)
+        return self.decoder.decode_value
+
+    def _list_decode_func(self, target: Any, item_type: Any) -> DecodeFunc:
+        skip_whitespace = self.decoder._skip_whitespace
+
+        def decode_list(json_string: str, index: int) -> Tuple[Any, int]:
+            _expect(json_string, index, "[", target)
+            decode_item = self.decode_func(item_type)
+            items: List[Any] = []
+            index = skip_whitespace(json_string, index + 1)
+            if json_string[index : index + 1] == "]":
+                return items, index + 1
+            while True:
+                item, index = decode_item(json_string, index)
+                items.append(item)
+                index = skip_whitespace(json_string, index)
+                char = json_string[index : index + 1]
+                if char == ",":
+                    index = skip_whitespace(json_string, index + 1)
+                elif char == "]":
+                    return items, index + 1
+                else:
+                    raise JSONDecodeError(
+                        f"expecting comma or close bracket in list at index {index}"
+                    )
+
+        return decode_list
+
+    def _dict_decode_func(self, target: Any, value_type: Any) -> DecodeFunc:
+        def decode_dict(json_string: str, index: int) -> Tuple[Any, int]:
+            _expect(json_string, index, "{", target)
+            decode_item = self.decode_func(value_type)
+            result: Dict[str, Any] = {}
+
+            def decode_member(key: str, index: int) -> int:
+                result[key], index = decode_item(json_string, index)
+                return index
+
+            return result, self._decode_members(json_string, index, decode_member)
+
+        return decode_dict
+
+    def _optional_decode_func(self, value_type: Any) -> DecodeFunc:
+        def decode_optional(json_string: str, index: int) -> Tuple[Any, int]:
+            if json_string.startswith("null", index):
+                return None, index + 4
+            return self.decode_func(value_type)(json_string, index)
+
+        return decode_optional
+
+    def _object_decode_func(self, cls: type) -> DecodeFunc:
+        is_dataclass = dataclasses.is_dataclass(cls)
+        if is_dataclass:
+            names = [field.name for field in dataclasses.fields(cls) if field.init]
+        else:
+            names = _slots_of(cls)
+        # The fields' decode functions are looked up when the first object is decoded,
+        # so that classes can refer to themselves, e.g. in a `children` field.
+        field_funcs: Dict[str, DecodeFunc] = {}
+
+        def decode_object(json_string: str, index: int) -> Tuple[Any, int]:
+            _expect(json_string, index, "{", cls)
+            if len(field_funcs) < len(names):
+                hints = get_type_hints(cls)
+                for name in names:
+                    field_funcs[name] = self.decode_func(hints.get(name, Any))
+
+            start_index = index
+            if is_dataclass:
+                kwargs: Dict[str, Any] = {}
+
+                def decode_member(key: str, index: int) -> int:
+                    decode_field = field_funcs.get(key)
+                    if decode_field is None:
+                        return skip_value(json_string, index)
+                    kwargs[key], index = decode_field(json_string, index)
+                    return index
+
+                index = self._decode_members(json_string, index, decode_member)
+                try:
+                    return cls(**kwargs), index
+                except TypeError as exc:
+                    raise JSONDecodeError(
+                        f"can't build {cls.__name__} from object at index "
+                        f"{start_index}: {exc}"
+                    ) from exc
+
+            obj = cls.__new__(cls)  # type: ignore
+
+            def set_member(key: str, index: int) -> int:
+                decode_field = field_funcs.get(key)
+                if decode_field is None:
+                    return skip_value(json_string, index)
+                value, index = decode_field(json_string, index)
+                setattr(obj, key, value)
+                return index
+
+            return obj, self._decode_members(json_string, index, set_member)
+
+        return decode_object
+
+    def _decode_members(
+        self, json_string: str, index: int, decode_member: Callable[[str, int], int]
+    ) -> int:
+        """Walks the members of the object whose open brace is at `index`.
+
+        `decode_member` is called with each key and the index of its value, and must
+        decode or skip the value and return the index just past it. Returns the index
+        just past the object's close brace.
+        """
+        decoder = self.decoder
+        skip_whitespace = decoder._skip_whitespace
+        index = skip_whitespace(json_string, index + 1)
+        if json_string[index : index + 1] == "}":
+            return index + 1
+        while True:
+            key, index = decoder.decode_key(json_string, index)
+            index = skip_whitespace(json_string, decode_member(key, index))
+            char = json_string[index : index + 1]
+            if char == ",":
+                index = skip_whitespace(json_string, index + 1)
+            elif char == "}":
+                return index + 1
+            else:
+                raise JSONDecodeError(f"expected comma or close brace at index {index}")
+
+
+def _expect(json_string: str, index: int, char: str, target: Any) -> None:
+    if json_string[index : index + 1] != char:
+        kind = "list" if char == "[" else "object"
+        raise JSONDecodeError(
+            f"expected {kind} for {_type_name(target)} at index {index}"
+        )
+
+
+def _type_name(target: Any) -> str:
+    return getattr(target, "__name__", None) or repr(target)
+
+
+def _slots_of(cls: type) -> List[str]:
+    """Returns the names of the slots declared by `cls` and its bases."""
+    names: List[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(slot for slot in slots if slot not in ("__dict__", "__weakref__"))
+    return names
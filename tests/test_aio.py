@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+
+VALUE = {
+    "records": [{"id": i, "name": f"näme {i}", "score": i / 3} for i in range(500)]
+}
+
+
+def stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 65536])
+def test_load_async(read_size):
+    async def load():
+        json_bytes = json.dumps(VALUE, ensure_ascii=False).encode()
+        return await oj.load_async(stream_reader(json_bytes), read_size=read_size)
+
+    assert asyncio.run(load()) == VALUE
+
+
+def test_load_async_bom():
+    async def load():
+        return await oj.load_async(stream_reader('{"ü": []}'.encode("utf-8-sig")))
+
+    assert asyncio.run(load()) == {"ü": []}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"[1, 2", b"[1] [2]", b'["\xff"]', b"[1] x", b'{"a": 1'],
+)
+def test_load_async_invalid(data):
+    async def load():
+        return await oj.load_async(stream_reader(data), read_size=3)
+
+    with pytest.raises(JSONDecodeError):
+        asyncio.run(load())
+
+
+def test_load_async_max_depth():
+    async def load():
+        return await oj.load_async(stream_reader(b"[[[1]]]"), max_depth=2)
+
+    with pytest.raises(JSONDecodeError, match="maximum nesting depth"):
+        asyncio.run(load())
+
+
+@pytest.mark.parametrize("read_size", [1, 5, 65536])
+def test_iter_async(read_size):
+    data = b'{"a": 1}\n[2, 3]\n"four"\r\n5 6{}[]null\n\n  true'
+
+    async def collect():
+        reader = stream_reader(data)
+        return [value async for value in oj.iter_async(reader, read_size=read_size)]
+
+    assert asyncio.run(collect()) == [
+        {"a": 1},
+        [2, 3],
+        "four",
+        5,
+        6,
+        {},
+        [],
+        None,
+        True,
+    ]
+
+
+def test_iter_async_yields_values_as_they_arrive():
+    async def collect():
+        reader = asyncio.StreamReader()
+        values = oj.iter_async(reader)
+        reader.feed_data(b'{"a": 1}\n{"b"')
+        assert await values.__anext__() == {"a": 1}
+        reader.feed_data(b": 2}\n")
+        reader.feed_eof()
+        return [value async for value in values]
+
+    assert asyncio.run(collect()) == [{"b": 2}]
+
+
+def test_iter_async_unfinished_value():
+    async def collect():
+        reader = stream_reader(b"[1]\n[2")
+        return [value async for value in oj.iter_async(reader)]
+
+    with pytest.raises(JSONDecodeError):
+        asyncio.run(collect())
+
+
+def test_load_async_yields_to_event_loop():
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def load():
+        ticker = asyncio.ensure_future(tick())
+        json_bytes = json.dumps(VALUE).encode()
+        value = await oj.load_async(stream_reader(json_bytes), read_size=1024)
+        ticker.cancel()
+        return value
+
+    assert asyncio.run(load()) == VALUE
+    # The other task ran between (almost) every chunk.
+    assert len(ticks) >= len(json.dumps(VALUE)) // 1024 - 1
@@ -0,0 +1,137 @@
+import threading
+from decimal import Decimal
+
+import pytest
+
+import oj
+from oj.cache import CachedDecoder, CacheInfo
+from oj.exceptions import JSONDecodeError
+
+
+def test_cached_decoder_hits_and_misses():
+    decoder = CachedDecoder()
+    json_string = '{"flags": {"a": true, "b": [1, 2.5, null]}}'
+    assert decoder.decode(json_string) == oj.loads(json_string)
+    assert decoder.decode(json_string) == oj.loads(json_string)
+    # Bytes are keyed separately from the equivalent str.
+    assert decoder.decode(json_string.encode()) == oj.loads(json_string)
+    assert decoder.decode(json_string.encode()) == oj.loads(json_string)
+    assert decoder.cache_info() == CacheInfo(
+        hits=2, misses=2, evictions=0, size=2, bytes=2 * len(json_string)
+    )
+
+
+def test_cached_decoder_returns_copies():
+    decoder = CachedDecoder()
+    first = decoder.decode('{"a": [1, {"b": 2}]}')
+    first["a"][1]["b"] = 3
+    first["c"] = 4
+    assert decoder.decode('{"a": [1, {"b": 2}]}') == {"a": [1, {"b": 2}]}
+
+
+def test_cached_decoder_frozen():
+    decoder = CachedDecoder(frozen=True)
+    first = decoder.decode('{"a": [1, {"b": 2}]}')
+    assert first == {"a": (1, {"b": 2})}
+    with pytest.raises(TypeError):
+        first["a"] = 1  # type: ignore
+    with pytest.raises(TypeError):
+        first["a"][1]["b"] = 3  # type: ignore
+    assert decoder.decode('{"a": [1, {"b": 2}]}') is first
+
+
+def test_cached_decoder_evicts_least_recently_used():
+    decoder = CachedDecoder(maxsize=2)
+    decoder.decode("1")
+    decoder.decode("2")
+    decoder.decode("1")
+    decoder.decode("3")
+    assert decoder.cache_info().evictions == 1
+    # "2" was evicted, as "1" was used more recently.
+    decoder.decode("1")
+    decoder.decode("2")
+    assert decoder.cache_info() == CacheInfo(
+        hits=2, misses=4, evictions=2, size=2, bytes=2
+    )
+
+
+def test_cached_decoder_max_bytes():
+    decoder = CachedDecoder(maxsize=None, max_bytes=10)
+    decoder.decode("[1, 2]")
+    decoder.decode("[3, 4]")
+    info = decoder.cache_info()
+    assert (info.size, info.bytes, info.evictions) == (1, 6, 1)
+    # Too big to cache at all.
+    assert decoder.decode("[1, 2, 3, 4]") == [1, 2, 3, 4]
+    assert decoder.cache_info().size == 1
+    decoder.clear()
+    assert decoder.cache_info() == CacheInfo(0, 0, 0, 0, 0)
+
+
+def test_cached_decoder_options():
+    decoder = CachedDecoder(parse_float=Decimal, object_pairs_hook=list)
+    for _ in range(2):
+        assert decoder.decode('{"price": 0.10}') == [("price", Decimal("0.10"))]
+    array_decoder = CachedDecoder(numeric_arrays="array")
+    assert array_decoder.decode("[1, 2]") is not array_decoder.decode("[1, 2]")
+    assert array_decoder.decode("[1, 2]").typecode == "q"
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"frozen": True}, {"parse_float": Decimal, "object_hook": dict}]
+)
+def test_cached_decoder_deep_nesting(options):
+    depth = 10000
+    decoder = CachedDecoder(**options)
+    json_string = '{"a": [' * depth + "1.5" + "]}" * depth
+    for _ in range(2):
+        value = decoder.decode(json_string)
+        for _ in range(depth):
+            value = value["a"]
+            assert len(value) == 1
+            value = value[0]
+        assert value == 1.5
+    assert decoder.cache_info().hits == 1
+
+
+def test_cached_decoder_invalid_json():
+    decoder = CachedDecoder()
+    for _ in range(2):
+        with pytest.raises(JSONDecodeError):
+            decoder.decode("[1,")
+    assert decoder.cache_info().size == 0
+
+
+def test_cached_decoder_keys_by_input_type():
+    decoder = CachedDecoder()
+    json_string = "\ufeff[1, 2]"
+    assert decoder.decode(json_string.encode()) == [1, 2]
+    # A str mustn't start with a BOM, even if the same bytes decoded fine.
+    with pytest.raises(JSONDecodeError):
+        decoder.decode(json_string)
+    assert decoder.decode("[1, 2]") == decoder.decode(b"[1, 2]") == [1, 2]
+    assert decoder.cache_info().size == 3
+
+
+def test_cached_decoder_threads():
+    decoder = CachedDecoder(maxsize=5)
+    documents = [f'{{"id": {i}, "items": [{i}, "{i}"]}}' for i in range(10)]
+    errors = []
+
+    def decode_all():
+        try:
+            for _ in range(50):
+                for i, document in enumerate(documents):
+                    assert decoder.decode(document) == {"id": i, "items": [i, str(i)]}
+        except AssertionError as exc:  # pragma: no cover
+            errors.append(exc)
+
+    threads = [threading.Thread(target=decode_all) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    info = decoder.cache_info()
+    assert info.hits + info.misses == 4 * 50 * 10
+    assert info.size == 5
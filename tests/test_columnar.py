@@ -0,0 +1,92 @@
+import math
+from array import array
+
+import pytest
+
+import oj
+from oj.columnar import ColumnBuilder
+from oj.exceptions import JSONDecodeError
+
+RECORDS = """
+[
+    {"id": 1, "price": 2.5, "name": "apple", "ok": true, "tags": ["a"]},
+    {"id": 2, "price": 3, "name": "pear", "ok": false, "tags": []},
+    {"id": 3, "price": 1.25, "name": "apple", "ok": true, "tags": null}
+]
+"""
+
+
+def test_loads_columnar():
+    columns = oj.loads_columnar(RECORDS)
+    assert list(columns) == ["id", "price", "name", "ok", "tags"]
+    assert columns["id"] == array("q", [1, 2, 3])
+    assert columns["price"] == array("d", [2.5, 3.0, 1.25])
+    assert columns["name"] == ["apple", "pear", "apple"]
+    assert columns["name"][0] is columns["name"][2]
+    assert columns["ok"] == array("b", [1, 0, 1])
+    assert columns["tags"] == [["a"], [], None]
+
+
+def test_loads_columnar_numpy():
+    np = pytest.importorskip("numpy")
+    columns = oj.loads_columnar(RECORDS, use_numpy=True)
+    assert columns["id"].dtype == np.int64
+    assert columns["id"].tolist() == [1, 2, 3]
+    assert columns["price"].dtype == np.float64
+    assert columns["ok"].dtype == np.bool_
+    assert columns["ok"].tolist() == [True, False, True]
+    assert columns["name"] == ["apple", "pear", "apple"]
+
+
+def test_missing_values():
+    columns = oj.loads_columnar(
+        '[{"a": 1, "b": true}, {"c": "x"}, {"a": 2, "c": null, "d": 1.5}]'
+    )
+    assert columns["a"].typecode == "d"
+    assert columns["a"][0] == 1 and math.isnan(columns["a"][1]) and columns["a"][2] == 2
+    assert columns["b"] == [True, None, None]
+    assert columns["c"] == [None, "x", None]
+    assert columns["d"].typecode == "d"
+    assert math.isnan(columns["d"][0]) and math.isnan(columns["d"][1])
+    assert columns["d"][2] == 1.5
+
+
+@pytest.mark.parametrize(
+    "values,expected",
+    [
+        ("1, 2", array("q", [1, 2])),
+        ("1, 2.5", array("d", [1, 2.5])),
+        ("1.5, 2", array("d", [1.5, 2])),
+        ("1, true", [1, True]),
+        ("true, 1", [True, 1]),
+        ('1, "x"', [1, "x"]),
+        ('"x", 1.5', ["x", 1.5]),
+        ("1, 100000000000000000000", [1, 100000000000000000000]),
+        ("null, null", [None, None]),
+        ("null, {}", [None, {}]),
+    ],
+)
+def test_promotion(values, expected):
+    json_string = "[" + ", ".join(f'{{"a": {v}}}' for v in values.split(", ")) + "]"
+    column = oj.loads_columnar(json_string)["a"]
+    assert column == expected
+    assert type(column) is type(expected)
+
+
+def test_empty_list():
+    assert oj.loads_columnar(" [ ] ") == {}
+
+
+@pytest.mark.parametrize(
+    "json_string", ["{}", "[1]", '[{"a": 1} {"a": 2}]', '[{"a": 1}] []', "[{]"]
+)
+def test_invalid(json_string):
+    with pytest.raises(JSONDecodeError):
+        oj.loads_columnar(json_string)
+
+
+def test_column_builder():
+    builder = ColumnBuilder()
+    for record in oj.iter_lines(iter(['{"a": 1}\n', '{"a": 2, "b": "x"}\n'])):
+        builder.add_row(record)
+    assert builder.columns() == {"a": array("q", [1, 2]), "b": [None, "x"]}
@@ -0,0 +1,209 @@
+import json
+import math
+import sys
+import threading
+from array import array
+from decimal import Decimal
+
+import pytest
+
+from oj.decode import Decoder, decode
+from oj.decode_bytes import BytesDecoder
+from oj.exceptions import JSONDecodeError
+from oj.lex import lex, lex_stream
+from oj.parse import parse
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "null",
+        " true ",
+        "false",
+        "0",
+        "-12.5e3",
+        '"string with a \\\\ and \\" and \\u00ff"',
+        "[]",
+        "[true, [1, 2], {}]",
+        '{"key1": 1, "key2": {"nested": [null, "val"]}}',
+        "\n\t[ 1 , 2 ]\r\n",
+    ],
+)
+def test_decode_matches_lex_and_parse(raw):
+    assert decode(raw) == parse(lex(raw))
+    assert parse(lex_stream(raw)) == parse(lex(raw))
+
+
+@pytest.mark.parametrize(
+    "raw,expected", [("Infinity", math.inf), ("-Infinity", -math.inf)]
+)
+def test_decode_infinity(raw, expected):
+    assert decode(raw) == expected
+
+
+def test_decode_nan():
+    assert math.isnan(decode("NaN"))
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "",
+        "   ",
+        "nul",
+        "1 2",
+        "01",
+        "1.",
+        "-",
+        "[1,]",
+        "[1 2]",
+        "[",
+        '{"key" 1}',
+        '{"key": 1,}',
+        "{1: 2}",
+        '"unterminated',
+        '"bad \\x escape"',
+        "truefalse",
+    ],
+)
+def test_decode_rejects_invalid_json(raw):
+    with pytest.raises(JSONDecodeError):
+        decode(raw)
+
+
+def test_decode_deep_nesting():
+    depth = 100_000
+    value = Decoder().decode("[" * depth + "]" * depth)
+    for _ in range(depth - 1):
+        (value,) = value
+    assert value == []
+
+
+def test_decode_deep_object_nesting():
+    depth = 100_000
+    value = Decoder().decode('{"a": ' * depth + "null" + "}" * depth)
+    for _ in range(depth):
+        value = value["a"]
+    assert value is None
+
+
+@pytest.mark.parametrize("raw", ["[[1]]", "[[]]", '{"a": {}}', '[{"a": 1}]'])
+def test_decode_max_depth(raw):
+    assert Decoder(max_depth=2).decode(raw) == decode(raw)
+    with pytest.raises(JSONDecodeError):
+        Decoder(max_depth=1).decode(raw)
+
+
+def test_keys_are_memoized():
+    records = decode('[{"key": 1, "k\\u0065y": 2}, {"key": 3, "k\\u0065y": 4}]')
+    assert records == [{"key": 2}, {"key": 4}]
+    records = decode('[{"a key": 1}, {"a key": 2}]')
+    assert list(records[0])[0] is list(records[1])[0]
+
+
+def test_memo_is_bounded():
+    decoder = Decoder(memo_size=2)
+    assert decoder.decode('{"a": 1, "b": 2, "c": 3, "a": 4}') == {
+        "a": 4,
+        "b": 2,
+        "c": 3,
+    }
+    assert len(decoder._memo) == 2
+    assert list(decoder._memo) == ['"c"', '"a"']
+
+
+def test_memo_shared_between_threads():
+    decoder = Decoder(memo_size=8)
+    documents = [json.dumps({f"key {i}-{j}": j for j in range(20)}) for i in range(10)]
+    errors = []
+
+    def decode_all():
+        try:
+            for _ in range(20):
+                for document in documents:
+                    assert decoder.decode(document) == json.loads(document)
+        except Exception as exc:  # pragma: no cover
+            errors.append(exc)
+
+    switch_interval = sys.getswitchinterval()
+    # Switch threads as often as possible, to interleave evictions.
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=decode_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert not errors
+
+
+def test_memo_disabled():
+    decoder = Decoder(memo_size=0)
+    assert decoder.decode('[{"a": 1}, {"a": 2}]') == [{"a": 1}, {"a": 2}]
+    assert not decoder._memo
+
+
+def test_memoize_values():
+    long_value = "x" * 100
+    json_string = '[["%s", "short"], ["%s", "short"]]' % (long_value, long_value)
+    values = Decoder(memoize_values=True).decode(json_string)
+    assert values[0][1] is values[1][1]
+    assert values[0][0] == values[1][0] == long_value
+    assert values[0][0] is not values[1][0]
+
+
+def test_number_hooks():
+    json_string = '[1, -2.5, 3e2, NaN, -Infinity, {"a": 0.1}]'
+    decoder = Decoder(
+        parse_int=lambda literal: ("int", literal),
+        parse_float=Decimal,
+        parse_constant=lambda literal: ("constant", literal),
+    )
+    assert decoder.decode(json_string) == [
+        ("int", "1"),
+        Decimal("-2.5"),
+        Decimal("3e2"),
+        ("constant", "NaN"),
+        ("constant", "-Infinity"),
+        {"a": Decimal("0.1")},
+    ]
+
+
+def test_numbers_match_stdlib():
+    json_string = "[-2.5, 0.1, 1e400, -0, 12345678901234567890, 1.7976931348623157e308]"
+    assert decode(json_string) == json.loads(json_string)
+
+
+@pytest.mark.parametrize("decoder_class", [Decoder, BytesDecoder])
+def test_numeric_arrays(decoder_class):
+    json_string = (
+        '{"ints": [1, -2 ,3], "floats": [[0.5, -1e3], [2, 2.5E-1]], '
+        '"mixed": [1, "a", null], "empty": [], "big": [12345678901234567890]}'
+    )
+    if decoder_class is BytesDecoder:
+        json_string = json_string.encode()  # type: ignore
+    value = decoder_class(numeric_arrays="array").decode(json_string)
+    assert value["ints"] == array("q", [1, -2, 3])
+    assert value["ints"].typecode == "q"
+    assert value["floats"] == [array("d", [0.5, -1000.0]), array("d", [2.0, 0.25])]
+    assert value["mixed"] == [1, "a", None]
+    assert value["empty"] == []
+    assert value["big"] == [12345678901234567890]
+
+
+def test_numeric_arrays_numpy():
+    np = pytest.importorskip("numpy")
+    value = Decoder(numeric_arrays="numpy").decode("[[1, 2], [1.5, 3]]")
+    assert value[0].dtype == np.int64
+    assert value[1].dtype == np.float64
+    assert value[0].tolist() == [1, 2]
+    assert value[1].tolist() == [1.5, 3.0]
+
+
+def test_numeric_arrays_invalid_options():
+    with pytest.raises(ValueError, match="numeric_arrays must be one of"):
+        Decoder(numeric_arrays="list")
+    with pytest.raises(ValueError, match="parse_int or parse_float"):
+        Decoder(numeric_arrays="array", parse_float=Decimal)
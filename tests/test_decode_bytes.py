@@ -0,0 +1,110 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+import oj
+from oj.decode_bytes import BytesDecoder, detect_encoding
+from oj.exceptions import JSONDecodeError
+
+DOCUMENTS = [
+    "null",
+    "-Infinity",
+    "[NaN, Infinity, -1.5e3, 0, true, false]",
+    '"a string with an escaped \\" quote, a \\\\ backslash and a \\u00e9"',
+    '{"café": "naïve \U0001f600", "nested": [{"a": []}, {}]}',
+    ' \n {"key1": -1, "key2": {"nested": ["x", 0.5, {"deeper": []}]}} \t',
+]
+
+
+@pytest.mark.parametrize("json_string", DOCUMENTS)
+def test_bytes_decoder_matches_loads(json_string):
+    expected = oj.loads(json_string)
+    for json_bytes in json_string.encode(), bytearray(json_string.encode()):
+        # Compare reprs, as NaN != NaN.
+        assert repr(BytesDecoder().decode(json_bytes)) == repr(expected)
+
+
+@pytest.mark.parametrize(
+    "json_bytes",
+    [b"", b"[1, 2", b'{"a" 1}', b"[1] [2]", b'"unterminated', b"nul", b'"\xff"'],
+)
+def test_bytes_decoder_invalid_json(json_bytes):
+    with pytest.raises(JSONDecodeError):
+        BytesDecoder().decode(json_bytes)
+
+
+def test_bytes_decoder_max_depth():
+    assert BytesDecoder(max_depth=2).decode(b"[[1]]") == [[1]]
+    with pytest.raises(JSONDecodeError, match="maximum nesting depth"):
+        BytesDecoder(max_depth=2).decode(b"[[[1]]]")
+
+
+def test_load_path(tmp_path):
+    value = {"records": [{"id": i, "name": f"näme {i}"} for i in range(100)]}
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+    assert oj.load_path(path) == value
+    assert oj.load_path(str(path), max_depth=3) == value
+
+
+def test_load_path_empty_file(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    with pytest.raises(JSONDecodeError):
+        oj.load_path(path)
+
+
+@pytest.mark.parametrize(
+    "encoding",
+    ["utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "utf-32", "utf-32-le"],
+)
+@pytest.mark.parametrize("json_string", ['{"café": [1, "ü"]}', "7", "[]"])
+def test_loads_bytes_detects_encoding(encoding, json_string):
+    json_bytes = json_string.encode(encoding)
+    assert oj.loads(json_bytes) == json.loads(json_bytes)
+    assert oj.loads(bytearray(json_bytes)) == json.loads(json_bytes)
+    assert oj.loads(memoryview(json_bytes)) == json.loads(json_bytes)
+
+
+def test_detect_encoding_matches_stdlib():
+    for json_string in ["1", "12", '"x"', "[1, 2]", ""]:
+        for encoding in ["utf-8", "utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be"]:
+            json_bytes = json_string.encode(encoding)
+            assert detect_encoding(json_bytes) == json.detect_encoding(json_bytes)
+
+
+def test_loads_bytes_invalid_encoding():
+    with pytest.raises(JSONDecodeError):
+        oj.loads(b'["\xff"]')
+    with pytest.raises(JSONDecodeError):
+        oj.loads(b"\xff\xfe\x00\xd8")
+
+
+def test_load_path_with_bom(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes('{"ü": [1]}'.encode("utf-8-sig"))
+    assert oj.load_path(path) == {"ü": [1]}
+    path.write_bytes('{"ü": [1]}'.encode("utf-16"))
+    assert oj.load_path(path) == {"ü": [1]}
+
+
+def test_loads_bytes_number_hooks():
+    json_bytes = b'{"price": 0.10, "count": 3, "ratio": NaN}'
+    assert oj.loads(json_bytes, parse_float=Decimal, parse_constant=str) == {
+        "price": Decimal("0.10"),
+        "count": 3,
+        "ratio": "NaN",
+    }
+    assert oj.loads(json_bytes.decode(), parse_int=float)["count"] == 3.0
+
+
+@pytest.mark.parametrize(
+    "json_bytes",
+    [b'["\\x"]', b'[1, "\xff"]', b'{"a": "\\ud800\\u"}', b'"unterminated', b"[1, 2"],
+)
+def test_load_path_invalid_json(tmp_path, json_bytes):
+    path = tmp_path / "invalid.json"
+    path.write_bytes(json_bytes)
+    with pytest.raises(JSONDecodeError):
+        oj.load_path(path)
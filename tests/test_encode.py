@@ -0,0 +1,134 @@
+import io
+import json
+import math
+from collections import OrderedDict
+from enum import IntEnum
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+import oj
+from oj.encode import Encoder
+
+json_values = st.recursive(
+    st.none()
+    | st.booleans()
+    | st.floats(allow_nan=True, allow_infinity=True)
+    | st.integers()
+    | st.text(),
+    lambda children: (
+        st.lists(children) | st.dictionaries(st.text(), children) | st.tuples(children)
+    ),
+)
+
+OPTIONS = [
+    {},
+    {"sort_keys": True},
+    {"indent": 2},
+    {"indent": "\t", "sort_keys": True},
+    {"ensure_ascii": False},
+]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+@given(value=json_values)
+def test_dumps_matches_stdlib(options, value):
+    assert oj.dumps(value, **options) == json.dumps(value, **options)
+
+
+@given(value=json_values, chunk_size=st.integers(1, 50))
+def test_iterencode_chunks(value, chunk_size):
+    chunks = list(oj.iterencode(value, chunk_size=chunk_size))
+    assert "".join(chunks) == json.dumps(value)
+    assert all(len(chunk) >= chunk_size for chunk in chunks[:-1])
+
+
+@given(value=json_values)
+def test_dumps_round_trips(value):
+    # Compare reprs, as NaN != NaN and tuples become lists.
+    assert repr(oj.loads(oj.dumps(value))) == repr(json.loads(json.dumps(value)))
+
+
+def test_dump():
+    value = {"records": [{"id": i, "name": f"näme {i}"} for i in range(1000)]}
+    json_file = io.StringIO()
+    oj.dump(value, json_file, chunk_size=100)
+    assert json_file.getvalue() == json.dumps(value)
+
+
+def test_dumps_special_floats():
+    value = [math.nan, math.inf, -math.inf]
+    assert oj.dumps(value) == "[NaN, Infinity, -Infinity]"
+    assert oj.lex(oj.dumps(value))
+    with pytest.raises(ValueError, match="not JSON compliant"):
+        oj.dumps(value, allow_nan=False)
+
+
+def test_dumps_keys():
+    value = {1: "a", 2.5: "b", False: "c", None: "d"}
+    assert oj.dumps(value) == json.dumps(value)
+    with pytest.raises(TypeError, match="keys must be"):
+        oj.dumps({(1, 2): 3})
+
+
+def test_dumps_subclasses_and_default():
+    class Color(IntEnum):
+        RED = 1
+
+    value = OrderedDict([("color", Color.RED), ("set", {3})])
+    assert oj.dumps(value, default=sorted) == '{"color": 1, "set": [3]}'
+    with pytest.raises(TypeError, match="set is not JSON serializable"):
+        oj.dumps({1, 2})
+    with pytest.raises(TypeError, match="not JSON serializable"):
+        oj.dumps(object(), default=lambda value: value)
+
+
+def test_dumps_deep_nesting():
+    depth = 100000
+    value: list = []
+    for _ in range(depth):
+        value = [value]
+    assert oj.dumps(value) == "[" * depth + "[]" + "]" * depth
+
+
+def test_dumps_circular_reference():
+    value: list = [1]
+    value.append({"value": value})
+    with pytest.raises(ValueError, match="Circular reference"):
+        oj.dumps(value)
+    # Repeated, but not circular, references are fine.
+    shared = [1]
+    assert Encoder().encode([shared, shared]) == "[[1], [1]]"
+
+
+def test_dumps_circular_reference_in_subclasses():
+    class List(list):
+        pass
+
+    class Dict(dict):
+        pass
+
+    value = List()
+    value.append(value)
+    with pytest.raises(ValueError, match="Circular reference"):
+        oj.dumps(value)
+    mapping = Dict()
+    mapping["self"] = [mapping]
+    with pytest.raises(ValueError, match="Circular reference"):
+        oj.dumps(mapping)
+
+    class Node:
+        pass
+
+    node = Node()
+    with pytest.raises(ValueError, match="Circular reference"):
+        oj.dumps(node, default=lambda value: {"node": value})
+    assert oj.dumps([List([1]), Dict(a=List())]) == '[[1], {"a": []}]'
+
+
+def test_iterencode_chunks_count_keys():
+    value = {f"key {i}" * 10: i for i in range(100)}
+    chunks = list(oj.iterencode(value, chunk_size=200))
+    assert "".join(chunks) == json.dumps(value)
+    assert all(len(chunk) < 200 + 100 for chunk in chunks)
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+import oj
+from oj.events import EventParser
+from oj.exceptions import JSONDecodeError
+
+
+def test_iterparse_events():
+    json_file = io.StringIO('{"a": [1, {"b": null}], "c": "d", "e": [true, NaN]}')
+    assert list(oj.iterparse(json_file)) == [
+        ("", "start_map", None),
+        ("", "map_key", "a"),
+        ("a", "start_array", None),
+        ("a.item", "number", 1),
+        ("a.item", "start_map", None),
+        ("a.item", "map_key", "b"),
+        ("a.item.b", "null", None),
+        ("a.item", "end_map", None),
+        ("a", "end_array", None),
+        ("", "map_key", "c"),
+        ("c", "string", "d"),
+        ("", "map_key", "e"),
+        ("e", "start_array", None),
+        ("e.item", "boolean", True),
+        ("e.item", "number", pytest.approx(float("nan"), nan_ok=True)),
+        ("e", "end_array", None),
+        ("", "end_map", None),
+    ]
+
+
+def test_iterparse_scalar_document():
+    assert list(oj.iterparse(io.StringIO(' "x" '))) == [("", "string", "x")]
+
+
+def test_iterparse_empty_containers():
+    assert list(oj.iterparse(io.StringIO("[{}, []]"))) == [
+        ("", "start_array", None),
+        ("item", "start_map", None),
+        ("item", "end_map", None),
+        ("item", "start_array", None),
+        ("item", "end_array", None),
+        ("", "end_array", None),
+    ]
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 1000])
+def test_iterparse_is_independent_of_read_size(read_size):
+    json_string = '{"key1": -1.5e3, "key2": {"nested": ["x\\"y", 0.5, {"deep": []}]}}'
+    expected = list(oj.iterparse(io.StringIO(json_string)))
+    assert list(oj.iterparse(io.StringIO(json_string), read_size=read_size)) == expected
+
+
+def test_iterparse_streams_events_before_end_of_input():
+    parser = EventParser()
+    assert parser.feed('[{"a": 1}, ') == [
+        ("", "start_array", None),
+        ("item", "start_map", None),
+        ("item", "map_key", "a"),
+        ("item.a", "number", 1),
+        ("item", "end_map", None),
+    ]
+    assert parser.feed("2") == []
+    assert parser.feed("]") == [("item", "number", 2), ("", "end_array", None)]
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize(
+    "json_string",
+    ["", "[1, 2", "[1 2]", '{"a" 1}', "{1: 2}", '{"a": 1,}', "[1] [2]", "{]"],
+)
+def test_iterparse_invalid_json(json_string):
+    with pytest.raises(JSONDecodeError):
+        list(oj.iterparse(io.StringIO(json_string)))
+
+
+def test_iter_items_top_level_list():
+    json_file = io.StringIO('[{"id": 1, "tags": ["a"]}, 2, [3, {}], "four"]')
+    items = oj.iter_items(json_file, "item", read_size=4)
+    assert next(items) == {"id": 1, "tags": ["a"]}
+    assert list(items) == [2, [3, {}], "four"]
+
+
+def test_iter_items_nested_prefix():
+    json_file = io.StringIO('{"meta": {}, "rows": [{"x": 1}, {"x": 2}], "x": 3}')
+    assert list(oj.iter_items(json_file, "rows.item")) == [{"x": 1}, {"x": 2}]
+    json_file.seek(0)
+    assert list(oj.iter_items(json_file, "rows.item.x")) == [1, 2]
+    json_file.seek(0)
+    assert list(oj.iter_items(json_file, "")) == [
+        {"meta": {}, "rows": [{"x": 1}, {"x": 2}], "x": 3}
+    ]
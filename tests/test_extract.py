@@ -0,0 +1,77 @@
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.extract import Extractor, parse_pointer
+
+EVENT = """
+{
+    "user": {"id": 7, "name": "Ada", "a/b": 1, "m~n": 2},
+    "items": [{"price": 1.5, "sku": "x"}, {"sku": "y"}, {"price": 3}],
+    "unread": {"deeply": [{"nested": "value"}]},
+    "": "empty key"
+}
+"""
+
+
+def test_extract_simple_paths():
+    assert oj.extract(EVENT, ["/user/id", "/user/name"]) == {
+        "/user/id": 7,
+        "/user/name": "Ada",
+    }
+
+
+def test_extract_wildcard():
+    assert oj.extract(EVENT, ["/items/*/price"]) == {"/items/*/price": [1.5, 3]}
+    assert oj.extract(EVENT, ["/user/*"]) == {"/user/*": [7, "Ada", 1, 2]}
+
+
+def test_extract_array_index():
+    assert oj.extract(EVENT, ["/items/1/sku"]) == {"/items/1/sku": "y"}
+
+
+def test_extract_escaped_pointer_tokens():
+    assert oj.extract(EVENT, ["/user/a~1b", "/user/m~0n", "/"]) == {
+        "/user/a~1b": 1,
+        "/user/m~0n": 2,
+        "/": "empty key",
+    }
+
+
+def test_extract_whole_document_and_nested_paths():
+    results = oj.extract(EVENT, ["", "/user", "/user/id", "/unread/*/0"])
+    assert results[""] == oj.loads(EVENT)
+    assert results["/user"]["name"] == "Ada"
+    assert results["/user/id"] == 7
+    assert results["/unread/*/0"] == [{"nested": "value"}]
+
+
+def test_extract_missing_paths():
+    assert oj.extract(EVENT, ["/nope", "/user/id/deeper", "/items/*/nope"]) == {
+        "/items/*/nope": []
+    }
+
+
+def test_extract_does_not_validate_skipped_values():
+    assert oj.extract('{"a": [1 2 3], "b": 4}', ["/b"]) == {"/b": 4}
+
+
+@pytest.mark.parametrize(
+    "raw", ['{"a": 1', '{"a": 1 "b": 2}', '{"b": [1,, 2]}', '{"b": 1} 2']
+)
+def test_extract_rejects_invalid_json(raw):
+    with pytest.raises(JSONDecodeError):
+        oj.extract(raw, ["/b"])
+
+
+def test_extractor_is_reusable():
+    extractor = Extractor(["/id"])
+    assert extractor.extract('{"id": 1}') == {"/id": 1}
+    assert extractor.extract('{"id": 2}') == {"/id": 2}
+
+
+def test_parse_pointer():
+    assert parse_pointer("") == []
+    assert parse_pointer("/a~1b/~0/*/0") == ["a/b", "~", "*", "0"]
+    with pytest.raises(ValueError):
+        parse_pointer("a/b")
@@ -6,6 +6,7 @@ from hypothesis import given, settings
 from hypothesis import strategies as st
 
 import oj
+from oj.decode import decode
 from oj.exceptions import JSONDecodeError
 
 
@@ -52,7 +53,7 @@ def assert_json_equal(object1, object2):
     """
     assert type(object1) == type(object2)
     if isinstance(object1, float):
-        assert pytest.approx(object1, object2, abs=1e-20, nan_ok=True)
+        assert object1 == pytest.approx(object2, abs=1e-20, nan_ok=True)
     elif isinstance(object1, list):
         assert len(object1) == len(object2)
         for item1, item2 in zip(object1, object2):
@@ -101,6 +102,21 @@ def test_compared_to_stdlib_corrupted_json(input_json):
     assert stdlib_raises == oj_raises, oj_result
 
 
+@given(corrupted_json())
+@settings(max_examples=200)
+@pytest.mark.fuzz
+def test_decode_compared_to_lex_and_parse(input_json):
+    # The single-pass decoder must accept and reject exactly the same inputs as the
+    # token-based pipeline.
+    try:
+        expected = oj.parse(oj.lex(input_json))
+    except JSONDecodeError:
+        with pytest.raises(JSONDecodeError):
+            decode(input_json)
+    else:
+        assert_json_equal(decode(input_json), expected)
+
+
 @given(st.text())
 @settings(max_examples=2000)
 @pytest.mark.fuzz
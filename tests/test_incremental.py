@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.incremental import IncrementalDecoder, IncrementalLexer
+from oj.lex import lex
+
+DOCUMENTS = [
+    "null",
+    "-Infinity",
+    "12345.678e-9",
+    '"a string with an escaped \\" quote and a \\\\ backslash"',
+    '[true, false, null, NaN, Infinity, [], {}, [[1, 2], {"a": "b"}]]',
+    '{"key1": -1, "key2": {"nested": ["x", 0.5, {"deeper": []}]}}',
+]
+
+
+def feed_in_chunks(json_string, chunk_size):
+    decoder = IncrementalDecoder()
+    for i in range(0, len(json_string), chunk_size):
+        decoder.feed(json_string[i : i + chunk_size])
+    return decoder.close()
+
+
+@pytest.mark.parametrize("json_string", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+def test_incremental_decoder_matches_loads(json_string, chunk_size):
+    expected = oj.loads(json_string)
+    result = feed_in_chunks(json_string, chunk_size)
+    if expected != expected:
+        # NaN.
+        assert result != result
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize("json_string", DOCUMENTS)
+def test_incremental_lexer_matches_lex(json_string):
+    lexer = IncrementalLexer()
+    tokens = []
+    for char in json_string:
+        tokens.extend(lexer.feed(char))
+    tokens.extend(lexer.close())
+    assert tokens == lex(json_string)
+
+
+@pytest.mark.parametrize(
+    "json_string",
+    ["", "[1, 2", '"unterminated', "tru", "-", "[1,]", '{"a" 1}', "1 2", "nulll"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_incremental_decoder_rejects_invalid_json(json_string, chunk_size):
+    with pytest.raises(JSONDecodeError):
+        feed_in_chunks(json_string, chunk_size)
+
+
+def test_load_reads_in_chunks():
+    json_file = io.StringIO('{"key": ["value", 1, 2.5]}')
+    assert oj.load(json_file, read_size=3) == {"key": ["value", 1, 2.5]}
+
+
+def test_incremental_decoder_max_depth():
+    decoder = IncrementalDecoder(max_depth=2)
+    decoder.feed("[[1], [")
+    with pytest.raises(JSONDecodeError):
+        decoder.feed("[2]]]")
+
+
+def test_load_deep_nesting():
+    depth = 100_000
+    json_file = io.StringIO("[" * depth + "]" * depth)
+    assert oj.load(json_file, read_size=1000)
+
+
+def test_incremental_decoder_multiple_values():
+    decoder = IncrementalDecoder(multiple_values=True)
+    decoder.feed('{"a": [1]}\n2')
+    assert decoder.pop_values() == [{"a": [1]}]
+    decoder.feed("3 [")
+    assert decoder.pop_values() == [23]
+    decoder.feed("]")
+    assert decoder.pop_values() == [[]]
+    decoder.feed(' "x" true')
+    assert decoder.close() == ["x", True]
+    assert IncrementalDecoder(multiple_values=True).close() == []
@@ -0,0 +1,77 @@
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.lazy import LazyArray, LazyObject, loads_lazy
+
+DOCUMENT = """
+{
+    "user": {"id": 42, "name": "Ada", "tags": ["a", "b\\"]"]},
+    "items": [{"price": 1.5}, {"price": 2}, []],
+    "empty": {},
+    "flag": true
+}
+"""
+
+
+@pytest.mark.parametrize("use_structural_index", [False, True])
+def test_loads_lazy_equals_loads(use_structural_index):
+    document = loads_lazy(DOCUMENT, use_structural_index=use_structural_index)
+    assert document == oj.loads(DOCUMENT)
+
+
+@pytest.mark.parametrize("use_structural_index", [False, True])
+def test_loads_lazy_returns_proxies(use_structural_index):
+    document = loads_lazy(DOCUMENT, use_structural_index=use_structural_index)
+    assert isinstance(document, LazyObject)
+    assert isinstance(document["user"], LazyObject)
+    assert isinstance(document["items"], LazyArray)
+    assert document["user"]["tags"][1] == 'b"]'
+    assert document["items"][-2]["price"] == 2
+    assert list(document) == ["user", "items", "empty", "flag"]
+    assert len(document["items"]) == 3
+
+
+def test_loads_lazy_caches_decoded_children():
+    document = loads_lazy(DOCUMENT)
+    assert document["user"] is document["user"]
+    assert document["items"][0] is document["items"][0]
+
+
+def test_loads_lazy_scalar():
+    assert loads_lazy(' "string" ') == "string"
+    assert loads_lazy("12") == 12
+
+
+@pytest.mark.parametrize("use_structural_index", [False, True])
+def test_loads_lazy_lone_surrogates(use_structural_index):
+    raw = '{"a": "\ud800", "b": ["\udc00x", {"c": 1}]}'
+    document = loads_lazy(raw, use_structural_index=use_structural_index)
+    assert document["a"] == "\ud800"
+    assert document["b"][1]["c"] == 1
+    assert document == oj.loads(raw)
+
+
+@pytest.mark.parametrize("use_structural_index", [False, True])
+def test_loads_lazy_only_validates_what_is_read(use_structural_index):
+    document = loads_lazy(
+        '{"good": 1, "bad": [1 2]}', use_structural_index=use_structural_index
+    )
+    assert document["good"] == 1
+    with pytest.raises(JSONDecodeError):
+        document["bad"][0]
+
+
+@pytest.mark.parametrize(
+    "raw", ["", "[1, 2", '{"a": 1} 2', '{"a" 1}', "[1 2]", "[1,]", '{"a": 1,}', "[}"]
+)
+@pytest.mark.parametrize("use_structural_index", [False, True])
+def test_loads_lazy_rejects_invalid_structure(raw, use_structural_index):
+    with pytest.raises(JSONDecodeError):
+        document = loads_lazy(raw, use_structural_index=use_structural_index)
+        list(document)
+
+
+def test_loads_lazy_missing_key():
+    with pytest.raises(KeyError):
+        loads_lazy('{"a": 1}')["b"]
@@ -4,13 +4,16 @@ import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from oj.exceptions import JSONDecodeError
 from oj.lex import (
     LexFunc,
     lex,
     lex_bool,
     lex_delimiter,
+    lex_infinity,
     lex_null,
     lex_number,
+    lex_stream,
     lex_string,
 )
 from oj.tokens import Token, TokenType
@@ -74,6 +77,28 @@ def test_lex_number_positive(num):
     assert_lexes_literal(lex_number, num, TokenType.NUMBER)
 
 
+@pytest.mark.parametrize("inf", ["Infinity", "-Infinity"])
+def test_lex_infinity_positive(inf):
+    assert_lexes_literal(lex_infinity, inf, TokenType.INFINITY)
+
+
+def test_lex_negative_infinity_before_number():
+    assert lex("-Infinity") == [Token(TokenType.INFINITY, "-Infinity", 0)]
+    assert lex("-1") == [Token(TokenType.NUMBER, "-1", 0)]
+
+
+@pytest.mark.parametrize("raw", ["tru", "x", "[1, nul]", "Inf"])
+def test_lex_rejects_invalid_characters(raw):
+    with pytest.raises(JSONDecodeError):
+        lex(raw)
+
+
+@pytest.mark.parametrize("raw", ['"abc', '"abc\\"', '"abc\\'])
+def test_lex_rejects_unterminated_string(raw):
+    with pytest.raises(JSONDecodeError):
+        lex(raw)
+
+
 def test_lex_list():
     raw = "[true, false, null]"
     assert lex(raw) == [
@@ -100,3 +125,19 @@ def test_lex_nested_list():
         Token(TokenType.CLOSE_BRACKET, "]", 19),
         Token(TokenType.CLOSE_BRACKET, "]", 20),
     ]
+
+
+def test_lex_stream_matches_lex():
+    raw = '{"key": [1.5, true, null, "a \\" quote"], "other": -Infinity}'
+    stream = lex_stream(raw)
+    assert len(stream) == len(lex(raw))
+    assert list(stream) == lex(raw)
+
+
+def test_lex_stream_materializes_lexemes_lazily():
+    raw = '["abc", 12]'
+    stream = lex_stream(raw)
+    assert stream.token_type(1) == TokenType.STRING
+    assert stream.lexeme(1) == '"abc"'
+    assert stream[3] == Token(TokenType.NUMBER, "12", 8)
+    assert stream[-1] == Token(TokenType.CLOSE_BRACKET, "]", 10)
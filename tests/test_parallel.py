@@ -0,0 +1,227 @@
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.parallel import DocumentError, LineError
+
+LINES = [{"id": i, "tags": ["a", "b"][: i % 3], "score": i / 4} for i in range(50)]
+NDJSON = "".join(json.dumps(value) + "\n" for value in LINES)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_iter_lines(workers, batch_size):
+    values = oj.iter_lines(io.StringIO(NDJSON), workers=workers, batch_size=batch_size)
+    assert list(values) == LINES
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_lines_binary(workers):
+    values = oj.iter_lines(io.BytesIO(NDJSON.encode()), workers=workers, batch_size=7)
+    assert list(values) == LINES
+    json_file = io.BytesIO('1\n\n  \n"tw\xf6"\r\n{\n'.encode())
+    values = list(oj.iter_lines(json_file, workers=workers, errors="collect"))
+    assert values[:2] == [1, "twö"]
+    assert isinstance(values[2], LineError)
+    assert values[2].line == b"{\n"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_lines_skips_blank_lines(workers):
+    json_file = io.StringIO('1\n\n  \n"two"\r\n[3]')
+    assert list(oj.iter_lines(json_file, workers=workers, batch_size=2)) == [
+        1,
+        "two",
+        [3],
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_lines_raises_with_line_number(workers):
+    json_file = io.StringIO("1\n2\n[3,\n4\n")
+    values = oj.iter_lines(json_file, workers=workers, batch_size=2)
+    assert next(values) == 1
+    assert next(values) == 2
+    with pytest.raises(JSONDecodeError, match="line 3"):
+        next(values)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_lines_skip_errors(workers):
+    json_file = io.StringIO("1\n{\n3\nnope\n")
+    values = oj.iter_lines(json_file, workers=workers, batch_size=3, errors="skip")
+    assert list(values) == [1, 3]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_lines_collect_errors(workers):
+    json_file = io.StringIO("1\n{\n3\n")
+    values = list(
+        oj.iter_lines(json_file, workers=workers, batch_size=1, errors="collect")
+    )
+    assert values[0] == 1
+    assert isinstance(values[1], LineError)
+    assert values[1].line_number == 2
+    assert values[1].line == "{\n"
+    assert isinstance(values[1].error, JSONDecodeError)
+    assert values[2] == 3
+
+
+def test_iter_lines_stops_early():
+    json_file = io.StringIO("[1]\n" * 1000)
+    values = oj.iter_lines(json_file, workers=2, batch_size=10, max_pending=2)
+    assert next(values) == [1]
+    values.close()
+    # Only the batches in flight were read ahead.
+    assert json_file.tell() <= len("[1]\n") * 10 * 3
+
+
+def test_iter_lines_invalid_arguments():
+    with pytest.raises(ValueError):
+        next(oj.iter_lines(io.StringIO("1"), errors="ignore"))
+    with pytest.raises(ValueError):
+        next(oj.iter_lines(io.StringIO("1"), batch_size=0))
+
+
+@pytest.fixture
+def no_parallel_threshold(monkeypatch):
+    monkeypatch.setattr(oj.parallel, "PARALLEL_THRESHOLD", 0)
+
+
+@pytest.mark.usefixtures("no_parallel_threshold")
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunksize", [None, 1, 7])
+def test_loads_many(workers, chunksize):
+    texts = [json.dumps(value) for value in LINES]
+    texts[3] = texts[3].encode()
+    assert oj.loads_many(texts, workers=workers, chunksize=chunksize) == LINES
+
+
+@pytest.mark.usefixtures("no_parallel_threshold")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_loads_many_shared_memory(workers, monkeypatch):
+    monkeypatch.setattr(oj.parallel, "SHARED_MEMORY_THRESHOLD", 100)
+    large_value = {"items": [{"name": f"näme {i}"} for i in range(100)]}
+    texts = ["[1]", json.dumps(large_value, ensure_ascii=False), b"[2]", "[3"]
+    texts.append(json.dumps(large_value).encode())
+    values = oj.loads_many(texts, workers=workers, errors="collect")
+    assert values[:3] == [[1], large_value, [2]]
+    assert isinstance(values[3], DocumentError)
+    assert values[4] == large_value
+
+
+@pytest.mark.usefixtures("no_parallel_threshold")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_loads_many_bom_matches_loads(workers, monkeypatch):
+    monkeypatch.setattr(oj.parallel, "SHARED_MEMORY_THRESHOLD", 10)
+    json_string = "\ufeff" + json.dumps(LINES[:3])
+    with pytest.raises(JSONDecodeError):
+        oj.loads(json_string)
+    texts = ["[1]", json_string, json_string.encode()]
+    values = oj.loads_many(texts, workers=workers, errors="collect")
+    assert values[0] == [1]
+    assert isinstance(values[1], DocumentError)
+    assert values[2] == oj.loads(json_string.encode()) == LINES[:3]
+
+
+@pytest.mark.usefixtures("no_parallel_threshold")
+def test_loads_many_executor():
+    texts = [json.dumps(value) for value in LINES]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert oj.loads_many(texts, executor=executor) == LINES
+        assert oj.loads_many(texts[:5], executor=executor, chunksize=1) == LINES[:5]
+        # The executor is left running for the caller.
+        assert executor.submit(abs, -1).result() == 1
+
+
+def test_loads_many_small_batch_in_process(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("a pool was started")
+
+    monkeypatch.setattr(oj.parallel, "ProcessPoolExecutor", fail)
+    texts = [json.dumps(value) for value in LINES]
+    assert oj.loads_many(texts, workers=2) == LINES
+
+
+@pytest.mark.usefixtures("no_parallel_threshold")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_loads_many_errors(workers):
+    texts = ["1", "{", "3", "nope"]
+    with pytest.raises(JSONDecodeError, match="document 1"):
+        oj.loads_many(texts, workers=workers)
+    assert oj.loads_many(texts, workers=workers, errors="skip") == [1, 3]
+    values = oj.loads_many(texts, workers=workers, errors="collect", chunksize=1)
+    assert values[0] == 1
+    assert isinstance(values[1], DocumentError)
+    assert values[1].document_index == 1
+    assert isinstance(values[1].error, JSONDecodeError)
+    assert values[2] == 3
+    assert values[3].document_index == 3
+
+
+def test_loads_many_invalid_arguments():
+    with pytest.raises(ValueError):
+        oj.loads_many(["1"], errors="ignore")
+    with pytest.raises(ValueError):
+        oj.loads_many(["1"], chunksize=0)
+    assert oj.loads_many([], workers=2) == []
+
+
+@pytest.fixture(params=["structural_index", "skip_value"])
+def split_by(request, monkeypatch):
+    monkeypatch.setattr(oj.parallel, "PARALLEL_THRESHOLD", 0)
+    if request.param == "skip_value":
+        monkeypatch.setattr(oj.parallel, "build_index", lambda json_string: None)
+    else:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+PARALLEL_VALUE = [
+    {"id": i, "text": 'a, "b"] ' * (i % 3), "nested": [[i, {"x": ","}], []]}
+    for i in range(200)
+]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_loads_parallel(split_by, workers):
+    json_string = " " + json.dumps(PARALLEL_VALUE) + "\n"
+    assert oj.loads_parallel(json_string, workers=workers) == PARALLEL_VALUE
+    assert oj.loads(json_string.encode(), workers=workers) == PARALLEL_VALUE
+    assert oj.loads("[1, 2, 3]", workers=workers) == [1, 2, 3]
+
+
+def test_loads_parallel_decoder_options(split_by):
+    json_string = json.dumps([{"price": 0.1 * i} for i in range(100)])
+    values = oj.loads(json_string, workers=2, parse_float=str, max_depth=2)
+    assert values == [{"price": str(0.1 * i)} for i in range(100)]
+
+
+@pytest.mark.parametrize(
+    "json_string",
+    [
+        "[1, 2, 3, 4,, 5, 6]",
+        "[1, 2, 3, 4, 5, 6,]",
+        "[1, 2, 3, 4, 5, 6] 7",
+        "[1, 2, 3, 4, 5, 6",
+        '[1, 2, 3, 4, 5, "6]',
+        "[1, 2, 3, [4}, 5, 6]",
+        "[1, 2, 3, 4 5, 6]",
+        "[[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]]",
+    ],
+)
+def test_loads_parallel_errors_match_serial(split_by, json_string):
+    with pytest.raises(JSONDecodeError) as serial_error:
+        oj.loads(json_string)
+    with pytest.raises(JSONDecodeError) as parallel_error:
+        oj.loads_parallel(json_string, workers=2)
+    assert str(parallel_error.value) == str(serial_error.value)
+
+
+def test_loads_parallel_other_documents(split_by):
+    for json_string in ['{"a": [1, 2]}', "[]", "[1]", '"x"', "[[1, 2], [3, 4]]"]:
+        assert oj.loads_parallel(json_string, workers=2) == json.loads(json_string)
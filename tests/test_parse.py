@@ -1,5 +1,7 @@
+import json
+
 import pytest
-from hypothesis import given
+from hypothesis import assume, given
 from hypothesis import strategies as st
 
 from oj.exceptions import JSONDecodeError
@@ -34,6 +36,37 @@ def test_parse_hex(char_point):
     assert parse_string(token) == chr(char_point)
 
 
+@pytest.mark.parametrize(
+    "lexeme",
+    [
+        '"plain ascii"',
+        '"caf\u00e9 \\"quoted\\" \\\\ \\n end"',
+        '"\\ud83d\\ude00 surrogate pair"',
+        '"lone \\ud83d surrogate, then \\u0041"',
+        '"\\udc00\\ud800 reversed surrogates"',
+        '"runs \\t between \\/ escapes\\b\\f\\r"',
+    ],
+)
+def test_parse_string_matches_stdlib(lexeme):
+    token = Token(TokenType.STRING, lexeme, 0)
+    assert parse_string(token) == json.loads(lexeme)
+
+
+@given(st.text())
+def test_parse_string_round_trip(string):
+    for ensure_ascii in True, False:
+        lexeme = json.dumps(string, ensure_ascii=ensure_ascii)
+        assert parse_string(Token(TokenType.STRING, lexeme, 0)) == string
+
+
+@pytest.mark.parametrize(
+    "lexeme", ['"\\x"', '"\\u12"', '"\\u12g4"', '"\\u+123"', '"\\ud800\\u12"']
+)
+def test_parse_string_invalid_escapes(lexeme):
+    with pytest.raises(JSONDecodeError):
+        parse_string(Token(TokenType.STRING, lexeme, 0))
+
+
 @given(st.integers())
 def test_parse_number_integer(num):
     token = Token(TokenType.NUMBER, str(num), 0)
@@ -43,7 +76,7 @@ def test_parse_number_integer(num):
 @given(st.floats(-100, 100))
 def test_parse_number_float(num):
     token = Token(TokenType.NUMBER, str(num), 0)
-    assert pytest.approx(parse_number(token), num, abs=1e-20)
+    assert parse_number(token) == num
 
 
 def test_parse_number_rejects_leading_zeros():
@@ -57,6 +90,36 @@ def test_parse_number_rejects_leading_zeros():
 # Limit the size of the exponent so that base * 10**exponent doesn't overflow.
 @given(base=st.floats(-100, 100), exponent=st.integers(-20, 20))
 def test_parse_number_scientific_notations(base, exponent):
+    assume("e" not in str(base))
     token = Token(TokenType.NUMBER, f"{base}e{exponent}", 0)
     expected = float(base) * (10.0 ** exponent)
-    assert pytest.approx(parse_number(token), expected, abs=1e-20)
+    assert parse_number(token) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    "literal",
+    [
+        "-2.5",
+        "0.1",
+        "-0",
+        "-0.0",
+        "1e400",
+        "-1e400",
+        "1e-400",
+        "123456789012345678901234567890",
+        "3.14159265358979323846264338327950288419716939937510582097494459",
+        "1" * 1000 + ".5e-990",
+        "2.2250738585072011e-308",
+    ],
+)
+def test_parse_number_matches_stdlib(literal):
+    token = Token(TokenType.NUMBER, literal, 0)
+    number = parse_number(token)
+    assert number == json.loads(literal)
+    assert type(number) is type(json.loads(literal))
+
+
+@pytest.mark.parametrize("literal", ["05", "-", "1.", ".5", "1e", "1e+", "+1", "1.5.2"])
+def test_parse_number_invalid(literal):
+    with pytest.raises(JSONDecodeError):
+        parse_number(Token(TokenType.NUMBER, literal, 0))
@@ -0,0 +1,69 @@
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.stats import DecodeStats
+from oj.tokens import TokenType
+
+
+def test_stats_record_document():
+    stats = DecodeStats()
+    json_string = '{"a": [1, 2.5, "x\\ny\\\\"], "b": {}, "c": [[]], "d": null}'
+    assert oj.loads(json_string, stats=stats) == oj.loads(json_string)
+    assert stats.documents == 1
+    assert stats.input_size == len(json_string)
+    assert stats.decode_seconds > 0
+    assert stats.lex_seconds > 0
+    assert stats.token_counts[TokenType.STRING] == 5
+    assert stats.token_counts[TokenType.NUMBER] == 2
+    assert stats.token_counts[TokenType.NULL] == 1
+    assert stats.token_counts[TokenType.COLON] == 4
+    assert stats.max_depth == 3
+    assert stats.strings == 5
+    assert stats.string_size == 3 * 4 + len('"x\\ny\\\\"')
+    assert stats.escapes == 2
+    assert stats.numbers == 2
+    assert stats.number_size == 4
+    assert (stats.objects, stats.arrays) == (2, 3)
+    assert stats.max_container_size == 4
+    # 4 members, 3 elements, and one element of [[]].
+    assert stats.total_container_size == 8
+
+
+def test_stats_accumulate_over_documents():
+    stats = DecodeStats()
+    oj.loads("[1, [2, 3]]", stats=stats)
+    oj.loads(b'"\xc3\xa9"', stats=stats)
+    assert stats.documents == 2
+    assert stats.numbers == 3
+    assert stats.strings == 1
+    assert stats.max_depth == 2
+    assert stats.input_size == 11 + 3
+    stats.reset()
+    assert stats.documents == stats.numbers == 0
+
+
+def test_stats_invalid_document():
+    stats = DecodeStats()
+    with pytest.raises(JSONDecodeError):
+        oj.loads("[1,", stats=stats)
+    assert stats.documents == 0
+
+
+def test_stats_with_decoder_options():
+    stats = DecodeStats()
+    assert oj.loads("[1.5]", parse_float=str, stats=stats) == ["1.5"]
+    assert stats.numbers == 1
+
+
+def test_stats_exporter():
+    exported = []
+    with DecodeStats(exporter=lambda stats: exported.append(stats.as_dict())) as stats:
+        oj.loads("[true, false, null]", stats=stats)
+        assert not exported
+    (exported_stats,) = exported
+    assert exported_stats["documents"] == 1
+    assert exported_stats["tokens_boolean"] == 2
+    assert exported_stats["tokens_null"] == 1
+    assert exported_stats["tokens_string"] == 0
+    assert "exporter" not in exported_stats
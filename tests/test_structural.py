@@ -0,0 +1,39 @@
+import pytest
+
+from oj.decode import skip_value
+from oj.exceptions import JSONDecodeError
+
+pytest.importorskip("numpy")
+
+from oj.structural import build_index  # noqa: E402
+
+DOCUMENT = '{"a": [1, {"b": "]}\\\\"}, "c\\\\\\"[,"], "d": {}, "é": [[], [2]]}'
+
+
+def test_build_index_ignores_characters_in_strings():
+    index = build_index(DOCUMENT)
+    assert index is not None
+    assert "".join(DOCUMENT[i] for i in index.positions) == "{:[,{:},],:{},:[[],[]]}"
+
+
+@pytest.mark.parametrize("open_index", [i for i, c in enumerate(DOCUMENT) if c in "[{"])
+def test_close_of_matches_skip_value(open_index):
+    index = build_index(DOCUMENT)
+    if open_index not in set(index.positions.tolist()):
+        # A bracket inside a string.
+        return
+    assert index.close_of(open_index) + 1 == skip_value(DOCUMENT, open_index)
+
+
+def test_separators_of():
+    index = build_index(DOCUMENT)
+    separators, chars, close_index = index.separators_of(0)
+    assert "".join(DOCUMENT[i] for i in separators) == ":,:,:"
+    assert "".join(map(chr, chars)) == ":,:,:"
+    assert close_index == len(DOCUMENT) - 1
+
+
+@pytest.mark.parametrize("raw", ["[", "[]]", "[}", '["]"', "{[}]"])
+def test_build_index_rejects_unbalanced_brackets(raw):
+    with pytest.raises(JSONDecodeError):
+        build_index(raw)
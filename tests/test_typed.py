@@ -0,0 +1,160 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pytest
+
+import oj
+from oj.exceptions import JSONDecodeError
+from oj.typed import TypedDecoder
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+    label: str = "origin"
+
+
+@dataclass
+class Shape:
+    name: str
+    points: List[Point]
+    tags: Dict[str, Point] = field(default_factory=dict)
+    parent: Optional["Shape"] = None
+
+
+class Record:
+    __slots__ = ("id", "name", "scores")
+
+    id: int
+    name: str
+    scores: List[float]
+
+
+class ExtendedRecord(Record):
+    __slots__ = ("extra",)
+
+
+def test_into_dataclass():
+    assert oj.loads('{"x": 1, "y": 2.5}', into=Point) == Point(1, 2.5)
+    assert oj.loads('{"y": 2, "x": 1, "label": "a"}', into=Point) == Point(1, 2, "a")
+
+
+def test_into_list_of_dataclasses():
+    json_string = '[{"x": 1, "y": 2}, {"x": 3, "y": 4, "label": "b"}]'
+    assert oj.loads(json_string, into=List[Point]) == [Point(1, 2), Point(3, 4, "b")]
+
+
+def test_into_nested_and_recursive_dataclasses():
+    json_string = """
+    {
+        "name": "square",
+        "points": [{"x": 0, "y": 0}, {"x": 1, "y": 1}],
+        "tags": {"centre": {"x": 0.5, "y": 0.5}},
+        "parent": {"name": "plane", "points": [], "parent": null}
+    }
+    """
+    assert oj.loads(json_string, into=Shape) == Shape(
+        name="square",
+        points=[Point(0, 0), Point(1, 1)],
+        tags={"centre": Point(0.5, 0.5)},
+        parent=Shape(name="plane", points=[]),
+    )
+
+
+def test_into_slots_class():
+    records = oj.loads(
+        '[{"id": 1, "name": "a", "scores": [1.5]}, {"id": 2, "extra": true}]',
+        into=List[ExtendedRecord],
+    )
+    assert (records[0].id, records[0].name, records[0].scores) == (1, "a", [1.5])
+    assert (records[1].id, records[1].extra) == (2, True)
+    assert not hasattr(records[1], "name")
+    assert not hasattr(records[0], "__dict__")
+
+
+def test_into_skips_unknown_keys_without_decoding():
+    # The unknown value is malformed, but it's only skipped over.
+    json_string = '{"x": 1, "unknown": [1 2 {"a": tru}], "y": 2}'
+    assert oj.loads(json_string, into=Point) == Point(1, 2)
+    with pytest.raises(JSONDecodeError):
+        oj.loads(json_string)
+
+
+def test_into_from_bytes():
+    assert oj.loads(b'{"x": 1, "y": 2}', into=Point) == Point(1, 2)
+
+
+@pytest.mark.parametrize(
+    "json_string,target",
+    [
+        ('{"x": 1}', Point),
+        ("[1, 2]", Point),
+        ('{"x": 1, "y": 2}', List[Point]),
+        ('[{"x": 1, "y": 2} {"x": 1, "y": 2}]', List[Point]),
+        ('{"x": 1, "y": 2} []', Point),
+        ('{"x": 1 "y": 2}', Point),
+    ],
+)
+def test_into_invalid(json_string, target):
+    with pytest.raises(JSONDecodeError):
+        oj.loads(json_string, into=target)
+
+
+def test_typed_decoder_reuses_decode_funcs():
+    decoder = TypedDecoder()
+    assert decoder.decode_func(List[Point]) is decoder.decode_func(List[Point])
+    assert decoder.decode('[{"x": 1, "y": 2}]', List[Point]) == [Point(1, 2)]
+
+
+def test_typed_decoder_bounds_decode_funcs(monkeypatch):
+    monkeypatch.setattr(oj.typed, "MAX_DECODE_FUNCS", 3)
+    decoder = TypedDecoder()
+    for i in range(10):
+        cls = dataclass(type(f"Record{i}", (), {"__annotations__": {"id": int}}))
+        assert decoder.decode('[{"id": 1}]', List[cls]) == [cls(1)]
+        assert len(decoder._decode_funcs) <= 3
+    # Decode functions discarded along the way are built again as needed.
+    assert decoder.decode('[{"x": 1, "y": 2}]', List[Point]) == [Point(1, 2)]
+
+
+def test_into_reuses_decode_funcs(monkeypatch):
+    @dataclass
+    class Pair:
+        first: int
+        second: int
+
+    built = []
+    build_decode_func = TypedDecoder._build_decode_func
+
+    def counting_build_decode_func(self, target):
+        built.append(target)
+        return build_decode_func(self, target)
+
+    monkeypatch.setattr(TypedDecoder, "_build_decode_func", counting_build_decode_func)
+    for _ in range(3):
+        assert oj.loads('{"first": 1, "second": 2}', into=Pair) == Pair(1, 2)
+    assert built.count(Pair) == 1
+    # Other options get a TypedDecoder of their own.
+    assert oj.loads('{"first": 1.5, "second": 2}', into=Pair, parse_float=str) == Pair(
+        "1.5", 2
+    )
+    assert built.count(Pair) == 2
+
+
+def test_object_hook():
+    json_string = '{"a": {"b": 1}, "c": [{}], "d": {"b": 2}}'
+    assert oj.loads(json_string, object_hook=len) == 3
+    assert oj.loads('[{"b": 1}, {}]', object_hook=sorted) == [["b"], []]
+
+
+def test_object_pairs_hook():
+    json_string = '{"a": 1, "b": {"c": 2}, "a": 3, "e": {}}'
+    assert oj.loads(json_string, object_pairs_hook=list) == [
+        ("a", 1),
+        ("b", [("c", 2)]),
+        ("a", 3),
+        ("e", []),
+    ]
+    # object_pairs_hook takes priority.
+    assert oj.loads('{"a": 1}', object_hook=len, object_pairs_hook=tuple) == (("a", 1),)